@@ -0,0 +1,305 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.utils.cache import bump_version_on_commit
+from apps.utils.validators import validate_invalid_fields, validate_required_fields
+
+from .models import Post, PostStatistics
+from .signals import POSTS_CACHE_NAMESPACE
+from .slugs import category_ids, tag_ids
+
+OPERATIONS_KEY = 'atomic:operations'
+
+ADD_FIELDS = {'title', 'content', 'category', 'tags'}
+ADD_REQUIRED_FIELDS = ['title', 'content', 'category']
+UPDATE_FIELDS = ADD_FIELDS | {'status'}
+# Columns an update may change; bulk_update() skips auto_now, so updated_at
+# is set by hand.
+UPDATE_COLUMNS = [
+    'title',
+    'slug',
+    'search_key',
+    'content',
+    'status',
+    'category',
+    'updated_at',
+]
+
+
+@dataclass
+class PostOperation:
+    op: str
+    pointer: str
+    post: Post
+    # None when the operation leaves the tags as they are.
+    tag_ids: Optional[List[int]] = None
+
+
+def apply_post_operations(document, user) -> List[Post]:
+    """
+    Validate every operation of an atomic:operations document, then apply
+    them all in one transaction. Nothing is written if any operation is
+    invalid: the ValidationError maps the JSON pointer of each invalid
+    member, e.g. /atomic:operations/3/data/title, to its messages.
+
+    Posts are added and updated with bulk queries, so the number of queries
+    depends on the batch size setting, not on the number of operations.
+    Returns the added and updated posts in operation order.
+    """
+    operations = _get_operations(document)
+    errors = {}
+
+    parsed = [
+        _parse_operation(operation, f'/{OPERATIONS_KEY}/{index}', errors)
+        for index, operation in enumerate(operations)
+    ]
+    posts = _get_updated_posts(parsed, user, errors)
+
+    items = []
+    for op, pointer, post_id, data in filter(None, parsed):
+        if f'{pointer}/ref' in errors:
+            continue
+        item = _build_operation(op, pointer, data, posts.get(post_id), user, errors)
+        if item:
+            items.append(item)
+    _validate_unique_slugs(items, errors)
+
+    if errors:
+        raise ValidationError(errors)
+
+    _save(items)
+    return [item.post for item in items]
+
+
+def _get_operations(document) -> list:
+    if not isinstance(document, dict):
+        raise ValidationError({'__all__': ['The request body must be an object.']})
+    validate_invalid_fields(document, {OPERATIONS_KEY})
+    validate_required_fields(document, [OPERATIONS_KEY])
+
+    operations = document[OPERATIONS_KEY]
+    if not isinstance(operations, list) or not operations:
+        raise ValidationError(
+            {OPERATIONS_KEY: ['This field must be a non-empty list of operations.']}
+        )
+    if len(operations) > settings.BULK_MAX_OPERATIONS:
+        raise ValidationError(
+            {
+                OPERATIONS_KEY: [
+                    f'At most {settings.BULK_MAX_OPERATIONS} operations are '
+                    'allowed per request.'
+                ]
+            }
+        )
+    return operations
+
+
+def _parse_operation(operation, pointer: str, errors: Dict[str, List[str]]):
+    """Return (op, pointer, post id, data), or None if the operation is invalid."""
+    if not isinstance(operation, dict):
+        errors[pointer] = ['Operation must be an object.']
+        return None
+
+    invalid = {}
+    for member in operation.keys() - {'op', 'ref', 'data'}:
+        invalid[f'{pointer}/{member}'] = ['This field is not allowed.']
+
+    op = operation.get('op')
+    if op not in ('add', 'update'):
+        invalid[f'{pointer}/op'] = ["Operation must be 'add' or 'update'."]
+    if not isinstance(operation.get('data'), dict):
+        invalid[f'{pointer}/data'] = ['This field is required and must be an object.']
+
+    post_id = None
+    ref = operation.get('ref')
+    if op == 'update':
+        if (
+            isinstance(ref, dict)
+            and ref.get('type') == 'posts'
+            and isinstance(ref.get('id'), str)
+            and ref['id'].isdecimal()
+        ):
+            post_id = int(ref['id'])
+        else:
+            invalid[f'{pointer}/ref'] = [
+                'Update operations need a post reference: '
+                '{"type": "posts", "id": "<id>"}.'
+            ]
+    elif ref is not None:
+        invalid[f'{pointer}/ref'] = ['This field is not allowed.']
+
+    if invalid:
+        errors.update(invalid)
+        return None
+    return op, pointer, post_id, operation['data']
+
+
+def _get_updated_posts(parsed, user, errors: Dict[str, List[str]]) -> Dict[int, Post]:
+    """Load every post referenced by an update with one query."""
+    updates = [item for item in parsed if item and item[0] == 'update']
+    posts = Post.objects.in_bulk([post_id for _, _, post_id, _ in updates])
+
+    seen = set()
+    for _, pointer, post_id, _ in updates:
+        post = posts.get(post_id)
+        if post is None:
+            errors[f'{pointer}/ref'] = ['No Post matches the given query.']
+        elif post_id in seen:
+            errors[f'{pointer}/ref'] = ['This post is updated by another operation.']
+        elif not (user.role == 'admin' or user.id == post.author_id):
+            raise PermissionDenied(
+                f'You do not have permission to edit this post: {pointer}/ref'
+            )
+        seen.add(post_id)
+    return posts
+
+
+def _build_operation(
+    op: str,
+    pointer: str,
+    data: dict,
+    post: Optional[Post],
+    user,
+    errors: Dict[str, List[str]],
+) -> Optional[PostOperation]:
+    item_errors = {}
+    try:
+        validate_invalid_fields(data, ADD_FIELDS if op == 'add' else UPDATE_FIELDS)
+        if op == 'add':
+            validate_required_fields(data, ADD_REQUIRED_FIELDS)
+    except ValidationError as e:
+        item_errors.update(e.message_dict)
+
+    if op == 'add':
+        post = Post(author=user, status=Post.Status.DRAFT)
+
+    if 'category' in data and 'category' not in item_errors:
+        category = data['category']
+        category_id = (
+            category_ids.get_id(category) if isinstance(category, str) else None
+        )
+        if category_id is None:
+            item_errors['category'] = ['No Category matches the given query.']
+        else:
+            post.category_id = category_id
+
+    new_tag_ids = None
+    if op == 'add' or 'tags' in data:
+        new_tag_ids = _get_tag_ids(data.get('tags') or [], item_errors)
+
+    for field in ('title', 'content', 'status'):
+        if field in data and field not in item_errors:
+            setattr(post, field, data[field])
+
+    reported = set(item_errors)
+    try:
+        # The category was checked above; uniqueness is checked for the whole
+        # batch at once, instead of with one query per post.
+        post.full_clean(
+            exclude=['author', 'category'],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+    except ValidationError as e:
+        for field, messages in e.message_dict.items():
+            # The slug is derived from the title.
+            field = 'title' if field == 'slug' else field
+            if field not in reported:
+                item_errors.setdefault(field, []).extend(messages)
+
+    if item_errors:
+        for field, messages in item_errors.items():
+            key = f'{pointer}/data' if field == '__all__' else f'{pointer}/data/{field}'
+            errors[key] = messages
+        return None
+    return PostOperation(op, pointer, post, new_tag_ids)
+
+
+def _get_tag_ids(tag_slugs, item_errors: Dict[str, List[str]]) -> Optional[List[int]]:
+    if not isinstance(tag_slugs, list) or not all(
+        isinstance(slug, str) for slug in tag_slugs
+    ):
+        item_errors['tags'] = ['Tags must be a list of tag slugs.']
+        return None
+
+    ids = tag_ids.get_ids(tag_slugs)
+    missing = set(tag_slugs) - ids.keys()
+    if missing:
+        item_errors['tags'] = [
+            f'The following tags were not found: {", ".join(sorted(missing))}.'
+        ]
+        return None
+    return list(ids.values())
+
+
+def _validate_unique_slugs(items: List[PostOperation], errors: Dict[str, List[str]]):
+    """
+    Check the slugs of the whole batch against each other and against the
+    other posts, reading existing slugs in chunks of BULK_BATCH_SIZE.
+    """
+    message = 'Post with this Slug already exists.'
+    slugs = {}
+    for item in items:
+        if item.post.slug in slugs:
+            errors[f'{item.pointer}/data/title'] = [message]
+        else:
+            slugs[item.post.slug] = item
+
+    # A slug is only free for the post already holding it. Slugs that
+    # updated posts give up stay taken for the rest of the batch: posts are
+    # added before the updates run, and renames are applied row by row, so
+    # reusing them would break the unique constraint.
+    candidates = list(slugs)
+    batch_size = settings.BULK_BATCH_SIZE
+    for start in range(0, len(candidates), batch_size):
+        taken = Post.objects.filter(
+            slug__in=candidates[start : start + batch_size]
+        ).values_list('slug', 'id')
+        for slug, post_id in taken:
+            if slugs[slug].post.id != post_id:
+                errors[f'{slugs[slug].pointer}/data/title'] = [message]
+
+
+def _save(items: List[PostOperation]):
+    batch_size = settings.BULK_BATCH_SIZE
+    added = [item.post for item in items if item.op == 'add']
+    updated = [item.post for item in items if item.op == 'update']
+    now = timezone.now()
+    for post in updated:
+        post.updated_at = now
+
+    through = Post.tags.through
+    with transaction.atomic():
+        # Bulk queries send no signals: statistics rows and the cache version
+        # are handled here instead of by the post_save receivers.
+        Post.objects.bulk_create(added, batch_size=batch_size)
+        PostStatistics.objects.bulk_create(
+            [PostStatistics(post=post) for post in added], batch_size=batch_size
+        )
+        Post.objects.bulk_update(updated, UPDATE_COLUMNS, batch_size=batch_size)
+
+        retagged_ids = [
+            item.post.id
+            for item in items
+            if item.op == 'update' and item.tag_ids is not None
+        ]
+        for start in range(0, len(retagged_ids), batch_size):
+            through.objects.filter(
+                post_id__in=retagged_ids[start : start + batch_size]
+            ).delete()
+        through.objects.bulk_create(
+            [
+                through(post_id=item.post.id, tag_id=tag_id)
+                for item in items
+                if item.tag_ids
+                for tag_id in item.tag_ids
+            ],
+            batch_size=batch_size,
+        )
+
+        bump_version_on_commit(POSTS_CACHE_NAMESPACE)
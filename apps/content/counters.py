@@ -0,0 +1,14 @@
+from apps.utils.cache import bump_version_on_commit
+from apps.utils.counters import CounterBuffer
+
+from .models import PostStatistics
+from .signals import POSTS_CACHE_NAMESPACE
+
+# QuerySet.update() sends no signals, so cached post responses are
+# invalidated here instead.
+post_statistics_buffer = CounterBuffer(
+    PostStatistics,
+    'post_id',
+    ('share_count', 'like_count', 'comment_count'),
+    on_flush=lambda: bump_version_on_commit(POSTS_CACHE_NAMESPACE),
+)
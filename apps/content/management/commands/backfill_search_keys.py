@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.content.models import Category, Post, Tag
+from apps.content.search import update_search_keys
+
+
+class Command(BaseCommand):
+    help = 'Recompute the accent-folded search keys of posts, tags and categories.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and updated per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        for model, source_field in ((Post, 'title'), (Tag, 'name'), (Category, 'name')):
+            updated = update_search_keys(
+                model, source_field, batch_size=options['batch_size']
+            )
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {updated} search keys updated.'
+            )
+        self.stdout.write(self.style.SUCCESS('Search keys are up to date.'))
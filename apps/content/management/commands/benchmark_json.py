@@ -0,0 +1,115 @@
+import timeit
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.utils.json_encoding import BACKENDS, dumps, get_backend
+
+
+def build_payload(size: int) -> dict:
+    """A post list document shaped like the /posts/ response."""
+    now = timezone.now()
+    posts = []
+    for index in range(size):
+        created_at = now - timedelta(days=index, microseconds=index * 137)
+        posts.append(
+            {
+                'type': 'posts',
+                'id': str(index + 1),
+                'attributes': {
+                    'title': f'Post number {index + 1}',
+                    'slug': f'post-number-{index + 1}',
+                    'content': 'Lorem ipsum dolor sit amet. ' * 20,
+                    'status': 'published',
+                    'created_at': created_at,
+                    'updated_at': created_at + timedelta(hours=1),
+                },
+                'relationships': {
+                    'author': {'data': {'type': 'users', 'id': str(index % 7 + 1)}},
+                    'category': {
+                        'data': {'type': 'categories', 'id': str(index % 5 + 1)}
+                    },
+                    'statistics': {
+                        'data': {
+                            'type': 'post_statistics',
+                            'id': str(index + 1),
+                            'attributes': {
+                                'views': index * 3,
+                                'likes': index,
+                                'shares': index // 2,
+                                'created_at': created_at,
+                                'updated_at': now,
+                            },
+                        }
+                    },
+                    'tags': {
+                        'data': [
+                            {'type': 'tags', 'id': str(tag)} for tag in range(1, 4)
+                        ]
+                    },
+                    'media_files': {
+                        'data': [
+                            {
+                                'type': 'media_files',
+                                'id': str(uuid.UUID(int=index)),
+                                'attributes': {'size': Decimal('1.5')},
+                            }
+                        ]
+                    },
+                },
+            }
+        )
+    return {
+        'data': posts,
+        'meta': {'pagination': {'count': size}, 'timestamp': now},
+        'links': {'self': '/api/v1/posts/', 'next': None},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare the JSON encoder backends on a post list payload.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=1000,
+            help='Posts in the encoded payload.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Encodings timed per backend; the best run is reported.',
+        )
+
+    def handle(self, *args, **options):
+        payload = build_payload(options['posts'])
+        results = {}
+        for backend in BACKENDS:
+            try:
+                get_backend(backend)
+            except ValueError as e:
+                self.stdout.write(self.style.WARNING(f'{backend}: skipped ({e})'))
+                continue
+            results[backend] = min(
+                timeit.repeat(
+                    lambda: dumps(payload, backend),
+                    number=1,
+                    repeat=options['repeat'],
+                )
+            )
+
+        if not results:
+            raise CommandError('No JSON encoder backend is available.')
+
+        size = len(dumps(payload))
+        baseline = results.get('json')
+        for backend, seconds in results.items():
+            line = f'{backend}: {seconds * 1000:.2f} ms for {size} bytes'
+            if baseline and backend != 'json':
+                line += f' ({baseline / seconds:.1f}x faster than json)'
+            self.stdout.write(line)
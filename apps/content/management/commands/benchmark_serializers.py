@@ -0,0 +1,135 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from apps.content.models import Category, Post, Tag
+from apps.content.serializers import CategorySerializer, PostSerializer, TagSerializer
+from apps.users.models import User
+from apps.users.serializers import UserSerializer
+
+
+def build_rows(size: int) -> dict:
+    """Unsaved instances of every serialized model, filled like fetched rows."""
+    now = timezone.now()
+    return {
+        'posts': (
+            PostSerializer,
+            [
+                Post(
+                    id=index,
+                    title=f'Post number {index}',
+                    slug=f'post-number-{index}',
+                    content='Lorem ipsum dolor sit amet. ' * 20,
+                    status=Post.Status.PUBLISHED,
+                    author_id=1,
+                    category_id=1,
+                    created_at=now,
+                    updated_at=now,
+                )
+                for index in range(size)
+            ],
+        ),
+        'tags': (
+            TagSerializer,
+            [
+                Tag(
+                    id=index,
+                    name=f'Tag {index}',
+                    slug=f'tag-{index}',
+                    created_at=now,
+                    updated_at=now,
+                )
+                for index in range(size)
+            ],
+        ),
+        'categories': (
+            CategorySerializer,
+            [
+                Category(
+                    id=index,
+                    name=f'Category {index}',
+                    description='A category.',
+                    slug=f'category-{index}',
+                    created_at=now,
+                    updated_at=now,
+                )
+                for index in range(size)
+            ],
+        ),
+        'users': (
+            UserSerializer,
+            [
+                User(
+                    id=index,
+                    username=f'user{index}',
+                    email=f'user{index}@example.com',
+                    first_name='First',
+                    last_name='Last',
+                    role=User.Role.AUTHOR,
+                    date_joined=now,
+                )
+                for index in range(size)
+            ],
+        ),
+    }
+
+
+def model_to_dict_attributes(obj, names):
+    # How attributes were built before compiled plans: model_to_dict skips
+    # non-editable fields such as timestamps, which were read one by one.
+    attributes = model_to_dict(obj, fields=names)
+    for name in names:
+        if name not in attributes:
+            attributes[name] = getattr(obj, name)
+    return attributes
+
+
+class Command(BaseCommand):
+    help = 'Compare model_to_dict with compiled serializer plans on list payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='Objects serialized per run.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Runs timed per variant; the best run is reported.',
+        )
+
+    def handle(self, *args, **options):
+        for resource_type, (serializer, objects) in build_rows(options['rows']).items():
+            names = serializer.attribute_fields
+            plan = serializer.attributes_plan()
+            rows = [
+                tuple(getattr(obj, column) for column in plan.columns)
+                for obj in objects
+            ]
+
+            variants = {
+                'model_to_dict': lambda: [
+                    model_to_dict_attributes(obj, names) for obj in objects
+                ],
+                'plan': lambda: [plan.serialize(obj) for obj in objects],
+                'plan (values_list rows)': lambda: [
+                    plan.serialize_row(row) for row in rows
+                ],
+            }
+            results = {
+                name: min(timeit.repeat(run, number=1, repeat=options['repeat']))
+                for name, run in variants.items()
+            }
+
+            baseline = results['model_to_dict']
+            self.stdout.write(f'{resource_type} ({len(objects)} rows):')
+            for name, seconds in results.items():
+                line = f'  {name}: {seconds * 1000:.2f} ms'
+                if name != 'model_to_dict':
+                    line += f' ({baseline / seconds:.1f}x faster)'
+                self.stdout.write(line)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.content.search import get_search_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for posts.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            self.stdout.write('No full-text backend available; nothing to rebuild.')
+            return
+
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {backend} search index.'))
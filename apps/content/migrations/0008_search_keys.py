@@ -0,0 +1,52 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+from apps.content.search import create_search_index, update_search_keys
+
+
+def populate_search_keys(apps, schema_editor):
+    for model_name, source_field in (
+        ('Category', 'name'),
+        ('Post', 'title'),
+        ('Tag', 'name'),
+    ):
+        update_search_keys(apps.get_model('content', model_name), source_field)
+
+
+def restore_search_index(apps, schema_editor):
+    # SQLite rebuilds content_post to add the column, which drops the FTS
+    # triggers attached to the old table.
+    create_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0007_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='search_key',
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='search_key',
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='search_key',
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=100
+            ),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+        migrations.RunPython(populate_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0008_search_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                condition=models.Q(('status', 'published')),
+                fields=['-created_at', '-id'],
+                name='post_published_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='post_author_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['category', 'status', '-created_at', '-id'],
+                name='post_category_status_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+        ),
+        # The auto-created tags table only has (post_id, tag_id); this covers
+        # tag-to-post lookups without reading the table itself.
+        migrations.RunSQL(
+            'CREATE INDEX post_tags_tag_post_idx '
+            'ON content_post_tags (tag_id, post_id)',
+            'DROP INDEX post_tags_tag_post_idx',
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.text import slugify
 
 from apps.utils.base_model import BaseModel
+from apps.utils.text import build_search_key
 
 from .categories import Category
 from .tags import Tag
@@ -27,6 +28,9 @@ class Post(BaseModel):
         null=False,
     )
     slug = models.SlugField(max_length=50, unique=True, null=False)
+    search_key = models.CharField(
+        max_length=100, blank=True, editable=False, db_index=True
+    )
     content = models.TextField(
         blank=False,
         null=False,
@@ -43,6 +47,7 @@ class Post(BaseModel):
     def full_clean(self, *args, **kwargs):
         if not self.slug or self.slug != slugify(self.title):
             self.slug = slugify(self.title)
+        self.search_key = build_search_key(self.title, max_length=100)
         super().full_clean(*args, **kwargs)
 
     def save(self, *args, **kwargs):
@@ -57,3 +62,21 @@ class Post(BaseModel):
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
         unique_together = ('author', 'slug')
+        # Every list is paginated by (-created_at, -id); each index serves one
+        # of its filters without a sort step.
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(status='published'),
+                name='post_published_created_idx',
+            ),
+            models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='post_author_created_idx',
+            ),
+            models.Index(
+                fields=['category', 'status', '-created_at', '-id'],
+                name='post_category_status_idx',
+            ),
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+        ]
@@ -2,11 +2,15 @@ from django.db import models
 from django.utils.text import slugify
 
 from apps.utils.base_model import BaseModel
+from apps.utils.text import build_search_key
 
 
 class Tag(BaseModel):
     name = models.CharField(max_length=50)
     slug = models.SlugField(max_length=50, unique=True, null=False)
+    search_key = models.CharField(
+        max_length=100, blank=True, editable=False, db_index=True
+    )
 
     def __str__(self):
         return self.name
@@ -14,6 +18,7 @@ class Tag(BaseModel):
     def full_clean(self, *args, **kwargs):
         if not self.slug or self.slug != slugify(self.name):
             self.slug = slugify(self.name)
+        self.search_key = build_search_key(self.name, max_length=100)
         super().full_clean(*args, **kwargs)
 
     def save(self, *args, **kwargs):
@@ -0,0 +1,211 @@
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from apps.utils.text import build_search_key
+
+SEARCH_FIELDS = ('title', 'content')
+DEFAULT_SEARCH_FIELDS = ('title',)
+
+FTS_TABLE = 'content_post_fts'
+POST_TABLE = 'content_post'
+
+# Title matches weigh more than content matches in both backends.
+FTS5_WEIGHTS = {'title': 10.0, 'content': 1.0}
+TSVECTOR_WEIGHTS = {'title': 'A', 'content': 'B'}
+TSVECTOR_CONFIG = 'simple'
+
+SQLITE_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content,
+        content='{POST_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, content ON {POST_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SCHEMA = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+POSTGRESQL_SCHEMA = [
+    f"""
+    ALTER TABLE {POST_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TSVECTOR_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TSVECTOR_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS {POST_TABLE}_search_vector_idx
+    ON {POST_TABLE} USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_DROP_SCHEMA = [
+    f'DROP INDEX IF EXISTS {POST_TABLE}_search_vector_idx',
+    f'ALTER TABLE {POST_TABLE} DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def sqlite_supports_fts5(conn=connection) -> bool:
+    with conn.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+
+
+def get_search_backend(conn=connection):
+    """
+    Return the full-text backend available on the connection, or None when
+    searches must fall back to plain LIKE lookups.
+    """
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor == 'sqlite':
+        if not hasattr(conn, '_fts5_available'):
+            conn._fts5_available = sqlite_supports_fts5(conn)
+        return 'sqlite' if conn._fts5_available else None
+    return None
+
+
+def create_search_index(conn=connection):
+    backend = get_search_backend(conn)
+    statements = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRESQL_SCHEMA}
+    with conn.cursor() as cursor:
+        for statement in statements.get(backend, []):
+            cursor.execute(statement)
+
+
+def drop_search_index(conn=connection):
+    backend = get_search_backend(conn)
+    statements = {'sqlite': SQLITE_DROP_SCHEMA, 'postgresql': POSTGRESQL_DROP_SCHEMA}
+    with conn.cursor() as cursor:
+        for statement in statements.get(backend, []):
+            cursor.execute(statement)
+
+
+def rebuild_search_index(conn=connection):
+    # The PostgreSQL column is generated, so only the FTS5 table needs a rebuild.
+    if get_search_backend(conn) == 'sqlite':
+        with conn.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def update_search_keys(model, source_field, batch_size=1000):
+    """
+    Recompute `search_key` from `source_field` in primary key order, one
+    transaction per batch. Returns the number of rows that changed.
+    """
+    max_length = model._meta.get_field('search_key').max_length
+    updated = 0
+    last_pk = None
+
+    while True:
+        rows = model.objects.order_by('pk')
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        rows = list(rows.values_list('pk', source_field, 'search_key')[:batch_size])
+        if not rows:
+            return updated
+
+        changed = []
+        for pk, source, current_key in rows:
+            search_key = build_search_key(source, max_length=max_length)
+            if search_key != current_key:
+                changed.append(model(pk=pk, search_key=search_key))
+
+        with transaction.atomic():
+            model.objects.bulk_update(changed, ['search_key'], batch_size=batch_size)
+
+        updated += len(changed)
+        last_pk = rows[-1][0]
+
+
+def search_posts(queryset, keywords, fields=DEFAULT_SEARCH_FIELDS):
+    """
+    Filter posts matching any of the keywords (as word prefixes) and annotate
+    them with `search_rank`, where a higher value is a better match.
+    """
+    backend = get_search_backend()
+
+    if backend == 'sqlite':
+        expression = _build_fts5_query(keywords, fields)
+        weights = ', '.join(str(FTS5_WEIGHTS[field]) for field in SEARCH_FIELDS)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                [expression],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {POST_TABLE}.id',
+                [expression],
+                output_field=FloatField(),
+            )
+        )
+
+    if backend == 'postgresql':
+        tsquery = _build_tsquery(keywords, fields)
+        return queryset.filter(
+            RawSQL(
+                f'{POST_TABLE}.search_vector @@ to_tsquery(%s, %s)',
+                [TSVECTOR_CONFIG, tsquery],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({POST_TABLE}.search_vector, to_tsquery(%s, %s))',
+                [TSVECTOR_CONFIG, tsquery],
+                output_field=FloatField(),
+            )
+        )
+
+    # search_key holds the accent-folded title, so word prefixes can be
+    # matched without normalizing every row at query time.
+    query = Q()
+    for keyword in keywords:
+        if 'title' in fields:
+            query |= Q(search_key__startswith=keyword)
+            query |= Q(search_key__contains=f' {keyword}')
+        if 'content' in fields:
+            query |= Q(content__icontains=keyword)
+    return queryset.filter(query).annotate(search_rank=Value(0.0, FloatField()))
+
+
+def _build_fts5_query(keywords, fields):
+    terms = ' OR '.join(
+        '"{}"*'.format(keyword.replace('"', '""')) for keyword in keywords
+    )
+    return f'{{{" ".join(fields)}}} : ({terms})'
+
+
+def _build_tsquery(keywords, fields):
+    labels = ''.join(TSVECTOR_WEIGHTS[field] for field in fields)
+    return ' | '.join(f'{keyword}:*{labels}' for keyword in keywords)
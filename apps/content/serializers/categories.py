@@ -1,57 +1,89 @@
-from django.forms.models import model_to_dict
+from functools import lru_cache
+
+from django.db.models import Prefetch
+
+from apps.utils.fieldsets import defer_unrequested, is_requested, requested
+from apps.utils.metrics import timed_serialization
+from apps.utils.serialization import compile_plan
+
+from ..models import Category, Post
+from .posts import POST_REFERENCES, PostSerializer
 
 
 class CategorySerializer:
+    resource_type = 'categories'
+    attribute_fields = ('name', 'description', 'slug', 'created_at', 'updated_at')
+    relationship_fields = ('posts',)
+    available_fields = (*attribute_fields, *relationship_fields)
+    deferrable_columns = {
+        'name': ('name',),
+        'description': ('description',),
+        'slug': ('slug',),
+        'search_key': ('search_key',),
+    }
+
+    @staticmethod
+    def prepare_queryset(queryset, fields=None, with_included=False):
+        queryset = defer_unrequested(
+            queryset, CategorySerializer.deferrable_columns, fields
+        )
+        if is_requested('posts', fields):
+            # Relationships and versions only read these columns of each post.
+            posts = Post.objects.all() if with_included else POST_REFERENCES
+            queryset = queryset.prefetch_related(Prefetch('posts', queryset=posts))
+        return queryset
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def attributes_plan(fields=None):
+        return compile_plan(
+            Category, tuple(requested(CategorySerializer.attribute_fields, fields))
+        )
+
+    @staticmethod
+    def get_versions(category, fields=None):
+        versions = [('categories', category.id, category.updated_at)]
+        if is_requested('posts', fields):
+            versions.extend(
+                ('posts', post.id, post.updated_at) for post in category.posts.all()
+            )
+        return versions
+
     @staticmethod
-    def serialize_category(category, include_relationships=True):
+    @timed_serialization
+    def serialize_category(category, include_relationships=True, fields=None):
         base_data = {
             'type': 'categories',
             'id': str(category.id),
-            'attributes': {
-                **model_to_dict(category, exclude=['id', 'posts']),
-                'created_at': category.created_at,
-                'updated_at': category.updated_at,
-            },
+            'attributes': CategorySerializer.attributes_plan(fields).serialize(
+                category
+            ),
         }
         if include_relationships:
             base_data['relationships'] = CategorySerializer._build_relationships(
-                category
+                category, fields
             )
         return base_data
 
     @staticmethod
-    def _build_relationships(category):
+    def _build_relationships(category, fields=None):
         relationships = {}
-        if category.posts.exists():
+        if not is_requested('posts', fields):
+            return relationships
+        posts = category.posts.all()
+        if posts:
             relationships['posts'] = {
-                'data': [
-                    {'type': 'posts', 'id': str(post.id)}
-                    for post in category.posts.all()
-                ]
+                'data': [{'type': 'posts', 'id': str(post.id)} for post in posts]
             }
         return relationships
 
     @staticmethod
+    @timed_serialization
     def build_included_data(category):
         included = []
-        if category.posts.exists():
-            included.extend(CategorySerializer._process_posts(category))
+        included.extend(CategorySerializer._process_posts(category))
         return [item for item in included if item]
 
     @staticmethod
     def _process_posts(category):
-        return [
-            {
-                'type': 'posts',
-                'id': str(post.id),
-                'attributes': {
-                    'title': post.title,
-                    'slug': post.slug,
-                    'content': post.content,
-                    'status': post.status,
-                    'created_at': post.created_at,
-                    'updated_at': post.updated_at,
-                },
-            }
-            for post in category.posts.all()
-        ]
+        return PostSerializer.serialize_related_posts(category.posts.all())
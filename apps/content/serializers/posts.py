@@ -1,97 +1,258 @@
-from django.forms.models import model_to_dict
+from functools import lru_cache
+
+from django.db.models import QuerySet, prefetch_related_objects
+
+from apps.media_files.serializers import MediaFileSerializer
+from apps.utils.fieldsets import defer_unrequested, is_requested, requested
+from apps.utils.includes import deduplicate
+from apps.utils.metrics import timed_serialization
+from apps.utils.serialization import compile_plan
+
+from ..models import Category, Post, PostStatistics
+
+# Enough of a post for relationship linkage and versions in other resources.
+POST_REFERENCES = Post.objects.only('id', 'updated_at')
+
+CATEGORY_ATTRIBUTES = ('name', 'description', 'slug', 'created_at', 'updated_at')
+STATISTICS_ATTRIBUTES = (
+    'share_count',
+    'like_count',
+    'comment_count',
+    'created_at',
+    'updated_at',
+)
 
 
 class PostSerializer:
+    resource_type = 'posts'
+    attribute_fields = (
+        'title',
+        'slug',
+        'content',
+        'status',
+        'created_at',
+        'updated_at',
+    )
+    relationship_fields = ('author', 'category', 'statistics', 'tags', 'media_files')
+    available_fields = (*attribute_fields, *relationship_fields)
+    # Columns left out of the SELECT when a sparse fieldset skips their field.
+    # search_key is never serialized, so any fieldset defers it.
+    deferrable_columns = {
+        'title': ('title',),
+        'slug': ('slug',),
+        'content': ('content',),
+        'search_key': ('search_key',),
+    }
+    select_related_fields = {
+        'author': 'author',
+        'category': 'category',
+        'statistics': 'post_statistics',
+    }
+    prefetch_related_fields = {'tags': 'tags', 'media_files': 'media_files'}
+
     @staticmethod
-    def serialize_post(post, include_relationships=True):
+    def prepare_queryset(queryset, fields=None, include=None):
+        queryset = defer_unrequested(
+            queryset, PostSerializer.deferrable_columns, fields
+        )
+        select_related = PostSerializer._related_lookups(
+            PostSerializer.select_related_fields, fields, include
+        )
+        if select_related:
+            # select_related() without arguments would follow every relation.
+            queryset = queryset.select_related(*select_related)
+        return queryset.prefetch_related(
+            *PostSerializer._related_lookups(
+                PostSerializer.prefetch_related_fields, fields, include
+            )
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def attributes_plan(fields=None):
+        return compile_plan(
+            Post, tuple(requested(PostSerializer.attribute_fields, fields))
+        )
+
+    @staticmethod
+    def _is_loaded(name, fields=None, include=None):
+        # Relationships are loaded for linkage in the fieldset or for included.
+        return is_requested(name, fields) or name in (include or ())
+
+    @staticmethod
+    def _related_lookups(lookups, fields, include=None):
+        return [
+            lookup
+            for name, lookup in lookups.items()
+            if PostSerializer._is_loaded(name, fields, include)
+        ]
+
+    @staticmethod
+    @timed_serialization
+    def serialize_many(posts, include_relationships=True, fields=None):
+        if isinstance(posts, QuerySet):
+            posts = list(PostSerializer.prepare_queryset(posts, fields))
+        elif include_relationships:
+            posts = list(posts)
+            prefetch_related_objects(
+                posts,
+                *PostSerializer._related_lookups(
+                    PostSerializer.prefetch_related_fields, fields
+                ),
+            )
+
+        return [
+            PostSerializer.serialize_post(post, include_relationships, fields)
+            for post in posts
+        ]
+
+    @staticmethod
+    def get_versions(post, fields=None, include=None):
+        # Everything the serialized post and its included data depend on.
+        def loaded(name):
+            return PostSerializer._is_loaded(name, fields, include)
+
+        versions = [('posts', post.id, post.updated_at)]
+        if loaded('author'):
+            versions.append(
+                ('users', post.author_id, post.author.username, post.author.role)
+            )
+        if loaded('category'):
+            versions.append(('categories', post.category_id, post.category.updated_at))
+        if loaded('statistics'):
+            versions.append(
+                ('post_statistics', post.id, post.post_statistics.updated_at)
+            )
+        if loaded('tags'):
+            versions.extend(('tags', tag.id, tag.updated_at) for tag in post.tags.all())
+        if loaded('media_files'):
+            versions.extend(
+                ('media_files', media_file.id, media_file.updated_at)
+                for media_file in post.media_files.all()
+            )
+        return versions
+
+    @staticmethod
+    @timed_serialization
+    def serialize_post(post, include_relationships=True, fields=None):
         base_data = {
             'type': 'posts',
             'id': str(post.id),
-            'attributes': {
-                **model_to_dict(
-                    post, exclude=['id', 'author', 'category', 'tags', 'media_files']
-                ),
-                'created_at': post.created_at,
-                'updated_at': post.updated_at,
-            },
+            'attributes': PostSerializer.attributes_plan(fields).serialize(post),
         }
 
         if include_relationships:
-            base_data['relationships'] = PostSerializer._build_relationships(post)
+            base_data['relationships'] = PostSerializer._build_relationships(
+                post, fields
+            )
 
         return base_data
 
     @staticmethod
-    def _build_relationships(post):
+    def _build_relationships(post, fields=None):
         relationships = {
-            'author': {'data': {'type': 'users', 'id': str(post.author.id)}},
-            'category': {'data': {'type': 'categories', 'id': str(post.category.id)}},
+            'author': {'data': {'type': 'users', 'id': str(post.author_id)}},
+            'category': {'data': {'type': 'categories', 'id': str(post.category_id)}},
             'statistics': {'data': {'type': 'post-statistics', 'id': str(post.id)}},
         }
+        relationships = {
+            name: relationship
+            for name, relationship in relationships.items()
+            if is_requested(name, fields)
+        }
 
-        for rel in ['tags', 'media_files']:
-            if getattr(post, rel).exists():
+        # .all() reads from the prefetch cache when serialize_many populated it.
+        for rel in requested(['tags', 'media_files'], fields):
+            related_objects = getattr(post, rel).all()
+            if related_objects:
                 relationships[rel] = {
                     'data': [
-                        {'type': f'{rel}', 'id': str(obj.id)}
-                        for obj in getattr(post, rel).all()
+                        {'type': f'{rel}', 'id': str(obj.id)} for obj in related_objects
                     ]
                 }
 
         return relationships
 
     @staticmethod
-    def build_included_data(post):
-        included = []
-        included.extend(
-            [
-                PostSerializer._serialize_related_user(post.author),
-                PostSerializer._serialize_category(post.category),
-                PostSerializer._serialize_statistics(post.post_statistics),
-            ]
-        )
+    @timed_serialization
+    def serialize_related_posts(posts):
+        plan = PostSerializer.attributes_plan()
+        return [
+            {'type': 'posts', 'id': str(post.id), 'attributes': plan.serialize(post)}
+            for post in posts
+        ]
 
-        included.extend(PostSerializer._process_tags(post))
-        included.extend(PostSerializer._process_media_files(post))
+    @staticmethod
+    @timed_serialization
+    def build_included_data(post, fields=None, include=None):
+        """
+        Related resources of post: those named in include, or when include is
+        None, every relationship in the fieldset.
+        """
+        names = (
+            include
+            if include is not None
+            else requested(PostSerializer.relationship_fields, fields)
+        )
+        included = []
+        if 'author' in names:
+            included.append(PostSerializer._serialize_related_user(post.author))
+        if 'category' in names:
+            included.append(PostSerializer._serialize_category(post.category))
+        if 'statistics' in names:
+            included.append(PostSerializer._serialize_statistics(post.post_statistics))
+        if 'tags' in names:
+            included.extend(PostSerializer._process_tags(post))
+        if 'media_files' in names:
+            included.extend(PostSerializer._process_media_files(post))
 
         return [item for item in included if item]
 
+    @staticmethod
+    @timed_serialization
+    def build_included_many(posts, include):
+        """
+        Included resources for a page of posts prepared with include, so
+        every relationship was loaded with one query for the whole page.
+        """
+        return deduplicate(
+            item
+            for post in posts
+            for item in PostSerializer.build_included_data(post, include=include)
+        )
+
     @staticmethod
     def _serialize_related_user(user):
         return {
             'type': 'users',
             'id': str(user.id),
-            'attributes': model_to_dict(user, fields=['username', 'role']),
+            'attributes': compile_plan(type(user), ('username', 'role')).serialize(
+                user
+            ),
         }
 
     @staticmethod
     def _serialize_category(category):
-        data = {
+        return {
             'type': 'categories',
             'id': str(category.id),
-            'attributes': model_to_dict(category, exclude=['id']),
+            'attributes': compile_plan(Category, CATEGORY_ATTRIBUTES).serialize(
+                category
+            ),
         }
-        data['attributes'].update(
-            {'created_at': category.created_at, 'updated_at': category.updated_at}
-        )
-        return data
 
+    @staticmethod
     def _serialize_statistics(statistics):
-        data = {
+        return {
             'type': 'post_statistics',
-            'id': str(statistics.post.id),
-            'attributes': model_to_dict(statistics, exclude=['post']),
+            'id': str(statistics.post_id),
+            'attributes': compile_plan(PostStatistics, STATISTICS_ATTRIBUTES).serialize(
+                statistics
+            ),
         }
-        data['attributes'].update(
-            {'created_at': statistics.created_at, 'updated_at': statistics.updated_at}
-        )
-        return data
 
     @staticmethod
     def _process_tags(post):
-        if not post.tags.exists():
-            return []
-
         return [
             {
                 'type': 'tags',
@@ -108,15 +269,12 @@ class PostSerializer:
 
     @staticmethod
     def _process_media_files(post):
-        if not post.media_files.exists():
-            return []
-
         return [
             {
                 'type': 'media_files',
                 'id': str(media_file.id),
                 'attributes': {
-                    'file': media_file.file.url,
+                    'file': MediaFileSerializer.get_download_url(media_file),
                     'type': str(media_file.type),
                     'created_at': media_file.created_at,
                     'updated_at': media_file.updated_at,
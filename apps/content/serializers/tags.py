@@ -1,59 +1,87 @@
 # utils/serializers.py
-from django.forms.models import model_to_dict
+from functools import lru_cache
+
+from django.db.models import Prefetch
+
+from apps.utils.fieldsets import defer_unrequested, is_requested, requested
+from apps.utils.metrics import timed_serialization
+from apps.utils.serialization import compile_plan
+
+from ..models import Post, Tag
+from .posts import POST_REFERENCES, PostSerializer
 
 
 class TagSerializer:
+    resource_type = 'tags'
+    attribute_fields = ('name', 'slug', 'created_at', 'updated_at')
+    relationship_fields = ('posts',)
+    available_fields = (*attribute_fields, *relationship_fields)
+    deferrable_columns = {
+        'name': ('name',),
+        'slug': ('slug',),
+        'search_key': ('search_key',),
+    }
+
+    @staticmethod
+    def prepare_queryset(queryset, fields=None, with_included=False):
+        queryset = defer_unrequested(queryset, TagSerializer.deferrable_columns, fields)
+        if is_requested('posts', fields):
+            # Relationships and versions only read these columns of each post.
+            posts = Post.objects.all() if with_included else POST_REFERENCES
+            queryset = queryset.prefetch_related(Prefetch('posts', queryset=posts))
+        return queryset
+
     @staticmethod
-    def serialize_tag(tag, include_relationships=True):
+    @lru_cache(maxsize=None)
+    def attributes_plan(fields=None):
+        return compile_plan(
+            Tag, tuple(requested(TagSerializer.attribute_fields, fields))
+        )
+
+    @staticmethod
+    def get_versions(tag, fields=None):
+        versions = [('tags', tag.id, tag.updated_at)]
+        if is_requested('posts', fields):
+            versions.extend(
+                ('posts', post.id, post.updated_at) for post in tag.posts.all()
+            )
+        return versions
+
+    @staticmethod
+    @timed_serialization
+    def serialize_tag(tag, include_relationships=True, fields=None):
         base_data = {
             'type': 'tags',
             'id': str(tag.id),
-            'attributes': {
-                **model_to_dict(tag, exclude=['id']),
-                'created_at': tag.created_at,
-                'updated_at': tag.updated_at,
-            },
+            'attributes': TagSerializer.attributes_plan(fields).serialize(tag),
         }
 
         if include_relationships:
-            base_data['relationships'] = TagSerializer._build_relationships(tag)
+            base_data['relationships'] = TagSerializer._build_relationships(tag, fields)
 
         return base_data
 
     @staticmethod
-    def _build_relationships(tag):
+    def _build_relationships(tag, fields=None):
         relationships = {}
-        if tag.posts.exists():
+        if not is_requested('posts', fields):
+            return relationships
+        posts = tag.posts.all()
+        if posts:
             relationships['posts'] = {
-                'data': [
-                    {'type': 'posts', 'id': str(post.id)} for post in tag.posts.all()
-                ]
+                'data': [{'type': 'posts', 'id': str(post.id)} for post in posts]
             }
 
         return relationships
 
     @staticmethod
+    @timed_serialization
     def build_included_data(tag):
         included = []
-        if tag.posts.exists():
-            included.extend(TagSerializer._process_posts(tag))
+        included.extend(TagSerializer._process_posts(tag))
 
         return [item for item in included if item]
 
     @staticmethod
     def _process_posts(tag):
-        return [
-            {
-                'type': 'posts',
-                'id': str(post.id),
-                'attributes': {
-                    'title': post.title,
-                    'slug': post.slug,
-                    'content': post.content,
-                    'status': post.status,
-                    'created_at': post.created_at,
-                    'updated_at': post.updated_at,
-                },
-            }
-            for post in tag.posts.all()
-        ]
+        return PostSerializer.serialize_related_posts(tag.posts.all())
@@ -0,0 +1,38 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.media_files.models import MediaFile
+from apps.utils.cache import bump_version_on_commit
+
+from .models import Category, Post, PostStatistics, Tag
+from .slugs import category_ids, tag_ids
+
+POSTS_CACHE_NAMESPACE = 'posts'
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=MediaFile)
+@receiver(post_save, sender=PostStatistics)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=MediaFile)
+@receiver(post_delete, sender=PostStatistics)
+def invalidate_posts_cache(sender, **kwargs):
+    bump_version_on_commit(POSTS_CACHE_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_posts_cache_on_tags_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version_on_commit(POSTS_CACHE_NAMESPACE)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_slug_ids(sender, **kwargs):
+    (tag_ids if sender is Tag else category_ids).invalidate()
@@ -0,0 +1,6 @@
+from apps.utils.slugs import SlugIdCache
+
+from .models import Category, Tag
+
+category_ids = SlugIdCache(Category, 'category-slugs')
+tag_ids = SlugIdCache(Tag, 'tag-slugs')
@@ -3,10 +3,16 @@ from django.urls import path
 from .views import (
     CategoryDetailView,
     CategoryListView,
+    PostCounterView,
     PostDetailView,
     PostListView,
     PostMediaFileDetailView,
+    PostMediaFileDownloadView,
     PostMediaFileListView,
+    PostMediaFileVariantDownloadView,
+    PostMediaUploadDetailView,
+    PostMediaUploadListView,
+    PostOperationsView,
     TagDetailView,
     TagListView,
 )
@@ -19,6 +25,8 @@ urlpatterns = [
     path('tags/', TagListView.as_view(), name='tag-list'),
     path('tags/<str:slug>/', TagDetailView.as_view(), name='tag-detail'),
     path('posts/', PostListView.as_view(), name='post-list'),
+    # Outside posts/ so that no post slug can shadow it.
+    path('operations/', PostOperationsView.as_view(), name='post-operations'),
     path('posts/<str:slug>/', PostDetailView.as_view(), name='post-detail'),
     path(
         'posts/<str:slug>/media/',
@@ -30,4 +38,34 @@ urlpatterns = [
         PostMediaFileDetailView.as_view(),
         name='post-media-detail',
     ),
+    path(
+        'posts/<str:slug>/media/<int:id>/download/',
+        PostMediaFileDownloadView.as_view(),
+        name='post-media-download',
+    ),
+    path(
+        'posts/<str:slug>/media/<int:id>/download/<int:width>.<str:format>',
+        PostMediaFileVariantDownloadView.as_view(),
+        name='post-media-variant-download',
+    ),
+    path(
+        'posts/<str:slug>/media/uploads/',
+        PostMediaUploadListView.as_view(),
+        name='post-media-upload-list',
+    ),
+    path(
+        'posts/<str:slug>/media/uploads/<uuid:id>/',
+        PostMediaUploadDetailView.as_view(),
+        name='post-media-upload-detail',
+    ),
+    path(
+        'posts/<str:slug>/likes/',
+        PostCounterView.as_view(field='like_count'),
+        name='post-likes',
+    ),
+    path(
+        'posts/<str:slug>/shares/',
+        PostCounterView.as_view(field='share_count'),
+        name='post-shares',
+    ),
 ]
@@ -1,9 +1,15 @@
 from .categories import CategoryDetailView, CategoryListView
 from .posts import (
+    PostCounterView,
     PostDetailView,
     PostListView,
     PostMediaFileDetailView,
+    PostMediaFileDownloadView,
     PostMediaFileListView,
+    PostMediaFileVariantDownloadView,
+    PostMediaUploadDetailView,
+    PostMediaUploadListView,
+    PostOperationsView,
 )
 from .tags import TagDetailView, TagListView
 
@@ -16,4 +22,10 @@ __all__ = [
     'TagListView',
     'PostMediaFileListView',
     'PostMediaFileDetailView',
+    'PostMediaFileDownloadView',
+    'PostMediaFileVariantDownloadView',
+    'PostMediaUploadListView',
+    'PostMediaUploadDetailView',
+    'PostCounterView',
+    'PostOperationsView',
 ]
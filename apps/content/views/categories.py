@@ -6,8 +6,15 @@ from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
+from apps.utils.conditional import (
+    build_etag,
+    get_not_modified_response,
+    set_validators,
+)
 from apps.utils.decorators import admin_required, login_required
+from apps.utils.fieldsets import get_requested_fields
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+from apps.utils.query_filters import filter_by_search_key_prefix
 from apps.utils.validators import validate_invalid_fields, validate_required_fields
 
 from ..models import Category
@@ -19,11 +26,32 @@ class CategoryListView(View):
 
     def get(self, request, *args, **kwargs):
         try:
-            queryset = Category.objects.all()
+            fields = get_requested_fields(request.GET, CategorySerializer)
+            queryset = CategorySerializer.prepare_queryset(
+                Category.objects.all(), fields
+            )
+            queryset = filter_by_search_key_prefix(queryset, request.GET)
+            categories = list(queryset)
+
+            etag = build_etag(
+                request,
+                [
+                    version
+                    for category in categories
+                    for version in CategorySerializer.get_versions(category, fields)
+                ],
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
             data = [
-                CategorySerializer.serialize_category(category) for category in queryset
+                CategorySerializer.serialize_category(category, fields=fields)
+                for category in categories
             ]
-            return jarb.ok(data)
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Exception as e:
             return jarb.error(500, 'Internal Server Error', str(e))
 
@@ -55,13 +83,28 @@ class CategoryDetailView(View):
 
     def get(self, request, *args, **kwargs):
         try:
-            category = get_object_or_404(Category, slug=self.kwargs.get('slug'))
-            data = CategorySerializer.serialize_category(category)
+            fields = get_requested_fields(request.GET, CategorySerializer)
+            category = get_object_or_404(
+                CategorySerializer.prepare_queryset(
+                    Category.objects.all(), fields, with_included=True
+                ),
+                slug=self.kwargs.get('slug'),
+            )
+            etag = build_etag(
+                request, CategorySerializer.get_versions(category, fields)
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = CategorySerializer.serialize_category(category, fields=fields)
 
             if data['relationships']:
                 data['included'] = CategorySerializer.build_included_data(category)
 
-            return jarb.ok(data)
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
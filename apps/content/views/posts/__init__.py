@@ -1,10 +1,24 @@
 from .detail import PostDetailView
 from .list import PostListView
-from .media import PostMediaFileDetailView, PostMediaFileListView
+from .media import (
+    PostMediaFileDetailView,
+    PostMediaFileDownloadView,
+    PostMediaFileListView,
+    PostMediaFileVariantDownloadView,
+)
+from .operations import PostOperationsView
+from .statistics import PostCounterView
+from .uploads import PostMediaUploadDetailView, PostMediaUploadListView
 
 __all__ = [
     'PostListView',
     'PostDetailView',
     'PostMediaFileListView',
     'PostMediaFileDetailView',
+    'PostMediaFileDownloadView',
+    'PostMediaFileVariantDownloadView',
+    'PostMediaUploadListView',
+    'PostMediaUploadDetailView',
+    'PostCounterView',
+    'PostOperationsView',
 ]
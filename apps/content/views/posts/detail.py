@@ -6,36 +6,64 @@ from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
-from apps.content.models import Category, Post
+from apps.content.models import Post
 from apps.content.serializers import PostSerializer
+from apps.content.signals import POSTS_CACHE_NAMESPACE
+from apps.utils.cache import cache_public_response
+from apps.utils.conditional import (
+    build_etag,
+    get_not_modified_response,
+    set_validators,
+)
 from apps.utils.decorators import admin_or_author_required, login_required
+from apps.utils.fieldsets import get_requested_fields
+from apps.utils.includes import get_requested_include
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
-from apps.utils.validators import get_valid_tags_or_404, validate_invalid_fields
+from apps.utils.validators import (
+    get_category_id_or_404,
+    get_valid_tag_ids_or_404,
+    validate_invalid_fields,
+)
 
 
 class PostDetailView(View):
     http_method_names = ['get', 'patch', 'put', 'delete', 'head', 'options']
 
+    @method_decorator(cache_public_response(POSTS_CACHE_NAMESPACE))
     def get(self, request, *args, **kwargs):
         try:
-            post = get_object_or_404(Post, slug=self.kwargs.get('slug'))
-            data = PostSerializer.serialize_post(post)
-
-            if data['relationships']:
-                data['included'] = PostSerializer.build_included_data(post)
-
-            if post.is_public():
-                return jarb.ok(data)
-
-            if request.user.is_authenticated and (
-                request.user.role == 'admin' or request.user.id == post.author.id
+            fields = get_requested_fields(request.GET, PostSerializer)
+            include = get_requested_include(request.GET, PostSerializer)
+            post = get_object_or_404(
+                PostSerializer.prepare_queryset(Post.objects.all(), fields, include),
+                slug=self.kwargs.get('slug'),
+            )
+            if not post.is_public() and not (
+                request.user.is_authenticated
+                and (request.user.role == 'admin' or request.user.id == post.author_id)
             ):
-                return jarb.ok(data)
-
-            else:
                 return jarb.error(
                     403, 'Forbidden', 'You do not have permission to view this post'
                 )
+
+            etag = build_etag(
+                request, PostSerializer.get_versions(post, fields, include)
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = PostSerializer.serialize_post(post, fields=fields)
+
+            # Without include, everything in the fieldset is included.
+            if include is not None or data['relationships']:
+                data['included'] = PostSerializer.build_included_data(
+                    post, fields, include
+                )
+
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
@@ -55,11 +83,10 @@ class PostDetailView(View):
             validate_invalid_fields(data, allowed_fields)
 
             if 'category' in data:
-                category = get_object_or_404(Category, slug=data['category'])
-                post.category = category
+                post.category_id = get_category_id_or_404(data['category'])
 
             if 'tags' in data:
-                post.tags.set(get_valid_tags_or_404(data['tags']))
+                post.tags.set(get_valid_tag_ids_or_404(data['tags']))
 
             for field in set(data.keys()) - {'category', 'tags'}:
                 setattr(post, field, data[field])
@@ -1,18 +1,29 @@
 import json
+from datetime import datetime
 
 from django.core.exceptions import ValidationError
 from django.http import Http404
-from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
-from apps.content.models import Category, Post
+from apps.content.models import Post
 from apps.content.serializers import PostSerializer
+from apps.content.signals import POSTS_CACHE_NAMESPACE
+from apps.utils.cache import cache_public_response
+from apps.utils.conditional import (
+    build_etag,
+    get_not_modified_response,
+    set_validators,
+)
 from apps.utils.decorators import admin_or_author_required, login_required
+from apps.utils.fieldsets import get_requested_fields
+from apps.utils.includes import get_requested_include
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+from apps.utils.pagination import CursorPaginator
 from apps.utils.query_filters import filter_posts_by_params, filter_posts_by_user_role
 from apps.utils.validators import (
-    get_valid_tags_or_404,
+    get_category_id_or_404,
+    get_valid_tag_ids_or_404,
     validate_invalid_fields,
     validate_required_fields,
 )
@@ -28,11 +39,62 @@ class PostListView(View):
         queryset = filter_posts_by_params(queryset, self.request.GET)
         return queryset
 
+    @method_decorator(cache_public_response(POSTS_CACHE_NAMESPACE))
     def get(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            data = [PostSerializer.serialize_post(post) for post in queryset]
-            return jarb.ok(data)
+            fields = get_requested_fields(request.GET, PostSerializer)
+            include = get_requested_include(request.GET, PostSerializer)
+            queryset = PostSerializer.prepare_queryset(
+                self.get_queryset(), fields, include
+            )
+            ordering = ('-created_at', '-id')
+            if 'search_rank' in queryset.query.annotations:
+                ordering = ('-search_rank', *ordering)
+            paginator = CursorPaginator(ordering=ordering)
+            page = paginator.paginate(queryset, request.GET)
+            # An empty first page means the search matched nothing, which
+            # saves a separate EXISTS query before the page is read.
+            if (
+                request.GET.get('search')
+                and not page.items
+                and not request.GET.get(paginator.after_param)
+                and not request.GET.get(paginator.before_param)
+            ):
+                raise Http404('No Post matches the given query.')
+
+            etag = build_etag(
+                request,
+                [
+                    ('links', page.next_cursor, page.prev_cursor),
+                    *[
+                        version
+                        for post in page
+                        for version in PostSerializer.get_versions(
+                            post, fields, include
+                        )
+                    ],
+                ],
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = PostSerializer.serialize_many(page.items, fields=fields)
+            meta = {
+                'timestamp': datetime.now().isoformat(),
+                'pagination': paginator.get_meta(page),
+            }
+            response = jarb.ok(
+                data,
+                meta=meta,
+                links=paginator.get_links(request, page),
+                included=(
+                    PostSerializer.build_included_many(page.items, include)
+                    if include is not None
+                    else None
+                ),
+            )
+            return set_validators(response, etag)
 
         except ValidationError as e:
             return jarb.validation_errors_from_dict(e.message_dict)
@@ -51,21 +113,21 @@ class PostListView(View):
             validate_invalid_fields(data, allowed_fields)
             validate_required_fields(data, required_fields)
 
-            category = get_object_or_404(Category, slug=data.get('category'))
+            category_id = get_category_id_or_404(data.get('category'))
 
             tag_slugs = data.get('tags') or []
-            tags = get_valid_tags_or_404(tag_slugs)
+            tag_ids = get_valid_tag_ids_or_404(tag_slugs)
 
             post = Post(
                 title=data.get('title'),
                 content=data.get('content'),
-                category=category,
+                category_id=category_id,
                 author=self.request.user,
                 status=Post.Status.DRAFT,
             )
 
             post.save()
-            post.tags.set(tags.values())
+            post.tags.set(tag_ids)
 
             return jarb.created(PostSerializer.serialize_post(post))
         except json.JSONDecodeError as e:
@@ -1,3 +1,6 @@
+import os
+from typing import Optional
+
 from django.core.exceptions import ValidationError
 from django.http import Http404
 from django.shortcuts import get_object_or_404
@@ -7,8 +10,32 @@ from django.views import View
 from apps.content.models import Post
 from apps.media_files.models import MediaFile
 from apps.media_files.serializers import MediaFileSerializer
+from apps.media_files.uploads import save_media_files
+from apps.utils.conditional import (
+    build_etag,
+    get_not_modified_response,
+    set_validators,
+)
 from apps.utils.decorators import admin_or_author_required, login_required
+from apps.utils.downloads import serve_file
+from apps.utils.fieldsets import get_requested_fields
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+from apps.utils.metrics import registry
+
+
+def get_media_visibility(request, post) -> Optional[bool]:
+    """
+    True if the media files of post are shown to this request with their
+    public attributes only, False if with all of them, None if not at all.
+    """
+    if post.is_public() and not request.user.is_authenticated:
+        return True
+    if request.user.is_authenticated and (
+        (request.user.role == 'author' and request.user.id == post.author_id)
+        or request.user.role == 'admin'
+    ):
+        return False
+    return None
 
 
 class PostMediaFileListView(View):
@@ -16,25 +43,41 @@ class PostMediaFileListView(View):
 
     def get(self, request, *args, **kwargs):
         try:
+            fields = get_requested_fields(request.GET, MediaFileSerializer)
             post = get_object_or_404(Post, slug=self.kwargs.get('slug'))
 
-            if post.is_public() and not request.user.is_authenticated:
-                serialized_data = MediaFileSerializer.serialize_media_files(
-                    post.media_files.all(), public=True
+            public = get_media_visibility(request, post)
+            if public is None:
+                return jarb.error(
+                    403,
+                    'Forbidden',
+                    'You do not have permission to view these media files',
                 )
-                return jarb.ok(serialized_data)
 
-            if request.user.is_authenticated and (
-                (request.user.role == 'author' and request.user.id == post.author.id)
-                or request.user.role == 'admin'
-            ):
-                serialized_data = MediaFileSerializer.serialize_media_files(
-                    post.media_files.all(), public=False
-                )
-                return jarb.ok(serialized_data)
-            return jarb.error(
-                403, 'Forbidden', 'You do not have permission to view these media files'
+            media_files = list(
+                MediaFileSerializer.prepare_queryset(post.media_files.all(), fields)
+            )
+            etag = build_etag(
+                request,
+                [
+                    ('public', public),
+                    *[
+                        version
+                        for media_file in media_files
+                        for version in MediaFileSerializer.get_versions(media_file)
+                    ],
+                ],
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            serialized_data = MediaFileSerializer.serialize_media_files(
+                media_files, public=public, fields=fields
             )
+            return set_validators(jarb.ok(serialized_data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
@@ -53,11 +96,14 @@ class PostMediaFileListView(View):
             if not files:
                 return jarb.error(400, 'Bad Request', 'No files provided')
 
-            media_files = []
-            for file in files:
-                media_file = MediaFile(post=post, file=file)
-                media_file.save()
-                media_files.append(media_file)
+            media_files = save_media_files(post, files)
+            for media_file in media_files:
+                registry.increment('media_uploads_total', {'type': media_file.type})
+                registry.increment(
+                    'media_upload_bytes_total',
+                    {'type': media_file.type},
+                    media_file.size,
+                )
 
             data = MediaFileSerializer.serialize_media_files(media_files, public=False)
             return jarb.created(data)
@@ -74,33 +120,37 @@ class PostMediaFileDetailView(View):
 
     def get(self, request, *args, **kwargs):
         try:
+            fields = get_requested_fields(request.GET, MediaFileSerializer)
             media_file = get_object_or_404(
-                MediaFile,
+                MediaFileSerializer.prepare_queryset(
+                    MediaFile.objects.select_related('post'), fields
+                ),
                 id=self.kwargs.get('id'),
                 post__slug=self.kwargs.get('slug'),
             )
 
-            if media_file.post.is_public() and not request.user.is_authenticated:
-                data = MediaFileSerializer.serialize_media_file(media_file, public=True)
-                return jarb.ok(data)
-
-            if request.user.is_authenticated and (
-                (
-                    request.user.role == 'author'
-                    and request.user.id == media_file.post.author.id
-                )
-                or request.user.role == 'admin'
-            ):
-                data = MediaFileSerializer.serialize_media_file(
-                    media_file, public=False
-                )
-                return jarb.ok(data)
-            else:
+            public = get_media_visibility(request, media_file.post)
+            if public is None:
                 return jarb.error(
                     403,
                     'Forbidden',
                     'You do not have permission to view this media file',
                 )
+
+            etag = build_etag(
+                request,
+                [('public', public), *MediaFileSerializer.get_versions(media_file)],
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = MediaFileSerializer.serialize_media_file(
+                media_file, public=public, fields=fields
+            )
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
@@ -123,10 +173,88 @@ class PostMediaFileDetailView(View):
                     'You do not have permission to delete this media file',
                 )
 
-            media_file.file.delete(save=False)
+            for variant in media_file.variants.all():
+                variant.file.delete(save=False)
+            # Files stored by content may be shared with other media files:
+            # deleting the row releases the blob, and its file goes with the
+            # last reference.
+            if not media_file.content_hash:
+                media_file.file.delete(save=False)
             media_file.delete()
             return jarb.no_content()
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
             return jarb.error(500, 'Internal Server Error', str(e))
+
+
+class PostMediaFileDownloadView(View):
+    """
+    The content of a media file, for the users who can see its post. Media
+    is only served through this view: nginx's location for MEDIA_ROOT is
+    internal, reached through the X-Accel-Redirect sent once access is
+    checked.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+
+    def get_download(self, request, media_file):
+        """Return the file to send, its name, ETag and Last-Modified."""
+        # Files stored by content hash are identified by it; the others by
+        # their row version.
+        if media_file.content_hash:
+            etag = f'"{media_file.content_hash}"'
+        else:
+            etag = build_etag(
+                request, MediaFileSerializer.get_versions(media_file), weak=False
+            )
+        return media_file.file, media_file.name, etag, media_file.updated_at
+
+    def get(self, request, *args, **kwargs):
+        try:
+            media_file = get_object_or_404(
+                MediaFile.objects.select_related('post'),
+                id=self.kwargs.get('id'),
+                post__slug=self.kwargs.get('slug'),
+            )
+            # The media of published posts is for every reader, signed in or
+            # not; that of drafts for their author and admins only.
+            public = media_file.post.is_public() or get_media_visibility(
+                request, media_file.post
+            )
+            if public is None:
+                return jarb.error(
+                    403,
+                    'Forbidden',
+                    'You do not have permission to view this media file',
+                )
+
+            file, filename, etag, last_modified = self.get_download(request, media_file)
+            response = get_not_modified_response(request, etag, last_modified)
+            if response is None:
+                response = serve_file(request, file, filename, etag, last_modified)
+            if not public:
+                response['Cache-Control'] = 'private'
+            return set_validators(response, etag, last_modified)
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
+
+
+class PostMediaFileVariantDownloadView(PostMediaFileDownloadView):
+    """A resized copy of an image, listed in its srcset."""
+
+    def get_download(self, request, media_file):
+        variant = get_object_or_404(
+            media_file.variants,
+            width=self.kwargs.get('width'),
+            format=self.kwargs.get('format'),
+        )
+        etag = build_etag(
+            request,
+            [('media_file_variants', variant.id, variant.updated_at)],
+            weak=False,
+        )
+        filename = os.path.basename(variant.file.name)
+        return variant.file, filename, etag, variant.updated_at
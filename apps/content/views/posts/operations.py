@@ -0,0 +1,33 @@
+import json
+
+from django.core.exceptions import PermissionDenied, RequestDataTooBig, ValidationError
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from apps.content.bulk import apply_post_operations
+from apps.content.serializers import PostSerializer
+from apps.utils.decorators import admin_or_author_required, login_required
+from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+
+
+class PostOperationsView(View):
+    http_method_names = ['post', 'options']
+
+    @method_decorator([login_required, admin_or_author_required])
+    def post(self, request, *args, **kwargs):
+        try:
+            document = json.loads(request.body)
+            posts = apply_post_operations(document, request.user)
+            return jarb.atomic_results(
+                PostSerializer.serialize_many(posts, include_relationships=False)
+            )
+        except RequestDataTooBig as e:
+            return jarb.error(413, 'Content Too Large', str(e))
+        except json.JSONDecodeError as e:
+            return jarb.error(400, 'Bad Request', f'Invalid JSON: {str(e)}')
+        except PermissionDenied as e:
+            return jarb.error(403, 'Forbidden', str(e))
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
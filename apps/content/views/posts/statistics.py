@@ -0,0 +1,33 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from apps.content.counters import post_statistics_buffer
+from apps.content.models import Post
+from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+
+
+class PostCounterView(View):
+    http_method_names = ['post', 'options']
+    field = None
+
+    def post(self, request, *args, **kwargs):
+        try:
+            post = get_object_or_404(
+                Post.objects.only('id', 'status', 'author_id'),
+                slug=self.kwargs.get('slug'),
+            )
+            if not post.is_public() and not (
+                request.user.is_authenticated
+                and (request.user.role == 'admin' or request.user.id == post.author_id)
+            ):
+                return jarb.error(
+                    403, 'Forbidden', 'You do not have permission to view this post'
+                )
+
+            post_statistics_buffer.increment(post.id, self.field)
+            return jarb.no_content()
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
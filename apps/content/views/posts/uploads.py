@@ -0,0 +1,166 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from apps.content.models import Post
+from apps.media_files.resumable import (
+    UploadOffsetConflict,
+    active_uploads,
+    append_chunk,
+    create_upload,
+    delete_upload,
+    finish_upload,
+)
+from apps.media_files.serializers import MediaFileSerializer, MediaUploadSerializer
+from apps.utils.decorators import admin_or_author_required, login_required
+from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+from apps.utils.metrics import registry
+from apps.utils.validators import validate_invalid_fields, validate_required_fields
+
+CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'
+
+
+def _set_upload_headers(response, upload):
+    response['Upload-Offset'] = str(upload.offset)
+    response['Upload-Length'] = str(upload.size)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+class PostMediaUploadListView(View):
+    http_method_names = ['post', 'options']
+
+    @method_decorator([login_required, admin_or_author_required])
+    def post(self, request, *args, **kwargs):
+        try:
+            post = get_object_or_404(Post, slug=self.kwargs.get('slug'))
+            if not (request.user.role == 'admin' or request.user.id == post.author.id):
+                return jarb.error(
+                    403, 'Forbidden', 'You do not have permission to add media files'
+                )
+
+            data = json.loads(request.body)
+            validate_invalid_fields(data, {'name', 'size'})
+            validate_required_fields(data, ['name', 'size'])
+
+            upload = create_upload(post, request.user, data['name'], data['size'])
+            response = jarb.created(MediaUploadSerializer.serialize_upload(upload))
+            response['Location'] = reverse(
+                'post-media-upload-detail', kwargs={'slug': post.slug, 'id': upload.id}
+            )
+            return _set_upload_headers(response, upload)
+        except json.JSONDecodeError as e:
+            return jarb.error(400, 'Bad Request', f'Invalid JSON: {str(e)}')
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
+
+
+class PostMediaUploadDetailView(View):
+    http_method_names = ['get', 'patch', 'delete', 'head', 'options']
+
+    def get_upload(self, request):
+        upload = get_object_or_404(
+            active_uploads().select_related('post'),
+            id=self.kwargs.get('id'),
+            post__slug=self.kwargs.get('slug'),
+        )
+        if not (request.user.role == 'admin' or request.user.id == upload.user_id):
+            return None
+        return upload
+
+    @method_decorator([login_required, admin_or_author_required])
+    def get(self, request, *args, **kwargs):
+        try:
+            upload = self.get_upload(request)
+            if upload is None:
+                return jarb.error(
+                    403, 'Forbidden', 'You do not have permission to view this upload'
+                )
+            response = jarb.ok(MediaUploadSerializer.serialize_upload(upload))
+            return _set_upload_headers(response, upload)
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
+
+    @method_decorator([login_required, admin_or_author_required])
+    def patch(self, request, *args, **kwargs):
+        try:
+            upload = self.get_upload(request)
+            if upload is None:
+                return jarb.error(
+                    403, 'Forbidden', 'You do not have permission to edit this upload'
+                )
+            if request.content_type != CHUNK_CONTENT_TYPE:
+                return jarb.error(
+                    415,
+                    'Unsupported Media Type',
+                    f'Chunks must be sent as {CHUNK_CONTENT_TYPE}.',
+                )
+            try:
+                length = int(request.META['CONTENT_LENGTH'])
+            except (KeyError, ValueError):
+                return jarb.error(
+                    411, 'Length Required', 'Chunks must have a Content-Length.'
+                )
+            if length > settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE:
+                return jarb.error(
+                    413,
+                    'Content Too Large',
+                    f'Chunks must not exceed {settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE} bytes.',
+                )
+            try:
+                offset = int(request.headers['Upload-Offset'])
+            except (KeyError, ValueError):
+                raise ValidationError(
+                    {'Upload-Offset': ['This header must be the offset of the chunk.']}
+                )
+
+            append_chunk(upload, offset, request, length)
+            if upload.offset < upload.size:
+                return _set_upload_headers(jarb.no_content(), upload)
+
+            media_file = finish_upload(upload)
+            registry.increment('media_uploads_total', {'type': media_file.type})
+            registry.increment(
+                'media_upload_bytes_total', {'type': media_file.type}, media_file.size
+            )
+            response = jarb.created(
+                MediaFileSerializer.serialize_media_file(media_file, public=False)
+            )
+            return _set_upload_headers(response, upload)
+        except UploadOffsetConflict as e:
+            return jarb.error(409, 'Conflict', str(e))
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
+
+    @method_decorator([login_required, admin_or_author_required])
+    def delete(self, request, *args, **kwargs):
+        try:
+            upload = self.get_upload(request)
+            if upload is None:
+                return jarb.error(
+                    403,
+                    'Forbidden',
+                    'You do not have permission to delete this upload',
+                )
+            delete_upload(upload)
+            return jarb.no_content()
+        except Http404 as e:
+            return jarb.error(404, 'Not Found', str(e))
+        except Exception as e:
+            return jarb.error(500, 'Internal Server Error', str(e))
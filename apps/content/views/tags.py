@@ -6,8 +6,15 @@ from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
+from apps.utils.conditional import (
+    build_etag,
+    get_not_modified_response,
+    set_validators,
+)
 from apps.utils.decorators import admin_required, login_required
+from apps.utils.fieldsets import get_requested_fields
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
+from apps.utils.query_filters import filter_by_search_key_prefix
 from apps.utils.validators import validate_invalid_fields, validate_required_fields
 
 from ..models import Tag
@@ -19,9 +26,27 @@ class TagListView(View):
 
     def get(self, request, *args, **kwargs):
         try:
-            queryset = Tag.objects.all()
-            data = [TagSerializer.serialize_tag(tag) for tag in queryset]
-            return jarb.ok(data)
+            fields = get_requested_fields(request.GET, TagSerializer)
+            queryset = TagSerializer.prepare_queryset(Tag.objects.all(), fields)
+            queryset = filter_by_search_key_prefix(queryset, request.GET)
+            tags = list(queryset)
+
+            etag = build_etag(
+                request,
+                [
+                    version
+                    for tag in tags
+                    for version in TagSerializer.get_versions(tag, fields)
+                ],
+            )
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = [TagSerializer.serialize_tag(tag, fields=fields) for tag in tags]
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Exception as e:
             return jarb.error(500, 'Internal Server Error', str(e))
 
@@ -50,13 +75,26 @@ class TagDetailView(View):
 
     def get(self, request, *args, **kwargs):
         try:
-            tag = get_object_or_404(Tag, slug=self.kwargs.get('slug'))
-            data = TagSerializer.serialize_tag(tag)
+            fields = get_requested_fields(request.GET, TagSerializer)
+            tag = get_object_or_404(
+                TagSerializer.prepare_queryset(
+                    Tag.objects.all(), fields, with_included=True
+                ),
+                slug=self.kwargs.get('slug'),
+            )
+            etag = build_etag(request, TagSerializer.get_versions(tag, fields))
+            not_modified = get_not_modified_response(request, etag)
+            if not_modified:
+                return not_modified
+
+            data = TagSerializer.serialize_tag(tag, fields=fields)
 
             if data['relationships']:
                 data['included'] = TagSerializer.build_included_data(tag)
 
-            return jarb.ok(data)
+            return set_validators(jarb.ok(data), etag)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
@@ -1,6 +1,25 @@
 from django.contrib import admin
 
-from .models import MediaFile
+from .models import (
+    MediaBlob,
+    MediaFile,
+    MediaFileVariant,
+    MediaFileVariantJob,
+    MediaUpload,
+)
+
+
+@admin.register(MediaFile)
+class MediaFileAdmin(admin.ModelAdmin):
+    def get_readonly_fields(self, request, obj=None):
+        # Files stored as blobs are shared with other media files.
+        if obj is not None and obj.content_hash:
+            return ('file', *self.readonly_fields)
+        return super().get_readonly_fields(request, obj)
+
 
 # Register your models here.
-admin.site.register(MediaFile)
+admin.site.register(MediaBlob)
+admin.site.register(MediaFileVariant)
+admin.site.register(MediaFileVariantJob)
+admin.site.register(MediaUpload)
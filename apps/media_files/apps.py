@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MediaFilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.media_files'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,160 @@
+import hashlib
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import MediaBlob, MediaFile
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(file) -> str:
+    """Return the SHA-256 hex digest of a django File, read in chunks."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def store_blobs(media_files: List[MediaFile], executor) -> List[str]:
+    """
+    Point each media file, whose content_hash is set, at the blob holding
+    its content and count the new references. Only content not stored yet
+    is written, in executor; identical files in media_files share one blob.
+
+    The references are counted in the caller's transaction. Returns the
+    names written to storage, which the caller deletes if it rolls back.
+    """
+    counts = Counter(media_file.content_hash for media_file in media_files)
+    blobs = MediaBlob.objects.in_bulk(list(counts))
+    sources = {}
+    for media_file in media_files:
+        sources.setdefault(media_file.content_hash, media_file)
+
+    new_blobs = _write_blobs(
+        [sources[hash] for hash in counts if hash not in blobs], counts, executor
+    )
+    try:
+        released = _add_references(blobs, counts)
+        # Blobs deleted by another request since they were read are stored
+        # again.
+        new_blobs += _write_blobs(
+            [sources[hash] for hash in released], counts, executor
+        )
+        blobs.update((blob.hash, blob) for blob in _insert_blobs(new_blobs, counts))
+    except Exception:
+        _delete_files(blob.file.name for blob in new_blobs)
+        raise
+
+    for media_file in media_files:
+        # Assigning the name marks the file as stored, so saving the row
+        # does not write it again.
+        media_file.file = blobs[media_file.content_hash].file.name
+    return [blob.file.name for blob in new_blobs if blobs[blob.hash] is blob]
+
+
+def release_blobs(media_files: Iterable[MediaFile]):
+    """
+    Drop the references of deleted media files. Blobs left without any are
+    deleted, and their files once the transaction commits.
+    """
+    counts = Counter(
+        media_file.content_hash for media_file in media_files if media_file.content_hash
+    )
+    if not counts:
+        return
+
+    with transaction.atomic():
+        for count, hashes in _group_by_count(counts).items():
+            MediaBlob.objects.filter(hash__in=hashes).update(
+                ref_count=F('ref_count') - count
+            )
+        orphaned = []
+        for blob in MediaBlob.objects.filter(hash__in=list(counts), ref_count=0):
+            # The count is checked again, in case an upload referenced the
+            # blob meanwhile.
+            deleted, _ = MediaBlob.objects.filter(hash=blob.hash, ref_count=0).delete()
+            if deleted:
+                orphaned.append(blob.file.name)
+        if orphaned:
+            transaction.on_commit(lambda: _delete_files(orphaned))
+
+
+def _write_blobs(
+    sources: List[MediaFile], counts: Counter, executor
+) -> List[MediaBlob]:
+    def write(media_file):
+        field = media_file.file.field
+        name = field.generate_filename(media_file, media_file.name)
+        # The storage picks another name if a file is left at this one.
+        name = field.storage.save(name, media_file.file, max_length=field.max_length)
+        return MediaBlob(
+            hash=media_file.content_hash,
+            file=name,
+            size=media_file.size,
+            ref_count=counts[media_file.content_hash],
+        )
+
+    return list(executor.map(write, sources))
+
+
+def _add_references(blobs: Dict[str, MediaBlob], counts: Counter) -> List[str]:
+    # Returns the hashes of blobs deleted since they were read, which are
+    # removed from blobs.
+    released = []
+    for count, hashes in _group_by_count(
+        {hash: counts[hash] for hash in blobs}
+    ).items():
+        updated = MediaBlob.objects.filter(hash__in=hashes).update(
+            ref_count=F('ref_count') + count
+        )
+        if updated < len(hashes):
+            present = set(
+                MediaBlob.objects.filter(hash__in=hashes).values_list('hash', flat=True)
+            )
+            released.extend(hash for hash in hashes if hash not in present)
+    for hash in released:
+        del blobs[hash]
+    return released
+
+
+def _insert_blobs(new_blobs: List[MediaBlob], counts: Counter) -> List[MediaBlob]:
+    try:
+        with transaction.atomic():
+            return MediaBlob.objects.bulk_create(new_blobs)
+    except IntegrityError:
+        pass
+
+    # Another upload stored some of the same content meanwhile: reference
+    # its blob and delete the copy written here.
+    blobs = []
+    for blob in new_blobs:
+        try:
+            with transaction.atomic():
+                blob.save(force_insert=True)
+        except IntegrityError:
+            MediaBlob.objects.filter(hash=blob.hash).update(
+                ref_count=F('ref_count') + counts[blob.hash]
+            )
+            blob.file.storage.delete(blob.file.name)
+            blob = MediaBlob.objects.get(hash=blob.hash)
+        blobs.append(blob)
+    return blobs
+
+
+def _group_by_count(counts: Dict[str, int]) -> Dict[int, List[str]]:
+    # Blobs gaining or losing the same number of references are updated with
+    # one query.
+    groups = defaultdict(list)
+    for hash, count in counts.items():
+        groups[count].append(hash)
+    return groups
+
+
+def _delete_files(names: Iterable[str]):
+    storage = MediaFile._meta.get_field('file').storage
+    for name in names:
+        storage.delete(name)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.media_files.resumable import clear_expired_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete resumable uploads which received no chunk for MEDIA_UPLOAD_EXPIRY seconds.'
+
+    def handle(self, *args, **options):
+        deleted = clear_expired_uploads()
+        self.stdout.write(f'Deleted {deleted} partial upload files.')
@@ -0,0 +1,62 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.media_files.models import MediaFile
+from apps.media_files.variants import claim_jobs, enqueue_variants, run_jobs
+
+
+class Command(BaseCommand):
+    help = 'Generate the image variants queued by media uploads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.MEDIA_VARIANT_WORKERS,
+            help='Processes rendering variants.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of waiting for jobs.',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Queue images uploaded before variants were generated.',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            enqueue_variants(
+                MediaFile.objects.filter(
+                    type=MediaFile.Type.IMAGE, variant_job__isnull=True
+                ).only('id', 'type')
+            )
+
+        workers = options['workers']
+        # Spawned processes only import the rendering function and never
+        # share the database connection of this one, as forked ones would.
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            while True:
+                jobs = claim_jobs(workers * 2)
+                if jobs:
+                    done = run_jobs(executor, jobs)
+                    self.stdout.write(
+                        f'Generated variants for {done} of {len(jobs)} images.'
+                    )
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
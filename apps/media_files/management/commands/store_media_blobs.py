@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.media_files.blobs import hash_file, store_blobs
+from apps.media_files.models import MediaFile
+
+
+class Command(BaseCommand):
+    help = (
+        'Move media files stored under their own name to content-addressed '
+        'blobs, keeping one copy of identical files.'
+    )
+
+    def handle(self, *args, **options):
+        moved = 0
+        storage = MediaFile.file.field.storage
+        legacy = MediaFile.objects.filter(content_hash='').only(
+            'id', 'file', 'name', 'type', 'size'
+        )
+        with ThreadPoolExecutor(max_workers=settings.MEDIA_UPLOAD_WORKERS) as executor:
+            for media_file in legacy.iterator(chunk_size=100):
+                previous = media_file.file.name
+                if not storage.exists(previous):
+                    self.stderr.write(
+                        f'Skipped {media_file.id}: {previous} is missing.'
+                    )
+                    continue
+
+                with media_file.file.open('rb'):
+                    media_file.content_hash = hash_file(media_file.file)
+                    with transaction.atomic():
+                        store_blobs([media_file], executor)
+                        MediaFile.objects.filter(id=media_file.id).update(
+                            file=media_file.file.name,
+                            content_hash=media_file.content_hash,
+                        )
+                if not MediaFile.objects.filter(file=previous).exists():
+                    storage.delete(previous)
+                moved += 1
+
+        self.stdout.write(f'Moved {moved} media files to blobs.')
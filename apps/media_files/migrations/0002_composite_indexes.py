@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('media_files', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mediafile',
+            index=models.Index(
+                fields=['post', 'name'], name='media_file_post_name_idx'
+            ),
+        ),
+    ]
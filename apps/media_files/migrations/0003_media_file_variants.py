@@ -0,0 +1,104 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:46
+
+import apps.media_files.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('media_files', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFileVariant',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                (
+                    'file',
+                    models.FileField(
+                        max_length=255,
+                        upload_to=apps.media_files.models.get_variant_upload_path,
+                    ),
+                ),
+                ('format', models.CharField(max_length=10)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('size', models.PositiveIntegerField()),
+                (
+                    'media_file',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='variants',
+                        to='media_files.mediafile',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Media File Variant',
+                'verbose_name_plural': 'Media File Variants',
+                'ordering': ['format', 'width'],
+                'unique_together': {('media_file', 'format', 'width')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MediaFileVariantJob',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'Pending'),
+                            ('running', 'Running'),
+                            ('done', 'Done'),
+                            ('failed', 'Failed'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                    ),
+                ),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                (
+                    'media_file',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='variant_job',
+                        to='media_files.mediafile',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Media File Variant Job',
+                'verbose_name_plural': 'Media File Variant Jobs',
+                'indexes': [
+                    models.Index(
+                        fields=['status', 'updated_at'],
+                        name='media_variant_job_status_idx',
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 import os
+import uuid
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 from PIL import Image
@@ -10,9 +12,17 @@ from apps.utils.base_model import BaseModel
 def get_upload_path(instance, filename):
     ext = os.path.splitext(filename)[-1].lstrip('.').lower()
     file_type = instance._get_file_type(ext)
+    if instance.content_hash:
+        return os.path.join(
+            file_type, instance.content_hash[:2], f'{instance.content_hash}.{ext}'
+        )
     return os.path.join(file_type, filename)
 
 
+def get_variant_upload_path(instance, filename):
+    return os.path.join('variants', str(instance.media_file_id), filename)
+
+
 class MediaFile(BaseModel):
     class Type(models.TextChoices):
         IMAGE = 'image'
@@ -31,9 +41,12 @@ class MediaFile(BaseModel):
     )
     name = models.CharField(max_length=255, blank=True)
     type = models.CharField(choices=Type.choices, max_length=10, blank=True)
-    size = models.PositiveIntegerField(blank=True)
+    size = models.PositiveBigIntegerField(blank=True)
     width = models.PositiveIntegerField(null=True, blank=True, default=None)
     height = models.PositiveIntegerField(null=True, blank=True, default=None)
+    # SHA-256 of the content for files stored as a MediaBlob, empty for files
+    # stored under their own name.
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     def _get_file_type(self, ext):
         for file_type, extensions in self.valid_extensions.items():
@@ -43,8 +56,17 @@ class MediaFile(BaseModel):
 
     def _extract_image_metadata(self):
         try:
+            # Opening parses the headers without decoding any pixels, so
+            # truncated or corrupt images are rejected. Pillow only warns
+            # below twice MAX_IMAGE_PIXELS, so the limit is checked here too.
             with Image.open(self.file) as img:
-                self.width, self.height = img.size
+                width, height = img.size
+            if width * height > Image.MAX_IMAGE_PIXELS:
+                raise ValueError(
+                    f'Image size ({width}x{height} pixels) exceeds the limit '
+                    f'of {Image.MAX_IMAGE_PIXELS} pixels.'
+                )
+            self.width, self.height = width, height
         except Exception as e:
             raise ValidationError(f'Error extracting image metadata: {e}')
 
@@ -60,7 +82,16 @@ class MediaFile(BaseModel):
                 }
             )
 
-        self.name = os.path.basename(self.file.name)
+        if not self.file._committed:
+            if self.content_hash:
+                # The blob is shared and counted by hash: replacing its file
+                # in place would change the content of every reference.
+                raise ValidationError(
+                    {'file': 'The file of a stored media file cannot be replaced.'}
+                )
+            # Stored files are named after their content hash, so only a new
+            # file gives the row its name.
+            self.name = os.path.basename(self.file.name)
         ext = os.path.splitext(self.name)[-1].lstrip('.').lower()
         self.type = self._get_file_type(ext)
         self.size = self.file.size
@@ -78,3 +109,111 @@ class MediaFile(BaseModel):
     class Meta:
         verbose_name = 'Media File'
         verbose_name_plural = 'Media Files'
+        indexes = [
+            models.Index(fields=['post', 'name'], name='media_file_post_name_idx'),
+        ]
+
+
+class MediaBlob(BaseModel):
+    """
+    Stored content shared by every MediaFile with the same SHA-256, deleted
+    with its last reference.
+    """
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.file.name
+
+    class Meta:
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
+
+
+class MediaUpload(BaseModel):
+    """
+    A file uploaded in chunks for a post, which can be resumed from offset.
+    The bytes received so far are kept in a partial file outside the media
+    storage until the last chunk turns the upload into a MediaFile.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    post = models.ForeignKey(
+        'content.Post', on_delete=models.CASCADE, related_name='media_uploads'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='media_uploads'
+    )
+    name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+
+    @property
+    def path(self):
+        return os.path.join(settings.MEDIA_UPLOAD_SESSION_DIR, f'{self.id}.part')
+
+    def __str__(self):
+        return f'{self.name} ({self.offset}/{self.size})'
+
+    class Meta:
+        verbose_name = 'Media Upload'
+        verbose_name_plural = 'Media Uploads'
+
+
+class MediaFileVariant(BaseModel):
+    """A resized or re-encoded copy of an image, for srcset."""
+
+    media_file = models.ForeignKey(
+        MediaFile, on_delete=models.CASCADE, related_name='variants'
+    )
+    file = models.FileField(upload_to=get_variant_upload_path, max_length=255)
+    format = models.CharField(max_length=10)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+
+    def __str__(self):
+        return self.file.name
+
+    class Meta:
+        verbose_name = 'Media File Variant'
+        verbose_name_plural = 'Media File Variants'
+        ordering = ['format', 'width']
+        unique_together = ('media_file', 'format', 'width')
+
+
+class MediaFileVariantJob(BaseModel):
+    """
+    Pending variant generation for an image, run by the
+    process_media_variants command.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+
+    media_file = models.OneToOneField(
+        MediaFile, on_delete=models.CASCADE, related_name='variant_job'
+    )
+    status = models.CharField(
+        choices=Status.choices, max_length=10, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f'{self.media_file} ({self.status})'
+
+    class Meta:
+        verbose_name = 'Media File Variant Job'
+        verbose_name_plural = 'Media File Variant Jobs'
+        indexes = [
+            models.Index(
+                fields=['status', 'updated_at'], name='media_variant_job_status_idx'
+            ),
+        ]
@@ -0,0 +1,158 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.http import UnreadablePostError
+from django.utils import timezone
+
+from .models import MediaFile, MediaUpload
+from .uploads import save_media_files
+
+# Bytes read from the request and written at a time, so memory use does not
+# depend on the chunk size.
+READ_SIZE = 64 * 1024
+
+
+class UploadOffsetConflict(Exception):
+    """A chunk does not start where the upload stopped."""
+
+
+def _expired_before():
+    return timezone.now() - timedelta(seconds=settings.MEDIA_UPLOAD_EXPIRY)
+
+
+def active_uploads():
+    """Uploads which received a chunk within MEDIA_UPLOAD_EXPIRY seconds."""
+    return MediaUpload.objects.filter(updated_at__gte=_expired_before())
+
+
+def create_upload(post, user, name: str, size: int) -> MediaUpload:
+    """
+    Start an upload of size bytes for post. The checks which do not need the
+    content, the file type and a name free in the post, run now, so a client
+    learns of them before sending anything.
+    """
+    errors = {}
+    if not isinstance(name, str) or not os.path.basename(name):
+        errors['name'] = ['Name must be a file name.']
+    else:
+        name = os.path.basename(name)
+        try:
+            ext = os.path.splitext(name)[-1].lstrip('.').lower()
+            MediaFile()._get_file_type(ext)
+        except ValidationError as e:
+            errors['name'] = e.messages
+        if MediaFile.objects.filter(post=post, name=name).exists():
+            errors.setdefault('name', []).append(
+                f"A file with name '{name}' already exists for this post."
+            )
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        errors['size'] = ['Size must be a positive integer.']
+    elif size > settings.MEDIA_UPLOAD_MAX_SIZE:
+        errors['size'] = [
+            f'Size must not exceed {settings.MEDIA_UPLOAD_MAX_SIZE} bytes.'
+        ]
+    if errors:
+        raise ValidationError(errors)
+
+    upload = MediaUpload(post=post, user=user, name=name, size=size)
+    upload.full_clean(exclude=['post', 'user'])
+    os.makedirs(settings.MEDIA_UPLOAD_SESSION_DIR, exist_ok=True)
+    open(upload.path, 'xb').close()
+    upload.save()
+    return upload
+
+
+def append_chunk(upload: MediaUpload, offset: int, stream, length: int) -> int:
+    """
+    Write length bytes read from stream at offset, which must be the offset
+    of the upload, and return the new offset. The bytes received before the
+    client disconnects are kept, so it can resume from there.
+    """
+    if offset != upload.offset:
+        raise UploadOffsetConflict(
+            f'Upload-Offset {offset} does not match the upload offset {upload.offset}.'
+        )
+    if offset + length > upload.size:
+        raise ValidationError(
+            {'Upload-Offset': ['The chunk ends after the size of the upload.']}
+        )
+
+    received = 0
+    with open(upload.path, 'r+b') as f:
+        f.seek(offset)
+        try:
+            while received < length:
+                data = stream.read(min(READ_SIZE, length - received))
+                if not data:
+                    break
+                f.write(data)
+                received += len(data)
+        except UnreadablePostError:
+            pass
+
+    # Checking the offset again keeps two requests from both appending from
+    # the same one.
+    if not MediaUpload.objects.filter(id=upload.id, offset=offset).update(
+        offset=offset + received, updated_at=timezone.now()
+    ):
+        raise UploadOffsetConflict('The upload was resumed by another request.')
+    upload.offset = offset + received
+    return upload.offset
+
+
+def finish_upload(upload: MediaUpload) -> MediaFile:
+    """
+    Store a complete upload as a MediaFile, with the checks and metadata of
+    any other media upload, and delete it. An upload that fails the checks
+    is deleted too, as sending it again would not help.
+    """
+    try:
+        with open(upload.path, 'rb') as f:
+            (media_file,) = save_media_files(upload.post, [File(f, name=upload.name)])
+    except ValidationError:
+        delete_upload(upload)
+        raise
+    delete_upload(upload)
+    return media_file
+
+
+def delete_upload(upload: MediaUpload):
+    """Delete an upload and the bytes received so far."""
+    # delete() clears the id the path is built from.
+    path = upload.path
+    upload.delete()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def clear_expired_uploads() -> int:
+    """
+    Delete the uploads which received no chunk for MEDIA_UPLOAD_EXPIRY
+    seconds, and the partial files left without an upload, e.g. by deleted
+    posts. Returns the number of partial files deleted.
+    """
+    expired_before = _expired_before()
+    deleted = 0
+    for upload in MediaUpload.objects.filter(updated_at__lt=expired_before):
+        delete_upload(upload)
+        deleted += 1
+
+    if not os.path.isdir(settings.MEDIA_UPLOAD_SESSION_DIR):
+        return deleted
+    active = {f'{id}.part' for id in active_uploads().values_list('id', flat=True)}
+    with os.scandir(settings.MEDIA_UPLOAD_SESSION_DIR) as entries:
+        for entry in entries:
+            # Recent files may belong to an upload being created.
+            if (
+                entry.name.endswith('.part')
+                and entry.name not in active
+                and entry.stat().st_mtime < expired_before.timestamp()
+            ):
+                os.remove(entry.path)
+                deleted += 1
+    return deleted
@@ -1,46 +1,142 @@
+from functools import lru_cache
+
+from django.db.models import QuerySet, prefetch_related_objects
+from django.urls import reverse
+
+from apps.utils.fieldsets import defer_unrequested, is_requested, requested
+from apps.utils.metrics import timed_serialization
+from apps.utils.serialization import compile_plan
+
+from .models import MediaFile
+
+
 class MediaFileSerializer:
+    resource_type = 'media_files'
+    public_attribute_fields = ('type', 'file', 'srcset', 'created_at', 'updated_at')
+    private_attribute_fields = ('name', 'size', 'width', 'height')
+    attribute_fields = (*public_attribute_fields, *private_attribute_fields)
+    relationship_fields = ('post',)
+    available_fields = (*attribute_fields, *relationship_fields)
+    deferrable_columns = {
+        name: (name,) for name in ('type', 'file', *private_attribute_fields)
+    }
+
     @staticmethod
-    def serialize_media_file(media_file, include_relationships=True, public=False):
-        attributes = {
-            'type': media_file.type,
-            'file': media_file.file.url,
-            'created_at': media_file.created_at,
-            'updated_at': media_file.updated_at,
-        }
+    def prepare_queryset(queryset, fields=None):
+        queryset = defer_unrequested(
+            queryset, MediaFileSerializer.deferrable_columns, fields
+        )
+        if is_requested('srcset', fields):
+            queryset = queryset.prefetch_related('variants')
+        return queryset
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def attributes_plan(public=False, fields=None):
+        names = requested(MediaFileSerializer.public_attribute_fields, fields)
         if not public:
-            attributes.update(
-                {
-                    'name': media_file.name,
-                    'size': media_file.size,
-                    'width': media_file.width,
-                    'height': media_file.height,
-                }
-            )
+            names += requested(MediaFileSerializer.private_attribute_fields, fields)
+        # file and srcset are download URLs, not read from a column.
+        names = [name for name in names if name not in ('file', 'srcset')]
+        return compile_plan(MediaFile, tuple(names))
 
+    @staticmethod
+    def get_download_url(media_file):
+        # The post is cached on media files read through it, and selected
+        # with the others.
+        return reverse(
+            'post-media-download',
+            kwargs={'slug': media_file.post.slug, 'id': media_file.id},
+        )
+
+    @staticmethod
+    def get_versions(media_file):
+        return [('media_files', media_file.id, media_file.updated_at)]
+
+    @staticmethod
+    @timed_serialization
+    def serialize_media_file(
+        media_file, include_relationships=True, public=False, fields=None
+    ):
         base_data = {
             'type': 'media_files',
             'id': str(media_file.id),
-            'attributes': attributes,
+            'attributes': MediaFileSerializer.attributes_plan(public, fields).serialize(
+                media_file
+            ),
         }
+        if is_requested('file', fields):
+            base_data['attributes']['file'] = MediaFileSerializer.get_download_url(
+                media_file
+            )
+        if is_requested('srcset', fields):
+            base_data['attributes']['srcset'] = MediaFileSerializer._build_srcset(
+                media_file
+            )
 
         if include_relationships:
-            base_data['relationships'] = {
-                'post': {
+            base_data['relationships'] = {}
+            if is_requested('post', fields):
+                base_data['relationships']['post'] = {
                     'data': {
                         'type': 'posts',
-                        'id': str(media_file.post.id),
+                        'id': str(media_file.post_id),
                     }
                 }
-            }
 
         return base_data
 
     @staticmethod
-    def serialize_media_files(media_files, include_relationships=True, public=False):
+    def _build_srcset(media_file):
+        # One srcset value per format, e.g. {'webp': 'a-320w.webp 320w, ...'};
+        # empty until the variants are generated.
+        candidates = {}
+        for variant in media_file.variants.all():
+            url = reverse(
+                'post-media-variant-download',
+                kwargs={
+                    'slug': media_file.post.slug,
+                    'id': media_file.id,
+                    'width': variant.width,
+                    'format': variant.format,
+                },
+            )
+            candidates.setdefault(variant.format, []).append(f'{url} {variant.width}w')
+        return {format: ', '.join(urls) for format, urls in candidates.items()}
+
+    @staticmethod
+    @timed_serialization
+    def serialize_media_files(
+        media_files, include_relationships=True, public=False, fields=None
+    ):
+        if is_requested('srcset', fields) and not isinstance(media_files, QuerySet):
+            media_files = list(media_files)
+            prefetch_related_objects(media_files, 'variants')
         return [
             MediaFileSerializer.serialize_media_file(
-                media_file, include_relationships, public=public
+                media_file, include_relationships, public=public, fields=fields
             )
             for media_file in media_files
         ]
+
+
+class MediaUploadSerializer:
+    resource_type = 'media_uploads'
+
+    @staticmethod
+    @timed_serialization
+    def serialize_upload(upload):
+        return {
+            'type': 'media_uploads',
+            'id': str(upload.id),
+            'attributes': {
+                'name': upload.name,
+                'size': upload.size,
+                'offset': upload.offset,
+                'created_at': upload.created_at,
+                'updated_at': upload.updated_at,
+            },
+            'relationships': {
+                'post': {'data': {'type': 'posts', 'id': str(upload.post_id)}}
+            },
+        }
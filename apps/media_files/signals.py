@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .blobs import release_blobs
+from .models import MediaFile
+from .variants import enqueue_variants
+
+
+@receiver(post_save, sender=MediaFile)
+def enqueue_media_file_variants(sender, instance, created, **kwargs):
+    if created:
+        enqueue_variants([instance])
+
+
+@receiver(post_delete, sender=MediaFile)
+def release_media_file_blob(sender, instance, **kwargs):
+    release_blobs([instance])
@@ -0,0 +1,151 @@
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.db import transaction
+
+from apps.content.signals import POSTS_CACHE_NAMESPACE
+from apps.utils.cache import bump_version_on_commit
+
+from .blobs import hash_file, store_blobs
+from .models import MediaFile
+from .variants import enqueue_variants
+
+
+class ContentHashMixin:
+    """
+    Set content_hash on each uploaded file to the SHA-256 of its content,
+    computed from the chunks as they are received.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.content_hash = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        data = super().receive_data_chunk(raw_data, start)
+        # Chunks passed on are hashed by the handler that keeps them.
+        if data is None:
+            self.content_hash.update(raw_data)
+        return data
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.content_hash.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def save_media_files(post, files) -> List[MediaFile]:
+    """
+    Validate and store a batch of uploaded files for post, all or nothing.
+
+    Does what MediaFile.save() does for each file, with a fixed number of
+    queries for the whole batch: duplicate names are checked with one query,
+    image dimensions are read and files written to storage in a pool of
+    MEDIA_UPLOAD_WORKERS threads, and the rows are inserted with one
+    bulk_create. The ValidationError maps each invalid file name to its
+    messages.
+
+    Files are stored by content hash as MediaBlobs, so content already
+    stored, for this post or any other, is not written again.
+    """
+    media_files = [MediaFile(post=post, file=file) for file in files]
+    errors = {}
+
+    for media_file in media_files:
+        media_file.name = os.path.basename(media_file.file.name)
+        media_file.size = media_file.file.size
+        try:
+            ext = os.path.splitext(media_file.name)[-1].lstrip('.').lower()
+            media_file.type = media_file._get_file_type(ext)
+        except ValidationError as e:
+            _add_errors(errors, media_file.name, e)
+    _validate_unique_names(post, media_files, errors)
+
+    with ThreadPoolExecutor(max_workers=settings.MEDIA_UPLOAD_WORKERS) as executor:
+        images = [
+            media_file
+            for media_file in media_files
+            if media_file.type == MediaFile.Type.IMAGE
+        ]
+        for media_file, error in zip(images, executor.map(_extract_metadata, images)):
+            if error:
+                _add_errors(errors, media_file.name, error)
+
+        for media_file in media_files:
+            try:
+                media_file.clean_fields(exclude=['post'])
+            except ValidationError as e:
+                _add_errors(errors, media_file.name, e)
+        if errors:
+            raise ValidationError(errors)
+
+        # Uploads parsed by the hashing upload handlers already have their
+        # hash; other files are read once more.
+        for media_file, content_hash in zip(
+            media_files, executor.map(_get_content_hash, media_files)
+        ):
+            media_file.content_hash = content_hash
+
+        written = []
+        try:
+            with transaction.atomic():
+                written = store_blobs(media_files, executor)
+                MediaFile.objects.bulk_create(media_files)
+                # bulk_create() sends no post_save signals: variants are
+                # queued and cached posts invalidated here instead.
+                enqueue_variants(media_files)
+                bump_version_on_commit(POSTS_CACHE_NAMESPACE)
+        except Exception:
+            for name in written:
+                MediaFile.file.field.storage.delete(name)
+            raise
+    return media_files
+
+
+def _get_content_hash(media_file):
+    upload = media_file.file.file
+    return getattr(upload, 'content_hash', None) or hash_file(upload)
+
+
+def _extract_metadata(media_file):
+    try:
+        media_file._extract_image_metadata()
+    except ValidationError as e:
+        return e
+    return None
+
+
+def _validate_unique_names(post, media_files, errors: Dict[str, List[str]]):
+    names = Counter(media_file.name for media_file in media_files)
+    duplicates = {name for name, count in names.items() if count > 1}
+    duplicates.update(
+        MediaFile.objects.filter(post=post, name__in=list(names)).values_list(
+            'name', flat=True
+        )
+    )
+    for name in duplicates:
+        errors.setdefault(name, []).append(
+            f"A file with name '{name}' already exists for this post."
+        )
+
+
+def _add_errors(errors: Dict[str, List[str]], name: str, error: ValidationError):
+    errors.setdefault(name, []).extend(error.messages)
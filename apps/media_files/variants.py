@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import as_completed
+from datetime import timedelta
+from typing import Iterable, List
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.content.signals import POSTS_CACHE_NAMESPACE
+from apps.utils.cache import bump_version_on_commit
+from apps.utils.images import render_variants
+
+from .models import MediaFile, MediaFileVariant, MediaFileVariantJob
+
+Status = MediaFileVariantJob.Status
+
+
+def enqueue_variants(media_files: Iterable[MediaFile]):
+    """Queue variant generation for every image in media_files."""
+    MediaFileVariantJob.objects.bulk_create(
+        [
+            MediaFileVariantJob(media_file=media_file)
+            for media_file in media_files
+            if media_file.type == MediaFile.Type.IMAGE
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def claim_jobs(limit: int) -> List[MediaFileVariantJob]:
+    """
+    Mark up to limit pending jobs as running and return them. Jobs left
+    running for MEDIA_VARIANT_JOB_TIMEOUT seconds, e.g. by a worker that was
+    killed, are claimed again until MEDIA_VARIANT_MAX_ATTEMPTS is reached.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.MEDIA_VARIANT_JOB_TIMEOUT)
+    MediaFileVariantJob.objects.filter(
+        status=Status.RUNNING,
+        updated_at__lt=stale,
+        attempts__gte=settings.MEDIA_VARIANT_MAX_ATTEMPTS,
+    ).update(status=Status.FAILED, error='Timed out.', updated_at=now)
+
+    claimable = Q(status=Status.PENDING) | Q(
+        status=Status.RUNNING, updated_at__lt=stale
+    )
+    candidates = MediaFileVariantJob.objects.filter(claimable).order_by('updated_at')[
+        :limit
+    ]
+
+    claimed = []
+    for job_id in candidates.values_list('id', flat=True):
+        # The UPDATE checks the status again, so no two workers can claim
+        # the same job, whatever the database backend.
+        if (
+            MediaFileVariantJob.objects.filter(claimable, id=job_id).update(
+                status=Status.RUNNING, attempts=F('attempts') + 1, updated_at=now
+            )
+            == 1
+        ):
+            claimed.append(job_id)
+    return list(
+        MediaFileVariantJob.objects.filter(id__in=claimed).select_related('media_file')
+    )
+
+
+def run_jobs(executor, jobs: List[MediaFileVariantJob]) -> int:
+    """
+    Render the variants of each job in executor, usually a process pool,
+    and store them. Returns the number of jobs that succeeded.
+    """
+    futures = {}
+    for job in jobs:
+        try:
+            with job.media_file.file.open('rb') as f:
+                content = f.read()
+        except Exception as e:
+            _fail(job, e)
+            continue
+        future = executor.submit(
+            render_variants,
+            content,
+            settings.MEDIA_VARIANT_WIDTHS,
+            settings.MEDIA_VARIANT_QUALITY,
+        )
+        futures[future] = job
+
+    done = 0
+    for future in as_completed(futures):
+        job = futures[future]
+        try:
+            save_variants(job.media_file, future.result())
+        except Exception as e:
+            _fail(job, e)
+        else:
+            done += 1
+    return done
+
+
+def save_variants(media_file: MediaFile, rendered) -> List[MediaFileVariant]:
+    """
+    Store rendered variants of media_file, replacing those of an earlier
+    attempt, and mark its job as done.
+    """
+    stem = os.path.splitext(media_file.name)[0]
+    variants = []
+    try:
+        for format, width, height, content in rendered:
+            variant = MediaFileVariant(
+                media_file=media_file,
+                format=format,
+                width=width,
+                height=height,
+                size=len(content),
+            )
+            variant.file.save(
+                f'{stem}-{width}w.{format}', ContentFile(content), save=False
+            )
+            variants.append(variant)
+
+        now = timezone.now()
+        with transaction.atomic():
+            previous = list(media_file.variants.all())
+            media_file.variants.all().delete()
+            MediaFileVariant.objects.bulk_create(variants)
+            # A new updated_at changes the ETag of the media file responses.
+            MediaFile.objects.filter(id=media_file.id).update(updated_at=now)
+            MediaFileVariantJob.objects.filter(media_file=media_file).update(
+                status=Status.DONE, error='', updated_at=now
+            )
+            bump_version_on_commit(POSTS_CACHE_NAMESPACE)
+    except Exception:
+        for variant in variants:
+            variant.file.delete(save=False)
+        raise
+
+    for variant in previous:
+        variant.file.delete(save=False)
+    return variants
+
+
+def _fail(job: MediaFileVariantJob, error: Exception):
+    # Failed attempts go back to the queue until the last one.
+    status = (
+        Status.FAILED
+        if job.attempts >= settings.MEDIA_VARIANT_MAX_ATTEMPTS
+        else Status.PENDING
+    )
+    MediaFileVariantJob.objects.filter(id=job.id).update(
+        status=status, error=str(error), updated_at=timezone.now()
+    )
@@ -1,8 +1,12 @@
+from functools import partial
+
+from django.core.exceptions import ValidationError
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 
+from apps.utils.fieldsets import get_requested_fields
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
 
 from ..utils.decorators import admin_required, login_required
@@ -16,9 +20,16 @@ class MediaFileListView(View):
     @method_decorator([login_required, admin_required])
     def get(self, request, *args, **kwargs):
         try:
-            queryset = MediaFile.objects.all()
-            response_data = MediaFileSerializer.serialize_media_files(queryset)
-            return jarb.ok(response_data)
+            fields = get_requested_fields(request.GET, MediaFileSerializer)
+            queryset = MediaFileSerializer.prepare_queryset(
+                MediaFile.objects.all().select_related('post'), fields
+            )
+            return jarb.ok_stream(
+                queryset,
+                partial(MediaFileSerializer.serialize_media_file, fields=fields),
+            )
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Exception as e:
             return jarb.error(500, 'Internal Server Error', str(e))
 
@@ -29,9 +40,19 @@ class MediaFileDetailView(View):
     @method_decorator([login_required, admin_required])
     def get(self, request, *args, **kwargs):
         try:
-            media_file = get_object_or_404(MediaFile, id=kwargs.get('id'))
-            response_data = MediaFileSerializer.serialize_media_file(media_file)
+            fields = get_requested_fields(request.GET, MediaFileSerializer)
+            media_file = get_object_or_404(
+                MediaFileSerializer.prepare_queryset(
+                    MediaFile.objects.all().select_related('post'), fields
+                ),
+                id=kwargs.get('id'),
+            )
+            response_data = MediaFileSerializer.serialize_media_file(
+                media_file, fields=fields
+            )
             return jarb.ok(response_data)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
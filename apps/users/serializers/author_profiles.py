@@ -1,5 +1,9 @@
+from apps.utils.metrics import timed_serialization
+
+
 class AuthorProfileSerializer:
     @staticmethod
+    @timed_serialization
     def serialize_profile(profile, include_relationships=True):
         base_data = {
             'type': 'author-profiles',
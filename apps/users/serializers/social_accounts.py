@@ -1,5 +1,9 @@
+from apps.utils.metrics import timed_serialization
+
+
 class SocialAccountSerializer:
     @staticmethod
+    @timed_serialization
     def serialize_social(social, include_relationships=True):
         base_data = {
             'type': 'social-accounts',
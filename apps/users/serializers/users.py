@@ -1,53 +1,98 @@
-from django.forms.models import model_to_dict
+from functools import lru_cache
+
+from django.db.models import Prefetch
+
+from apps.content.models import Post
+from apps.content.serializers import PostSerializer
+from apps.content.serializers.posts import POST_REFERENCES
+from apps.utils.fieldsets import defer_unrequested, is_requested, requested
+from apps.utils.metrics import timed_serialization
+from apps.utils.serialization import compile_plan
+
+from ..models import User
 
 
 class UserSerializer:
+    resource_type = 'users'
+    attribute_fields = (
+        'username',
+        'email',
+        'first_name',
+        'last_name',
+        'role',
+        'is_active',
+        'date_joined',
+    )
+    relationship_fields = ('profile', 'posts')
+    available_fields = (*attribute_fields, *relationship_fields)
+    # Credentials and admin flags are never serialized, so any fieldset
+    # defers them.
+    deferrable_columns = {
+        **{name: (name,) for name in attribute_fields},
+        'password': ('password',),
+        'last_login': ('last_login',),
+        'is_superuser': ('is_superuser',),
+        'is_staff': ('is_staff',),
+    }
+
+    @staticmethod
+    def prepare_queryset(queryset, fields=None, with_included=False):
+        queryset = defer_unrequested(
+            queryset, UserSerializer.deferrable_columns, fields
+        )
+        if is_requested('profile', fields):
+            queryset = queryset.select_related('profile')
+        if is_requested('posts', fields):
+            posts = Post.objects.all() if with_included else POST_REFERENCES
+            queryset = queryset.prefetch_related(Prefetch('posts', queryset=posts))
+        return queryset
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def attributes_plan(fields=None):
+        return compile_plan(
+            User, tuple(requested(UserSerializer.attribute_fields, fields))
+        )
+
     @staticmethod
-    def serialize_user(user, include_relationships=True):
+    @timed_serialization
+    def serialize_user(user, include_relationships=True, fields=None):
         base_data = {
             'type': 'users',
             'id': str(user.id),
-            'attributes': {
-                **model_to_dict(
-                    user,
-                    fields=[
-                        'username',
-                        'email',
-                        'first_name',
-                        'last_name',
-                        'role',
-                        'is_active',
-                        'date_joined',
-                    ],
-                ),
-            },
+            'attributes': UserSerializer.attributes_plan(fields).serialize(user),
         }
         if include_relationships:
-            base_data['relationships'] = UserSerializer._build_relationships(user)
+            base_data['relationships'] = UserSerializer._build_relationships(
+                user, fields
+            )
         return base_data
 
     @staticmethod
-    def _build_relationships(user):
+    def _build_relationships(user, fields=None):
         relationships = {}
 
-        if hasattr(user, 'profile'):
+        if is_requested('profile', fields) and hasattr(user, 'profile'):
             relationships['profile'] = {
                 'data': {'type': 'author-profiles', 'id': str(user.profile.pk)}
             }
 
-        if user.posts.exists():
+        if not is_requested('posts', fields):
+            return relationships
+
+        posts = user.posts.all()
+        if posts:
             relationships['posts'] = {
-                'data': [
-                    {'type': 'posts', 'id': str(post.id)} for post in user.posts.all()
-                ]
+                'data': [{'type': 'posts', 'id': str(post.id)} for post in posts]
             }
         return relationships
 
     @staticmethod
-    def build_included_data(user):
+    @timed_serialization
+    def build_included_data(user, fields=None):
         included = []
 
-        if hasattr(user, 'profile'):
+        if is_requested('profile', fields) and hasattr(user, 'profile'):
             included.append(UserSerializer._serialize_profile(user.profile))
 
             if user.profile.social_accounts.exists():
@@ -57,28 +102,14 @@ class UserSerializer:
                     )
                 )
 
-        if user.posts.exists():
+        if is_requested('posts', fields):
             included.extend(UserSerializer._serialize_related_posts(user))
 
         return included
 
     @staticmethod
     def _serialize_related_posts(user):
-        return [
-            {
-                'type': 'posts',
-                'id': str(post.id),
-                'attributes': {
-                    'title': post.title,
-                    'slug': post.slug,
-                    'content': post.content,
-                    'status': post.status,
-                    'created_at': post.created_at,
-                    'updated_at': post.updated_at,
-                },
-            }
-            for post in user.posts.all()
-        ]
+        return PostSerializer.serialize_related_posts(user.posts.all())
 
     @staticmethod
     def _serialize_profile(profile):
@@ -1,4 +1,5 @@
 import json
+from functools import partial
 
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
@@ -12,6 +13,7 @@ from apps.utils.decorators import (
     admin_required,
     login_required,
 )
+from apps.utils.fieldsets import get_requested_fields
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder as jarb
 from apps.utils.validators import (
     validate_invalid_fields,
@@ -28,8 +30,13 @@ class UserListView(View):
     @method_decorator([login_required, admin_required])
     def get(self, request, *args, **kwargs):
         try:
-            data = [UserSerializer.serialize_user(user) for user in User.objects.all()]
-            return jarb.ok(data)
+            fields = get_requested_fields(request.GET, UserSerializer)
+            queryset = UserSerializer.prepare_queryset(User.objects.all(), fields)
+            return jarb.ok_stream(
+                queryset, partial(UserSerializer.serialize_user, fields=fields)
+            )
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Exception as e:
             return jarb.error(500, 'Internal Server Error', str(e))
 
@@ -76,19 +83,27 @@ class UserDetailView(View):
     @method_decorator([login_required, admin_or_author_required])
     def get(self, request, *args, **kwargs):
         try:
-            user = get_object_or_404(User, pk=self.kwargs.get('pk'))
+            fields = get_requested_fields(request.GET, UserSerializer)
+            user = get_object_or_404(
+                UserSerializer.prepare_queryset(
+                    User.objects.all(), fields, with_included=True
+                ),
+                pk=self.kwargs.get('pk'),
+            )
 
             if not (request.user.role == 'admin' or request.user.id == user.id):
                 return jarb.error(
                     403, 'Forbidden', 'You do not have permission to view this user.'
                 )
 
-            data = UserSerializer.serialize_user(user)
+            data = UserSerializer.serialize_user(user, fields=fields)
 
             if data['relationships']:
-                data['included'] = UserSerializer.build_included_data(user)
+                data['included'] = UserSerializer.build_included_data(user, fields)
 
             return jarb.ok(data)
+        except ValidationError as e:
+            return jarb.validation_errors_from_dict(e.message_dict)
         except Http404 as e:
             return jarb.error(404, 'Not Found', str(e))
         except Exception as e:
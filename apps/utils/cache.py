@@ -0,0 +1,137 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .metrics import registry
+
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_version(namespace: str) -> int:
+    """
+    Return the current version of a cache namespace. Keys built from it are
+    invalidated all at once by bump_version, without deleting anything.
+    """
+    key = f'version:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        # Seeding from the clock keeps versions increasing even when the
+        # counter itself gets evicted, so stale keys are never reused.
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(namespace: str) -> int:
+    key = f'version:{namespace}'
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return get_version(namespace)
+
+
+def bump_version_on_commit(namespace: str):
+    # Bumping right away hides the change from this transaction's readers;
+    # bumping again on commit drops anything cached from the old rows while
+    # the transaction was still open.
+    bump_version(namespace)
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+def cache_public_response(namespace: str):
+    """
+    Cache successful GET/HEAD responses for anonymous users under the
+    namespace version and the full request path, when RESPONSE_CACHE_ENABLED.
+
+    Only one request rebuilds a missing entry: the others wait for it up to
+    RESPONSE_CACHE_WAIT_TIMEOUT seconds before building it themselves.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if (
+                not settings.RESPONSE_CACHE_ENABLED
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                _count_lookup(namespace, 'bypass')
+                return func(request, *args, **kwargs)
+
+            digest = hashlib.sha256(request.get_full_path().encode()).hexdigest()
+            key = f'response:{namespace}:{get_version(namespace)}:{digest}'
+
+            entry = cache.get(key)
+            if entry is not None:
+                _count_lookup(namespace, 'hit')
+                return _response_from_entry(request, entry)
+
+            _count_lookup(namespace, 'miss')
+            lock_key = f'{key}:lock'
+            if cache.add(lock_key, 1, timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+                try:
+                    response = func(request, *args, **kwargs)
+                    _store(key, response)
+                    return response
+                finally:
+                    cache.delete(lock_key)
+
+            deadline = time.monotonic() + settings.RESPONSE_CACHE_WAIT_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return _response_from_entry(request, entry)
+                if cache.get(lock_key) is None:
+                    # The builder finished with an uncacheable response.
+                    break
+
+            return func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _count_lookup(namespace: str, result: str):
+    registry.increment(
+        'response_cache_requests_total', {'namespace': namespace, 'result': result}
+    )
+
+
+def _store(key: str, response):
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return
+    entry = {
+        'content': response.content,
+        'headers': {
+            header: response[header]
+            for header in CACHED_HEADERS
+            if response.has_header(header)
+        },
+    }
+    cache.set(key, entry, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def _response_from_entry(request, entry):
+    headers = entry['headers']
+    not_modified = get_conditional_response(
+        request,
+        etag=headers.get('ETag'),
+        last_modified=parse_http_date_safe(headers.get('Last-Modified', '')),
+    )
+    response = not_modified or HttpResponse(entry['content'])
+    for header, value in headers.items():
+        if not_modified is None or header != 'Content-Type':
+            response[header] = value
+    return response
@@ -0,0 +1,52 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def build_etag(request, versions: Iterable[Tuple], weak: bool = True) -> str:
+    """
+    Build an ETag from the version tuples of every resource in a
+    representation, e.g. ('posts', 1, updated_at).
+
+    The ETag is weak by default: JSON bodies carry a meta.timestamp, so two
+    responses with the same validator are equivalent but not byte-identical.
+    Downloads of stored files pass weak=False, which If-Range requires.
+
+    The request path is part of the ETag because query parameters (filters,
+    pages) change the representation of the same resources. There is no
+    matching Last-Modified: deleting a resource or changing a many-to-many
+    relation changes the versions without a newer timestamp.
+    """
+    digest = hashlib.sha256(request.get_full_path().encode())
+    for version in versions:
+        digest.update(repr(version).encode())
+    etag = f'"{digest.hexdigest()}"'
+    return f'W/{etag}' if weak else etag
+
+
+def get_not_modified_response(
+    request, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[HttpResponse]:
+    """
+    Return a 304 (or 412) response when the request preconditions match the
+    validators, otherwise None so the view goes on to serialize.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified: Optional[datetime] = None):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
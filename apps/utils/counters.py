@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """
+    Accumulate counter increments in memory and write them to the database in
+    batches, instead of one write transaction per event.
+
+    Deltas are added with F() expressions, so flushes from several workers
+    never overwrite each other. A flush happens once COUNTER_FLUSH_INTERVAL
+    seconds have passed or COUNTER_FLUSH_THRESHOLD events are pending, and
+    from the background thread started with start().
+    """
+
+    def __init__(self, model, key_field: str, fields: tuple, on_flush=None):
+        self.model = model
+        self.key_field = key_field
+        self.fields = fields
+        self.on_flush = on_flush
+        self._lock = threading.Lock()
+        self._pending = defaultdict(lambda: defaultdict(int))
+        self._events = 0
+        self._last_flush = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def increment(self, key, field: str, amount: int = 1):
+        if field not in self.fields:
+            raise ValueError(f'Unknown counter field: {field}')
+
+        with self._lock:
+            self._pending[key][field] += amount
+            self._events += 1
+            should_flush = (
+                self._events >= settings.COUNTER_FLUSH_THRESHOLD
+                or time.monotonic() - self._last_flush
+                >= settings.COUNTER_FLUSH_INTERVAL
+            )
+
+        if should_flush:
+            # The event is already buffered; a failed flush is retried later.
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f'Counter flush error: {e}')
+
+    def get_pending(self, key) -> dict:
+        with self._lock:
+            return dict(self._pending.get(key, {}))
+
+    def flush(self) -> int:
+        """
+        Write every pending delta and return the number of rows updated.
+        Keys sharing the same deltas are updated with a single statement.
+        """
+        with self._lock:
+            pending, self._pending = (
+                self._pending,
+                defaultdict(lambda: defaultdict(int)),
+            )
+            self._events = 0
+            self._last_flush = time.monotonic()
+
+        batches = defaultdict(list)
+        for key, deltas in pending.items():
+            deltas = tuple(sorted((f, d) for f, d in deltas.items() if d))
+            if deltas:
+                batches[deltas].append(key)
+        if not batches:
+            return 0
+
+        try:
+            updated = 0
+            with transaction.atomic():
+                now = timezone.now()
+                for deltas, keys in batches.items():
+                    updated += self.model.objects.filter(
+                        **{f'{self.key_field}__in': keys}
+                    ).update(
+                        **{field: F(field) + delta for field, delta in deltas},
+                        updated_at=now,
+                    )
+                if self.on_flush:
+                    self.on_flush()
+            return updated
+        except Exception:
+            # Put the deltas back so the next flush retries them.
+            self._restore(pending)
+            raise
+
+    def start(self):
+        """Flush periodically from a daemon thread, e.g. in a gunicorn worker."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.wait(settings.COUNTER_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f'Counter flush error: {e}')
+            finally:
+                connections.close_all()
+
+    def _restore(self, pending):
+        with self._lock:
+            for key, deltas in pending.items():
+                for field, delta in deltas.items():
+                    self._pending[key][field] += delta
+                    self._events += 1
@@ -0,0 +1,122 @@
+import mimetypes
+import re
+from datetime import datetime
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header, parse_http_date_safe
+
+RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested range starts after the end of the file."""
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Return the first and last byte positions of a single 'bytes' range for a
+    file of size bytes, or None if the header should be ignored and the
+    whole file sent: another unit, several ranges or invalid syntax.
+    """
+    match = RANGE_PATTERN.fullmatch(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # A suffix range: the last bytes of the file.
+        if int(last) == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    if last and int(last) < int(first):
+        return None
+    if int(first) >= size:
+        raise RangeNotSatisfiable
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+class RangedFile:
+    """
+    Reads length bytes of file from start. fileno() is that of file, left at
+    start, so WSGI servers using sendfile() for the Content-Length, such as
+    gunicorn, send the range without copying it through Python.
+    """
+
+    def __init__(self, file, start: int, length: int):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def serve_file(
+    request, file, filename: str, etag: str, last_modified: Optional[datetime]
+) -> HttpResponse:
+    """
+    Respond with the bytes of a stored file, whose access the caller checked.
+
+    With MEDIA_ACCEL_REDIRECT_LOCATION set, nginx sends them, and handles
+    Range requests, through an X-Accel-Redirect to that internal location.
+    Otherwise a FileResponse streams them, honouring a single byte range
+    unless an If-Range validator no longer matches.
+    """
+    if settings.MEDIA_ACCEL_REDIRECT_LOCATION:
+        content_type, _ = mimetypes.guess_type(filename)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_LOCATION + quote(
+            file.name
+        )
+        response['Content-Disposition'] = content_disposition_header(False, filename)
+        return response
+
+    size = file.size
+    byte_range = None
+    if 'Range' in request.headers and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    content = file.storage.open(file.name, 'rb')
+    if byte_range is None:
+        response = FileResponse(content, filename=filename)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangedFile(content, start, end - start + 1), filename=filename, status=206
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _if_range_matches(request, etag: str, last_modified: Optional[datetime]) -> bool:
+    # If-Range holds either a strong ETag or a Last-Modified date.
+    if_range = request.headers.get('If-Range')
+    if if_range is None:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    date = parse_http_date_safe(if_range)
+    return (
+        date is not None
+        and last_modified is not None
+        and date == int(last_modified.timestamp())
+    )
@@ -0,0 +1,80 @@
+import re
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional
+
+from django.core.exceptions import ValidationError
+
+FIELDS_PARAM = re.compile(r'^fields\[(?P<type>[\w-]+)\]$')
+
+
+def parse_fieldsets(params, available: Mapping[str, Iterable[str]]) -> Dict:
+    """
+    Read JSON:API sparse fieldsets, e.g. fields[posts]=title,slug, from the
+    query parameters. available maps every resource type the endpoint
+    supports to its attribute and relationship names.
+
+    Returns the requested names per type; types without a fields[...]
+    parameter are left out, meaning every field is returned.
+    """
+    fieldsets = {}
+    errors = {}
+
+    for param in params:
+        match = FIELDS_PARAM.match(param)
+        if not match:
+            continue
+
+        resource_type = match.group('type')
+        if resource_type not in available:
+            errors[param] = [f'Sparse fieldsets are not supported for {resource_type}.']
+            continue
+
+        names = {name.strip() for name in params.get(param).split(',') if name.strip()}
+        unknown = names - set(available[resource_type])
+        if unknown:
+            errors[param] = [f'Unknown fields: {", ".join(sorted(unknown))}.']
+            continue
+
+        fieldsets[resource_type] = frozenset(names)
+
+    if errors:
+        raise ValidationError(errors)
+
+    return fieldsets
+
+
+def is_requested(name: str, fields: Optional[FrozenSet[str]]) -> bool:
+    return fields is None or name in fields
+
+
+def requested(names: Iterable[str], fields: Optional[FrozenSet[str]]) -> list:
+    return [name for name in names if is_requested(name, fields)]
+
+
+def defer_unrequested(
+    queryset, columns: Mapping[str, Iterable[str]], fields: Optional[FrozenSet[str]]
+):
+    """
+    Leave the columns of unrequested fields out of the SELECT. columns maps
+    each deferrable field to the model fields it reads.
+    """
+    if fields is None:
+        return queryset
+
+    deferred = [
+        column
+        for name, field_columns in columns.items()
+        if name not in fields
+        for column in field_columns
+    ]
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+def get_requested_fields(params, serializer) -> Optional[FrozenSet[str]]:
+    """
+    Sparse fieldset for the primary resource type of serializer, or None when
+    every field was requested. Fieldsets for other types are rejected.
+    """
+    fieldsets = parse_fieldsets(
+        params, {serializer.resource_type: serializer.available_fields}
+    )
+    return fieldsets.get(serializer.resource_type)
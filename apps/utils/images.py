@@ -0,0 +1,60 @@
+import io
+from typing import Iterable, List, Tuple
+
+from PIL import Image, ImageOps
+
+# Variant format for each source format Pillow reports. GIF frames are
+# re-encoded as PNG; animated images get no variants.
+VARIANT_FORMATS = {'JPEG': 'jpeg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'png'}
+VARIANT_SAVE_OPTIONS = {
+    'jpeg': {'format': 'JPEG', 'optimize': True, 'progressive': True},
+    'png': {'format': 'PNG', 'optimize': True},
+    'webp': {'format': 'WEBP', 'method': 4},
+}
+
+
+def render_variants(
+    content: bytes, widths: Iterable[int], quality: int
+) -> List[Tuple[str, int, int, bytes]]:
+    """
+    Encode the variants of an image as (format, width, height, content):
+    every width in widths below the image width, in the source format and as
+    WebP, plus a full-size WebP copy. EXIF orientation is applied.
+
+    Takes and returns plain data and imports nothing from Django, so it can
+    run in a separate process.
+    """
+    with Image.open(io.BytesIO(content)) as source:
+        source_format = VARIANT_FORMATS.get(source.format)
+        if source_format is None or getattr(source, 'is_animated', False):
+            return []
+        image = ImageOps.exif_transpose(source)
+
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+
+    variants = []
+    formats = sorted({source_format, 'webp'})
+    for width in sorted({width for width in widths if 0 < width < image.width}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize(
+            (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+        )
+        for format in formats:
+            variants.append((format, width, height, _encode(resized, format, quality)))
+    if source_format != 'webp':
+        variants.append(
+            ('webp', image.width, image.height, _encode(image, 'webp', quality))
+        )
+    return variants
+
+
+def _encode(image, format: str, quality: int) -> bytes:
+    options = dict(VARIANT_SAVE_OPTIONS[format])
+    if format != 'png':
+        options['quality'] = quality
+    if format == 'jpeg' and image.mode == 'RGBA':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
@@ -0,0 +1,39 @@
+from typing import FrozenSet, Iterable, Optional
+
+from django.core.exceptions import ValidationError
+
+INCLUDE_PARAM = 'include'
+
+
+def parse_include(params, available: Iterable[str]) -> Optional[FrozenSet[str]]:
+    """
+    Read the JSON:API include parameter, e.g. include=author,tags. Returns
+    None when the parameter is absent so views can keep their default.
+
+    Only direct relationships of the primary resource can be included.
+    """
+    if INCLUDE_PARAM not in params:
+        return None
+
+    names = {
+        name.strip() for name in params.get(INCLUDE_PARAM).split(',') if name.strip()
+    }
+    unknown = names - set(available)
+    if unknown:
+        raise ValidationError(
+            {INCLUDE_PARAM: [f'Unknown relationships: {", ".join(sorted(unknown))}.']}
+        )
+
+    return frozenset(names)
+
+
+def get_requested_include(params, serializer) -> Optional[FrozenSet[str]]:
+    return parse_include(params, serializer.relationship_fields)
+
+
+def deduplicate(resources: Iterable[dict]) -> list:
+    """Keep the first resource object of every (type, id) pair."""
+    unique = {}
+    for resource in resources:
+        unique.setdefault((resource['type'], resource['id']), resource)
+    return list(unique.values())
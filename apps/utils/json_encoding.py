@@ -0,0 +1,53 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _dumps_json(obj) -> bytes:
+    return json.dumps(
+        obj, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def _dumps_orjson(obj) -> bytes:
+    # Datetimes are passed through to DjangoJSONEncoder: orjson cannot round
+    # them to milliseconds, and both backends must render the same output.
+    return orjson.dumps(
+        obj,
+        default=_django_encoder.default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+BACKENDS = {'json': _dumps_json, 'orjson': _dumps_orjson}
+
+
+def get_backend(name: str | None = None) -> str:
+    """
+    Resolve a backend name, JSON_ENCODER_BACKEND by default. 'auto' picks
+    orjson when it is installed and the standard library otherwise.
+    """
+    name = name or settings.JSON_ENCODER_BACKEND
+    if name == 'auto':
+        return 'orjson' if orjson is not None else 'json'
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown JSON encoder backend: {name}')
+    if name == 'orjson' and orjson is None:
+        raise ValueError('The orjson JSON encoder backend requires orjson.')
+    return name
+
+
+def dumps(obj, backend: str | None = None) -> bytes:
+    """
+    Encode obj as compact UTF-8 JSON. Dates, times, decimals, UUIDs and lazy
+    strings are rendered as DjangoJSONEncoder renders them.
+    """
+    return BACKENDS[get_backend(backend)](obj)
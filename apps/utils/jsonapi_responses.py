@@ -1,8 +1,13 @@
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
-from django.http import HttpResponse, JsonResponse
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .json_encoding import dumps
+from .metrics import timed_serialization
 
 
 @dataclass
@@ -19,10 +24,13 @@ class JsonApiResponseBuilder:
         data: Optional[Union[Dict, List]] = None,
         errors: Optional[List[JsonApiError]] = None,
         links: Optional[Dict] = None,
+        included: Optional[List] = None,
     ) -> Dict:
         payload = {}
         if data is not None:
             payload['data'] = data
+        if included is not None:
+            payload['included'] = included
         if errors:
             payload['errors'] = [asdict(error) for error in errors]
         if links:
@@ -30,16 +38,80 @@ class JsonApiResponseBuilder:
         return payload
 
     @staticmethod
-    def ok(data: Dict, meta: Optional[Dict] = None) -> JsonResponse:
-        response_data = JsonApiResponseBuilder._build_response(data=data)
+    def _json_response(payload: Dict, status: int, **kwargs: Dict) -> HttpResponse:
+        return HttpResponse(
+            dumps(payload), content_type='application/json', status=status, **kwargs
+        )
+
+    @staticmethod
+    @timed_serialization
+    def ok(
+        data: Dict,
+        meta: Optional[Dict] = None,
+        links: Optional[Dict] = None,
+        included: Optional[List] = None,
+    ) -> HttpResponse:
+        response_data = JsonApiResponseBuilder._build_response(
+            data=data, links=links, included=included
+        )
         response_data['meta'] = meta or {'timestamp': datetime.now().isoformat()}
-        return JsonResponse(response_data, status=200)
+        return JsonApiResponseBuilder._json_response(response_data, status=200)
+
+    @staticmethod
+    def ok_stream(
+        items: Iterable,
+        serialize: Callable,
+        meta: Optional[Dict] = None,
+        links: Optional[Dict] = None,
+        chunk_size: Optional[int] = None,
+    ) -> StreamingHttpResponse:
+        """
+        Like ok(), but serializes and encodes items while the response is
+        being sent, so memory stays flat however large the collection is.
+        Querysets are read with .iterator() in chunks of chunk_size rows.
+        """
+        chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+        if isinstance(items, QuerySet):
+            items = items.iterator(chunk_size=chunk_size)
+
+        tail = JsonApiResponseBuilder._build_response(links=links)
+        tail['meta'] = meta or {'timestamp': datetime.now().isoformat()}
+        return StreamingHttpResponse(
+            JsonApiResponseBuilder._stream_data(items, serialize, tail, chunk_size),
+            content_type='application/json',
+        )
+
+    @staticmethod
+    def _stream_data(items, serialize, tail, chunk_size):
+        yield b'{"data":['
+        separator = b''
+        chunk = []
+        for item in items:
+            chunk.append(dumps(serialize(item)))
+            if len(chunk) >= chunk_size:
+                yield separator + b','.join(chunk)
+                separator = b','
+                chunk = []
+        if chunk:
+            yield separator + b','.join(chunk)
+        yield b'],' + dumps(tail)[1:]
 
     @staticmethod
-    def created(data: Dict, meta: Optional[Dict] = None) -> JsonResponse:
+    @timed_serialization
+    def created(data: Dict, meta: Optional[Dict] = None) -> HttpResponse:
         response_data = JsonApiResponseBuilder._build_response(data=data)
         response_data['meta'] = meta or {'timestamp': datetime.now().isoformat()}
-        return JsonResponse(response_data, status=201)
+        return JsonApiResponseBuilder._json_response(response_data, status=201)
+
+    @staticmethod
+    @timed_serialization
+    def atomic_results(
+        results: List[Dict], meta: Optional[Dict] = None
+    ) -> HttpResponse:
+        """Response to an atomic:operations request, one result per operation."""
+        response_data = {'atomic:results': [{'data': data} for data in results]}
+        response_data['meta'] = meta or {'timestamp': datetime.now().isoformat()}
+        return JsonApiResponseBuilder._json_response(response_data, status=200)
 
     @staticmethod
     def no_content(**kwargs: Dict) -> HttpResponse:
@@ -52,7 +124,7 @@ class JsonApiResponseBuilder:
         detail: str,
         meta: Optional[Dict] = None,
         **kwargs: Dict,
-    ) -> JsonResponse:
+    ) -> HttpResponse:
         error = JsonApiError(
             status=str(status_code),
             title=title,
@@ -60,7 +132,9 @@ class JsonApiResponseBuilder:
             meta=meta or {'timestamp': datetime.now().isoformat()},
         )
         payload = JsonApiResponseBuilder._build_response(errors=[error])
-        return JsonResponse(payload, status=status_code, **kwargs)
+        return JsonApiResponseBuilder._json_response(
+            payload, status=status_code, **kwargs
+        )
 
     @staticmethod
     def validation_errors_from_dict(
@@ -87,7 +161,7 @@ class JsonApiResponseBuilder:
                     )
                 )
         payload = JsonApiResponseBuilder._build_response(errors=errors)
-        return JsonResponse(payload, status=status_code)
+        return JsonApiResponseBuilder._json_response(payload, status=status_code)
 
     @staticmethod
     def validation_errors_from_list(
@@ -107,4 +181,4 @@ class JsonApiResponseBuilder:
                 )
             )
         payload = JsonApiResponseBuilder._build_response(errors=errors)
-        return JsonResponse(payload, status=status_code)
+        return JsonApiResponseBuilder._json_response(payload, status=status_code)
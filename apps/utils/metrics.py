@@ -0,0 +1,374 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+UNRESOLVED_VIEW = 'unresolved'
+
+METRIC_PREFIX = 'simple_blog'
+HISTOGRAM_METRICS = {
+    'total_seconds': (
+        'http_request_duration_seconds',
+        'Time spent handling requests.',
+    ),
+    'db_seconds': (
+        'http_request_db_duration_seconds',
+        'Time spent in database queries per request.',
+    ),
+    'serialize_seconds': (
+        'http_request_serialize_duration_seconds',
+        'Time spent serializing responses per request.',
+    ),
+    'db_queries': (
+        'http_request_db_queries',
+        'Database queries executed per request.',
+    ),
+}
+COUNTER_METRICS = {
+    'http_requests_total': 'Requests handled, by view, method and status.',
+    'response_cache_requests_total': 'Response cache lookups, by namespace and result.',
+    'media_uploads_total': 'Uploaded media files, by type.',
+    'media_upload_bytes_total': 'Bytes of uploaded media files, by type.',
+}
+
+
+class Histogram:
+    """
+    Observation counts per bucket plus their sum. counts[i] holds values up to
+    buckets[i] not counted in a lower bucket; the last count holds the rest.
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        return {
+            'buckets': list(self.buckets),
+            'counts': list(self.counts),
+            'sum': self.sum,
+            'count': self.count,
+        }
+
+
+class MetricsRegistry:
+    """Per-view histograms of request metrics, aggregated in this process."""
+
+    histogram_buckets = {
+        'total_seconds': DURATION_BUCKETS,
+        'db_seconds': DURATION_BUCKETS,
+        'serialize_seconds': DURATION_BUCKETS,
+        'db_queries': QUERY_COUNT_BUCKETS,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, view: str, values: dict):
+        with self._lock:
+            for metric, value in values.items():
+                key = (view, metric)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(self.histogram_buckets[metric])
+                self._histograms[key].observe(value)
+
+    def increment(self, name: str, labels: dict | None = None, amount=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {}
+            for (view, metric), histogram in sorted(self._histograms.items()):
+                data.setdefault(view, {})[metric] = histogram.snapshot()
+            return data
+
+    def export(self) -> dict:
+        """Return every histogram and counter in a JSON-serializable form."""
+        with self._lock:
+            return {
+                'histograms': [
+                    [view, metric, histogram.snapshot()]
+                    for (view, metric), histogram in self._histograms.items()
+                ],
+                'counters': [
+                    [name, [list(label) for label in labels], value]
+                    for (name, labels), value in self._counters.items()
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self._serialize_depth = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.db_queries += 1
+
+
+registry = MetricsRegistry()
+_current = ContextVar('request_metrics', default=None)
+_writer_stopped = threading.Event()
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Add the time spent inside the block to the current request's
+    serialization time. Nested blocks are only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    metrics._serialize_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serialize_depth -= 1
+        if not metrics._serialize_depth:
+            metrics.serialize_seconds += time.perf_counter() - start
+
+
+def timed_serialization(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        # Per-row calls run inside an already measured block; skip the
+        # context manager for them.
+        if metrics is None or metrics._serialize_depth:
+            return func(*args, **kwargs)
+        with measure_serialization():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, serialization time and total time of every
+    request under its URL name, and report them in a Server-Timing header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_seconds = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match and match.url_name) or UNRESOLVED_VIEW
+        registry.increment(
+            'http_requests_total',
+            {
+                'view': view,
+                'method': request.method,
+                'status': str(response.status_code),
+            },
+        )
+        registry.observe(
+            view,
+            {
+                'total_seconds': total_seconds,
+                'db_seconds': metrics.db_seconds,
+                'serialize_seconds': metrics.serialize_seconds,
+                'db_queries': metrics.db_queries,
+            },
+        )
+
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join(
+                [
+                    f'db;dur={metrics.db_seconds * 1000:.2f};'
+                    f'desc="{metrics.db_queries} queries"',
+                    f'serialize;dur={metrics.serialize_seconds * 1000:.2f}',
+                    f'total;dur={total_seconds * 1000:.2f}',
+                ]
+            )
+        return response
+
+
+def write_export():
+    """
+    Write this process's metrics to METRICS_DIR, where the /metrics endpoint
+    of any worker picks them up.
+    """
+    if not settings.METRICS_DIR:
+        return
+
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    tmp_path = directory / f'.{pid}.json.tmp'
+    tmp_path.write_text(json.dumps(registry.export()))
+    os.replace(tmp_path, directory / f'{pid}.json')
+
+
+def start_writer():
+    """Write exports every METRICS_WRITE_INTERVAL seconds from a daemon thread."""
+    if not settings.METRICS_DIR:
+        return
+
+    def run():
+        while not _writer_stopped.wait(settings.METRICS_WRITE_INTERVAL):
+            try:
+                write_export()
+            except OSError as e:
+                logger.error(f'Metrics export error: {e}')
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def stop_writer():
+    _writer_stopped.set()
+    write_export()
+
+
+def collect() -> dict:
+    """
+    Merge the live metrics of this process with the exports of every other
+    process in METRICS_DIR, including workers that already exited.
+    """
+    exports = [registry.export()]
+    if settings.METRICS_DIR:
+        own_file = f'{os.getpid()}.json'
+        for path in Path(settings.METRICS_DIR).glob('*.json'):
+            if path.name == own_file:
+                continue
+            try:
+                exports.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Unreadable or half-written by an old process; skip it.
+                continue
+
+    histograms = {}
+    counters = {}
+    for export in exports:
+        for view, metric, snapshot in export['histograms']:
+            merged = histograms.setdefault(
+                (metric, view),
+                {
+                    'buckets': snapshot['buckets'],
+                    'counts': [0] * len(snapshot['counts']),
+                    'sum': 0,
+                    'count': 0,
+                },
+            )
+            merged['counts'] = [
+                a + b for a, b in zip(merged['counts'], snapshot['counts'])
+            ]
+            merged['sum'] += snapshot['sum']
+            merged['count'] += snapshot['count']
+        for name, labels, value in export['counters']:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+
+    return {'histograms': histograms, 'counters': counters}
+
+
+def render_prometheus(collected: dict) -> str:
+    """Render collected metrics in the Prometheus text exposition format."""
+    lines = []
+
+    histograms = collected['histograms']
+    for metric, (name, help_text) in HISTOGRAM_METRICS.items():
+        views = sorted(view for m, view in histograms if m == metric)
+        if not views:
+            continue
+        name = f'{METRIC_PREFIX}_{name}'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for view in views:
+            snapshot = histograms[(metric, view)]
+            labels = {'view': view}
+            cumulative = 0
+            for bound, count in zip(snapshot['buckets'], snapshot['counts']):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, 'le': _format_value(bound)})
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            bucket_labels = _format_labels({**labels, 'le': '+Inf'})
+            lines.append(f'{name}_bucket{bucket_labels} {snapshot["count"]}')
+            lines.append(
+                f'{name}_sum{_format_labels(labels)} {_format_value(snapshot["sum"])}'
+            )
+            lines.append(f'{name}_count{_format_labels(labels)} {snapshot["count"]}')
+
+    counters = collected['counters']
+    for metric, help_text in COUNTER_METRICS.items():
+        keys = sorted(key for key in counters if key[0] == metric)
+        if not keys:
+            continue
+        name = f'{METRIC_PREFIX}_{metric}'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for key in keys:
+            labels = _format_labels(dict(key[1]))
+            lines.append(f'{name}{labels} {_format_value(counters[key])}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'),
+        )
+        for key, value in labels.items()
+    )
+    return f'{{{pairs}}}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+@dataclass
+class CursorPage:
+    items: List
+    size: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over a fixed ordering.
+
+    The cursor encodes the ordering values of the boundary row, so fetching
+    any page is an index seek on those columns instead of an OFFSET scan.
+    """
+
+    size_param = 'page[size]'
+    after_param = 'page[after]'
+    before_param = 'page[before]'
+
+    def __init__(
+        self,
+        ordering: Sequence[str] = ('-created_at', '-id'),
+        default_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ):
+        self.ordering = tuple(ordering)
+        self.default_size = default_size or settings.DEFAULT_PAGE_SIZE
+        self.max_size = max_size or settings.MAX_PAGE_SIZE
+
+    def paginate(self, queryset, params) -> CursorPage:
+        size = self._get_size(params)
+        after = params.get(self.after_param)
+        before = params.get(self.before_param)
+
+        if after and before:
+            raise ValidationError(
+                {
+                    self.before_param: (
+                        f'{self.after_param} and {self.before_param} '
+                        'cannot be used together.'
+                    )
+                }
+            )
+
+        if before:
+            values = self._decode(queryset.model, before, self.before_param)
+            queryset = queryset.filter(self._keyset_filter(values, reverse=True))
+            rows = list(queryset.order_by(*self._reversed_ordering())[: size + 1])
+            has_prev, has_next = len(rows) > size, True
+            rows = rows[:size][::-1]
+        else:
+            if after:
+                values = self._decode(queryset.model, after, self.after_param)
+                queryset = queryset.filter(self._keyset_filter(values))
+            rows = list(queryset.order_by(*self.ordering)[: size + 1])
+            has_prev, has_next = bool(after), len(rows) > size
+            rows = rows[:size]
+
+        return CursorPage(
+            items=rows,
+            size=size,
+            next_cursor=self._encode(rows[-1]) if rows and has_next else None,
+            prev_cursor=self._encode(rows[0]) if rows and has_prev else None,
+        )
+
+    def get_links(self, request, page: CursorPage) -> Dict:
+        return {
+            'self': request.get_full_path(),
+            'next': self._build_link(request, self.after_param, page.next_cursor),
+            'prev': self._build_link(request, self.before_param, page.prev_cursor),
+        }
+
+    def get_meta(self, page: CursorPage) -> Dict:
+        return {
+            'size': page.size,
+            'count': len(page),
+            'has_next': page.next_cursor is not None,
+            'has_prev': page.prev_cursor is not None,
+        }
+
+    def _get_size(self, params) -> int:
+        raw_size = params.get(self.size_param)
+        if raw_size in (None, ''):
+            return self.default_size
+        try:
+            size = int(raw_size)
+        except (TypeError, ValueError):
+            size = 0
+        if not 1 <= size <= self.max_size:
+            raise ValidationError(
+                {
+                    self.size_param: (
+                        f'Page size must be an integer between 1 and {self.max_size}.'
+                    )
+                }
+            )
+        return size
+
+    def _fields(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def _reversed_ordering(self):
+        return [
+            name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering
+        ]
+
+    def _keyset_filter(self, values, reverse=False) -> Q:
+        # (a, b) after (x, y) => a > x OR (a = x AND b > y), honouring the
+        # direction of each ordering term.
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            field_name = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            term = Q(**{f'{field_name}__{lookup}': values[index]})
+            for previous, value in zip(self._fields()[:index], values):
+                term &= Q(**{previous: value})
+            condition |= term
+        return condition
+
+    def _encode(self, obj) -> str:
+        values = []
+        for field_name in self._fields():
+            value = getattr(obj, field_name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def _decode(self, model, cursor: str, param: str) -> List:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            # Every ordering value is encoded as a string or a number; null
+            # or nested values cannot be compared against.
+            if not all(
+                isinstance(value, (str, int, float)) and not isinstance(value, bool)
+                for value in values
+            ):
+                raise ValueError
+            return [
+                self._to_python(model, field_name, value)
+                for field_name, value in zip(self._fields(), values)
+            ]
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise ValidationError({param: 'Invalid pagination cursor.'})
+
+    @staticmethod
+    def _to_python(model, field_name, value):
+        # Annotations (e.g. search ranks) are not model fields; their JSON
+        # value is already the one to compare against.
+        try:
+            return model._meta.get_field(field_name).to_python(value)
+        except FieldDoesNotExist:
+            return value
+
+    def _build_link(self, request, param: str, cursor: Optional[str]):
+        if cursor is None:
+            return None
+        query = request.GET.copy()
+        query.pop(self.after_param, None)
+        query.pop(self.before_param, None)
+        query[param] = cursor
+        return f'{request.path}?{query.urlencode(safe="[]")}'
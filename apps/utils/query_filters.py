@@ -1,22 +1,21 @@
 import re
 
 from django.core.exceptions import ValidationError
-from django.db.models import Q
-from django.http import Http404
+from django.db.models import Exists, OuterRef, Q
 
-from apps.content.models import Category, Post, Tag
-from apps.utils.text import normalize_text
+from apps.content.models import Post
+from apps.content.search import DEFAULT_SEARCH_FIELDS, SEARCH_FIELDS, search_posts
+from apps.utils.text import build_search_key, normalize_text
+from apps.utils.validators import get_category_id_or_404, get_valid_tag_ids_or_404
 
 
 def filter_posts_by_user_role(queryset, user):
     if not user.is_authenticated:
         return queryset.filter(status=Post.Status.PUBLISHED)
     elif user.role == 'author':
-        return (
-            queryset.filter(Q(author=user) | Q(status=Post.Status.PUBLISHED))
-            .distinct()
-            .order_by('-id')
-        )
+        # Both terms are on the post row itself, so no row can match twice
+        # and DISTINCT would only force a sort.
+        return queryset.filter(Q(author=user) | Q(status=Post.Status.PUBLISHED))
     elif user.role == 'admin':
         return queryset
     else:
@@ -27,13 +26,12 @@ def filter_posts_by_params(queryset, params):
     category = params.get('category')
     tags = params.get('tags')
     search = params.get('search')
+    search_fields = params.get('search_fields')
 
     if category:
         if not re.match(r'^[-\w]+$', category):
             raise ValidationError({'category': 'Invalid slug format.'})
-        if not Category.objects.filter(slug=category).exists():
-            raise Http404('No Category matches the given query.')
-        queryset = queryset.filter(category__slug=category)
+        queryset = queryset.filter(category_id=get_category_id_or_404(category))
 
     if tags:
         tags_slugs = [slug for slug in tags.split(',') if slug]
@@ -41,27 +39,50 @@ def filter_posts_by_params(queryset, params):
             if not re.match(r'^[-\w]+$', slug):
                 raise ValidationError({'tags': 'Invalid slug format.'})
 
-        existing_slugs = Tag.objects.filter(slug__in=tags_slugs).values_list(
-            'slug', flat=True
+        # EXISTS instead of a join, which would repeat posts having several
+        # of the tags and need DISTINCT.
+        queryset = queryset.filter(
+            Exists(
+                Post.tags.through.objects.filter(
+                    post_id=OuterRef('pk'),
+                    tag_id__in=get_valid_tag_ids_or_404(tags_slugs),
+                )
+            )
         )
-        missing = set(tags_slugs) - set(existing_slugs)
-
-        if missing:
-            raise Http404(f'The following tags were not found: {", ".join(missing)}.')
-
-        queryset = queryset.filter(tags__slug__in=tags_slugs).distinct()
 
     if search:
         if not re.match(r'^[\w\s\-]*$', search):
             raise ValidationError({'search': 'Invalid search query format.'})
 
+        fields = DEFAULT_SEARCH_FIELDS
+        if search_fields:
+            fields = tuple(field for field in search_fields.split(',') if field)
+            if not fields or set(fields) - set(SEARCH_FIELDS):
+                raise ValidationError(
+                    {
+                        'search_fields': (
+                            f'Allowed values are: {", ".join(SEARCH_FIELDS)}.'
+                        )
+                    }
+                )
+
         search_normalized = normalize_text(search)
         keywords = re.findall(r'\w+', search_normalized)
-        query = Q()
-        for keyword in keywords:
-            query |= Q(title__icontains=keyword)
-        queryset = queryset.filter(query)
-        if not queryset.exists():
-            raise Http404('No Post matches the given query.')
+        if keywords:
+            queryset = search_posts(queryset, keywords, fields)
 
     return queryset
+
+
+def filter_by_search_key_prefix(queryset, params):
+    search = params.get('search')
+    if not search:
+        return queryset
+
+    if not re.match(r'^[\w\s\-]*$', search):
+        raise ValidationError({'search': 'Invalid search query format.'})
+
+    # A range over the indexed column instead of LIKE, so the lookup is an
+    # index seek on every backend.
+    prefix = build_search_key(search)
+    return queryset.filter(search_key__gte=prefix, search_key__lt=f'{prefix}\U0010ffff')
@@ -0,0 +1,92 @@
+import inspect
+from functools import lru_cache
+from typing import Callable, Tuple
+
+from django.db.models.query_utils import DeferredAttribute
+
+
+class SerializerPlan:
+    """
+    Attribute extraction for one model and list of field names, built once
+    into a function that builds the dict with a single comprehension over
+    (name, column) pairs, calling a converter for each field that needs
+    one. Applying it does no per-object introspection.
+    """
+
+    def __init__(
+        self, model, names: Tuple[str, ...], converters: Tuple[Tuple, ...] = ()
+    ):
+        self.model = model
+        self.names = names
+        # Concrete column names, e.g. author_id for author, which is also what
+        # .values_list(*plan.columns) returns.
+        self.columns = tuple(model._meta.get_field(name).attname for name in names)
+        converters = dict(converters)
+        conversions = tuple(
+            (name, converters[name]) for name in names if name in converters
+        )
+
+        # serialize(obj) reads a model instance; serialize_row(row) reads a
+        # tuple of column values, e.g. from .values_list(*plan.columns).
+        self.serialize = _with_conversions(
+            _instance_reader(model, names, self.columns), conversions
+        )
+        items = tuple((name, index) for index, name in enumerate(names))
+        self.serialize_row = _with_conversions(
+            lambda row: {name: row[index] for name, index in items}, conversions
+        )
+
+    def __repr__(self):
+        return f'<SerializerPlan {self.model.__name__}: {", ".join(self.names)}>'
+
+
+def _reads_instance_dict(model, column: str) -> bool:
+    # Plain columns keep their value in the instance __dict__; descriptors
+    # that override __get__, like FileField's, must be read as attributes.
+    descriptor = inspect.getattr_static(model, column, None)
+    return type(descriptor).__get__ is DeferredAttribute.__get__
+
+
+def _instance_reader(model, names: Tuple[str, ...], columns: Tuple[str, ...]):
+    items = tuple(zip(names, columns))
+
+    def read_attributes(obj):
+        return {name: getattr(obj, column) for name, column in items}
+
+    if not all(_reads_instance_dict(model, column) for column in columns):
+        return read_attributes
+
+    def read_dict(obj):
+        values = obj.__dict__
+        try:
+            return {name: values[column] for name, column in items}
+        except KeyError:
+            # A deferred column, which only attribute access loads.
+            return read_attributes(obj)
+
+    return read_dict
+
+
+def _with_conversions(read: Callable, conversions: Tuple[Tuple, ...]) -> Callable:
+    if not conversions:
+        return read
+
+    def serialize(source):
+        data = read(source)
+        for name, convert in conversions:
+            data[name] = convert(data[name])
+        return data
+
+    return serialize
+
+
+@lru_cache(maxsize=None)
+def compile_plan(
+    model, names: Tuple[str, ...], converters: Tuple[Tuple[str, Callable], ...] = ()
+) -> SerializerPlan:
+    """
+    Return the plan for model and names, compiling it on first use.
+    converters is a tuple of (name, function) pairs applied to the value of
+    the named field.
+    """
+    return SerializerPlan(model, names, converters)
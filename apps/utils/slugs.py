@@ -0,0 +1,68 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+
+from .cache import bump_version_on_commit, get_version
+
+
+class SlugIdCache:
+    """
+    Per-process map of every slug to its primary key for a small,
+    read-mostly model, loaded with a single query.
+
+    The map is tagged with the version of a shared cache namespace. A write
+    in any worker calls invalidate(), which bumps that version, and the next
+    lookup in every worker reloads the map. A slug missing from the map
+    reloads it too, so a row created by a worker that does not share the
+    cache backend is still found.
+
+    Renames and deletes in other workers are only seen through the shared
+    version, so without CACHE_IS_SHARED every lookup reads the database.
+    """
+
+    def __init__(self, model, namespace: str, slug_field: str = 'slug'):
+        self.model = model
+        self.namespace = namespace
+        self.slug_field = slug_field
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._version = None
+
+    def get_ids(self, slugs: Iterable[str]) -> Dict[str, int]:
+        """Map every existing slug in slugs to its id, leaving out the rest."""
+        slugs = set(slugs)
+        if not settings.CACHE_IS_SHARED:
+            return dict(
+                self.model.objects.filter(
+                    **{f'{self.slug_field}__in': slugs}
+                ).values_list(self.slug_field, 'pk')
+            )
+        ids = self._get_map()
+        if not slugs <= ids.keys():
+            ids = self._get_map(reload=True)
+        return {slug: ids[slug] for slug in slugs if slug in ids}
+
+    def get_id(self, slug: str) -> Optional[int]:
+        if not settings.CACHE_IS_SHARED:
+            return self.get_ids([slug]).get(slug)
+        ids = self._get_map()
+        if slug not in ids:
+            ids = self._get_map(reload=True)
+        return ids.get(slug)
+
+    def invalidate(self):
+        bump_version_on_commit(self.namespace)
+
+    def _get_map(self, reload: bool = False) -> Dict[str, int]:
+        # Read the version first: a write committed while the rows load
+        # bumps it again, so that load is replaced on the next lookup.
+        version = get_version(self.namespace)
+        with self._lock:
+            if version == self._version and not reload:
+                return self._ids
+
+        ids = dict(self.model.objects.values_list(self.slug_field, 'pk'))
+        with self._lock:
+            self._ids, self._version = ids, version
+        return ids
@@ -10,3 +10,8 @@ def normalize_text(text):
     text = re.sub(r'[^\w\s]', ' ', text)
     text = f' {text.strip()} '
     return text
+
+
+def build_search_key(text, max_length=None):
+    key = ' '.join(normalize_text(text or '').split())
+    return key[:max_length] if max_length else key
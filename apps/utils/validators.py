@@ -1,7 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.http import Http404
 
-from apps.content.models.tags import Tag
+from apps.content.slugs import category_ids, tag_ids
 
 
 def validate_required_fields(data, required_fields) -> None:
@@ -34,15 +34,21 @@ def validate_invalid_fields(data, allowed_fields) -> None:
 #     return tags
 
 
-def get_valid_tags_or_404(tag_slugs):
+def get_valid_tag_ids_or_404(tag_slugs):
     if not isinstance(tag_slugs, (list, set, tuple)):
         raise ValidationError({'__all__': ['Tags must be a list, set, or tuple.']})
 
-    tags = Tag.objects.filter(slug__in=tag_slugs)
-    found_slugs = tags.values_list('slug', flat=True)
-    missing = set(tag_slugs) - set(found_slugs)
+    ids = tag_ids.get_ids(tag_slugs)
+    missing = set(tag_slugs) - ids.keys()
 
     if missing:
         raise Http404(f'The following tags were not found: {", ".join(missing)}.')
 
-    return tags
+    return list(ids.values())
+
+
+def get_category_id_or_404(slug):
+    category_id = category_ids.get_id(slug)
+    if category_id is None:
+        raise Http404('No Category matches the given query.')
+    return category_id
@@ -7,4 +7,7 @@ if [ ! -f "/var/data/db.sqlite3" ]; then
   python manage.py migrate --noinput
 fi
 
+# Only creates tables for database cache backends; a no-op otherwise.
+python manage.py createcachetable
+
 exec "$@"
@@ -1,4 +1,6 @@
 import multiprocessing
+import os
+import shutil
 
 bind = '0.0.0.0:8000'
 workers = multiprocessing.cpu_count() * 2 + 1
@@ -16,3 +18,26 @@ loglevel = 'info'
 limit_request_line = 4094
 limit_request_fields = 100
 limit_request_field_size = 8190
+
+
+def on_starting(server):
+    # Metrics restart from zero with the server, not with each worker.
+    metrics_dir = os.getenv('METRICS_DIR')
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def post_worker_init(worker):
+    from apps.content.counters import post_statistics_buffer
+    from apps.utils.metrics import start_writer
+
+    post_statistics_buffer.start()
+    start_writer()
+
+
+def worker_exit(server, worker):
+    from apps.content.counters import post_statistics_buffer
+    from apps.utils.metrics import stop_writer
+
+    post_statistics_buffer.stop()
+    stop_writer()
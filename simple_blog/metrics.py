@@ -0,0 +1,18 @@
+from django.http import HttpResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from apps.utils.metrics import collect, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@never_cache
+@require_GET
+def metrics(request):
+    """
+    Prometheus metrics endpoint, aggregated across all gunicorn workers.
+    """
+    return HttpResponse(
+        render_prometheus(collect()), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.utils.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -111,6 +112,40 @@ STATIC_ROOT = os.getenv('STATIC_VOLUME', str(BASE_DIR / 'staticfiles'))
 # Media files (uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.getenv('MEDIA_VOLUME', str(BASE_DIR / 'media'))
+# Threads reading image metadata and writing files to storage per upload.
+MEDIA_UPLOAD_WORKERS = int(os.getenv('MEDIA_UPLOAD_WORKERS', '4'))
+# Django's default upload handlers, also hashing the files they receive, so
+# media uploads are stored by content without reading them again.
+FILE_UPLOAD_HANDLERS = [
+    'apps.media_files.uploads.HashingMemoryFileUploadHandler',
+    'apps.media_files.uploads.HashingTemporaryFileUploadHandler',
+]
+# Resumable uploads: the bytes received so far are kept outside MEDIA_ROOT
+# until the last chunk arrives.
+MEDIA_UPLOAD_SESSION_DIR = os.getenv(
+    'MEDIA_UPLOAD_SESSION_VOLUME', str(BASE_DIR / 'uploads')
+)
+MEDIA_UPLOAD_MAX_SIZE = int(os.getenv('MEDIA_UPLOAD_MAX_SIZE', str(2 * 1024**3)))
+# Largest chunk accepted per request, below nginx's client_max_body_size.
+MEDIA_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+# Seconds an unfinished upload is kept after its last chunk.
+MEDIA_UPLOAD_EXPIRY = 24 * 60 * 60
+# Internal nginx location, e.g. /protected-media/, aliasing MEDIA_ROOT: the
+# media download view checks access, then lets nginx send the file with
+# X-Accel-Redirect. When empty, Django sends it.
+MEDIA_ACCEL_REDIRECT_LOCATION = os.getenv('MEDIA_ACCEL_REDIRECT_LOCATION', '')
+# Image variants, generated by the process_media_variants command: each width
+# below the image width in the source format and as WebP, plus a full-size
+# WebP copy.
+MEDIA_VARIANT_WIDTHS = [
+    int(width)
+    for width in os.getenv('MEDIA_VARIANT_WIDTHS', '320,640,1280,1920').split(',')
+]
+MEDIA_VARIANT_QUALITY = int(os.getenv('MEDIA_VARIANT_QUALITY', '80'))
+MEDIA_VARIANT_WORKERS = int(os.getenv('MEDIA_VARIANT_WORKERS', '2'))
+MEDIA_VARIANT_MAX_ATTEMPTS = 3
+# Seconds before a job left running by a stopped worker is claimed again.
+MEDIA_VARIANT_JOB_TIMEOUT = 600
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -125,6 +160,68 @@ API_DESCRIPTION = 'A robust Django-based blog API with secure authentication, HT
 # Pagination settings
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
+# Rows fetched and encoded per chunk by streamed collection responses.
+STREAM_CHUNK_SIZE = 200
+# JSON encoder for API responses: auto, orjson or json. auto uses orjson when
+# it is installed; both render identical documents.
+JSON_ENCODER_BACKEND = os.getenv('JSON_ENCODER_BACKEND', 'auto')
+
+# Bulk post operations
+BULK_MAX_OPERATIONS = int(os.getenv('BULK_MAX_OPERATIONS', '10000'))
+BULK_BATCH_SIZE = 1000
+# Request bodies read into memory, e.g. bulk operations; nginx caps them at
+# the same size.
+DATA_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024
+
+# Cache settings
+# Redis is used whenever REDIS_URL is set; locmem caches are per process, so
+# use file, database or redis to share responses between gunicorn workers.
+REDIS_URL = os.getenv('REDIS_URL', '')
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': 'simple-blog',
+    'file': str(BASE_DIR / 'cache'),
+    'database': 'django_cache',
+    'redis': REDIS_URL,
+}
+CACHE_BACKEND = os.getenv('DJANGO_CACHE_BACKEND', 'redis' if REDIS_URL else 'locmem')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+    }
+}
+
+# locmem is private to each process: a write in one worker would only reach
+# the cache of that worker. Response caching and the per-process slug maps
+# need a cache shared by every process.
+CACHE_IS_SHARED = os.getenv('CACHE_IS_SHARED', str(CACHE_BACKEND != 'locmem')) == 'True'
+RESPONSE_CACHE_ENABLED = (
+    os.getenv('RESPONSE_CACHE_ENABLED', str(CACHE_IS_SHARED)) == 'True'
+)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+RESPONSE_CACHE_LOCK_TIMEOUT = int(os.getenv('RESPONSE_CACHE_LOCK_TIMEOUT', '10'))
+RESPONSE_CACHE_WAIT_TIMEOUT = float(os.getenv('RESPONSE_CACHE_WAIT_TIMEOUT', '2'))
+
+# Counter settings
+# Buffered counter increments are written at most every COUNTER_FLUSH_INTERVAL
+# seconds, or as soon as COUNTER_FLUSH_THRESHOLD events are pending.
+COUNTER_FLUSH_INTERVAL = float(os.getenv('COUNTER_FLUSH_INTERVAL', '5'))
+COUNTER_FLUSH_THRESHOLD = int(os.getenv('COUNTER_FLUSH_THRESHOLD', '1000'))
+
+# Metrics settings
+# Server-Timing exposes query counts and timings to every client, so it is only
+# on by default in development.
+METRICS_SERVER_TIMING = os.getenv('METRICS_SERVER_TIMING', 'False') == 'True'
+# Workers export their metrics to METRICS_DIR so /metrics/ can aggregate them;
+# leave it empty to report the serving process only.
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_WRITE_INTERVAL = float(os.getenv('METRICS_WRITE_INTERVAL', '5'))
 
 # Security settings
 CSRF_TRUSTED_ORIGINS = os.getenv('CSRF_TRUSTED_ORIGINS', '').split(',')
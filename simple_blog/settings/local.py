@@ -15,3 +15,9 @@ SESSION_COOKIE_SECURE = False
 SESSION_COOKIE_HTTPONLY = True
 
 SECURE_SSL_REDIRECT = False
+
+# runserver is a single process, so its locmem cache is shared by every request.
+CACHE_IS_SHARED = True
+RESPONSE_CACHE_ENABLED = True
+
+METRICS_SERVER_TIMING = True
@@ -21,6 +21,7 @@ from django.contrib import admin
 from django.urls import include, path
 
 from simple_blog.health import health_check
+from simple_blog.metrics import metrics
 
 urlpatterns = [
     path(
@@ -35,8 +36,9 @@ urlpatterns = [
     ),
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health_check'),
+    path('metrics/', metrics, name='metrics'),
 ]
 
+# Static files only: media is served by the access-checked download views.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
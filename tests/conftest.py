@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from django.test import Client
 from pytest_factoryboy import register
 
@@ -70,3 +71,10 @@ def logged_author_client(author_factory, csrf_client):
     csrf_token = response.cookies['csrftoken'].value
     csrf_client.defaults['HTTP_X_CSRFTOKEN'] = csrf_token
     return csrf_client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
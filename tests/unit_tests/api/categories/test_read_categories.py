@@ -38,6 +38,38 @@ def test_get_category_list_server_error(db, monkeypatch, client, fake_method_fac
     assert expected in response_data.get('errors')
 
 
+def test_get_category_list_by_search_prefix(db, client, category_factory):
+    url = reverse('category-list')
+    category_factory.create(name='Éclairs')
+    category_factory.create(name='Eclipse')
+    category_factory.create(name='Baking')
+
+    response = client.get(url, {'search': 'ecl'})
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert sorted(item['attributes']['name'] for item in response_data['data']) == [
+        'Eclipse',
+        'Éclairs',
+    ]
+
+
+def test_get_category_list_invalid_search(db, client):
+    url = reverse('category-list')
+
+    response = client.get(url, {'search': 'invalid@search'})
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='Invalid search query format.',
+        status=400,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data.get('errors')
+
+
 def test_get_single_category(db, client, category_factory, post_factory):
     category = category_factory.create(
         name='Test Category', description='fake category description'
@@ -94,3 +126,17 @@ def test_get_single_category_server_error(
 
     assert response.status_code == 500
     assert expected in response_data.get('errors')
+
+
+def test_get_category_list_conditional_etag(db, client, category_factory):
+    category = category_factory.create()
+    url = reverse('category-list')
+
+    etag = client.get(url)['ETag']
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    category.description = 'Updated description'
+    category.save()
+    modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
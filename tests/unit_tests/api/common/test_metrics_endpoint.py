@@ -0,0 +1,118 @@
+import json
+import re
+
+import pytest
+from django.core.files import File
+from django.urls import reverse
+
+from apps.users.models import Author
+from apps.utils.metrics import MetricsRegistry, registry, write_export
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def get_sample(body, sample):
+    match = re.search(rf'^{re.escape(sample)} (\S+)$', body, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_prometheus_format(db, client, post_factory):
+    post = post_factory.create(status='published')
+    client.get(reverse('post-list'))
+    client.get(reverse('post-detail', kwargs={'slug': post.slug}))
+    client.get(reverse('post-detail', kwargs={'slug': post.slug}))
+
+    response = client.get(reverse('metrics'))
+    body = response.content.decode()
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert '# TYPE simple_blog_http_request_duration_seconds histogram' in body
+    assert '# TYPE simple_blog_http_requests_total counter' in body
+    assert (
+        get_sample(
+            body,
+            'simple_blog_http_requests_total'
+            '{method="GET",status="200",view="post-detail"}',
+        )
+        == 2
+    )
+    assert (
+        get_sample(
+            body,
+            'simple_blog_http_request_duration_seconds_bucket'
+            '{view="post-list",le="+Inf"}',
+        )
+        == 1
+    )
+    assert (
+        get_sample(
+            body,
+            'simple_blog_response_cache_requests_total{namespace="posts",result="hit"}',
+        )
+        == 1
+    )
+
+
+def test_metrics_aggregates_worker_exports(db, client, settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    other_worker = MetricsRegistry()
+    other_worker.observe('tag-list', {'db_queries': 3})
+    other_worker.increment('media_upload_bytes_total', {'type': 'image'}, 1024)
+    (tmp_path / '1.json').write_text(json.dumps(other_worker.export()))
+    (tmp_path / '2.json').write_text('{"histograms": [')
+    registry.observe('tag-list', {'db_queries': 1})
+    registry.increment('media_upload_bytes_total', {'type': 'image'}, 512)
+
+    body = client.get(reverse('metrics')).content.decode()
+
+    assert (
+        get_sample(body, 'simple_blog_http_request_db_queries_count{view="tag-list"}')
+        == 2
+    )
+    assert (
+        get_sample(body, 'simple_blog_http_request_db_queries_sum{view="tag-list"}')
+        == 4
+    )
+    assert (
+        get_sample(body, 'simple_blog_media_upload_bytes_total{type="image"}') == 1536
+    )
+
+
+def test_metrics_write_export(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path / 'metrics')
+    registry.increment('http_requests_total', {'view': 'tag-list'})
+
+    write_export()
+
+    [path] = (tmp_path / 'metrics').glob('*.json')
+    assert json.loads(path.read_text()) == registry.export()
+
+
+def test_metrics_method_not_allowed(client):
+    response = client.post(reverse('metrics'))
+
+    assert response.status_code == 405
+
+
+def test_metrics_counts_uploads(
+    db, logged_author_client, post_factory, clean_media_dir
+):
+    post = post_factory.create(author=Author.objects.first())
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+    with open('tests/mock_data/alpaca.png', 'rb') as file:
+        size = len(file.read())
+        file.seek(0)
+        logged_author_client.post(path=url, data={'files': File(file)})
+
+    body = logged_author_client.get(reverse('metrics')).content.decode()
+
+    assert get_sample(body, 'simple_blog_media_uploads_total{type="image"}') == 1
+    assert (
+        get_sample(body, 'simple_blog_media_upload_bytes_total{type="image"}') == size
+    )
@@ -1,3 +1,5 @@
+import json
+
 from django.urls import reverse
 
 from tests.unit_tests.api.conftest import build_expected_error
@@ -9,7 +11,7 @@ def test_get_media_files(db, logged_admin_client, media_file_factory):
     media_file_factory.create_batch(2)
 
     response = logged_admin_client.get(url)
-    response_data = response.json()
+    response_data = json.loads(response.getvalue())
 
     assert response.status_code == 200
     assert len(response_data['data']) == 2
@@ -91,3 +93,15 @@ def test_get_media_file_generic_error(
 
     assert response.status_code == 500
     assert expected in response_data['errors']
+
+
+def test_get_media_file_sparse_fieldset(db, logged_admin_client, media_file_factory):
+    media_file = media_file_factory.create()
+    url = reverse('media-detail', kwargs={'id': media_file.id})
+
+    response = logged_admin_client.get(url, {'fields[media_files]': 'size,type'})
+    data = response.json()['data']
+
+    assert response.status_code == 200
+    assert data['attributes'] == {'size': media_file.size, 'type': media_file.type}
+    assert data['relationships'] == {}
@@ -0,0 +1,265 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.content.models import Post, PostStatistics
+from apps.users.models import Author
+from tests.unit_tests.api.conftest import build_expected_error
+
+
+def post_operations(client, operations):
+    return client.post(
+        path=reverse('post-operations'),
+        data=json.dumps({'atomic:operations': operations}),
+        content_type='application/json',
+    )
+
+
+def add_operation(index, category='bulk-category', tags=()):
+    return {
+        'op': 'add',
+        'data': {
+            'title': f'Bulk post {index}',
+            'content': f'Content of bulk post {index}.',
+            'category': category,
+            'tags': list(tags),
+        },
+    }
+
+
+def test_bulk_add_posts(db, logged_author_client, category_factory, tag_factory):
+    category_factory.create(name='Bulk Category')
+    tags = [tag_factory.create(name=name) for name in ('First tag', 'Second tag')]
+
+    response = post_operations(
+        logged_author_client,
+        [add_operation(index, tags=[tag.slug for tag in tags]) for index in range(3)],
+    )
+    results = response.json()['atomic:results']
+
+    assert response.status_code == 200
+    assert [result['data']['attributes']['slug'] for result in results] == [
+        f'bulk-post-{index}' for index in range(3)
+    ]
+    posts = Post.objects.filter(slug__startswith='bulk-post-')
+    assert posts.count() == 3
+    assert PostStatistics.objects.filter(post__in=posts).count() == 3
+    for post in posts:
+        assert post.status == Post.Status.DRAFT
+        assert post.author.username == 'test_author'
+        assert set(post.tags.all()) == set(tags)
+
+
+def test_bulk_update_posts(
+    db, logged_author_client, post_factory, category_factory, tag_factory
+):
+    author = Author.objects.get(username='test_author')
+    posts = post_factory.create_batch(2, author=author)
+    new_category = category_factory.create(name='Updated Category')
+    new_tag = tag_factory.create(name='Updated Tag')
+
+    response = post_operations(
+        logged_author_client,
+        [
+            {
+                'op': 'update',
+                'ref': {'type': 'posts', 'id': str(posts[0].id)},
+                'data': {
+                    'title': 'Updated title',
+                    'category': new_category.slug,
+                    'tags': [new_tag.slug],
+                },
+            },
+            {
+                'op': 'update',
+                'ref': {'type': 'posts', 'id': str(posts[1].id)},
+                'data': {'status': 'published'},
+            },
+        ],
+    )
+
+    assert response.status_code == 200
+    first, second = (Post.objects.get(id=post.id) for post in posts)
+    assert first.slug == 'updated-title'
+    assert first.category == new_category
+    assert list(first.tags.all()) == [new_tag]
+    assert first.updated_at > posts[0].updated_at
+    assert second.status == Post.Status.PUBLISHED
+    assert set(second.tags.all()) == set(posts[1].tags.all())
+
+
+def test_bulk_reports_errors_per_operation(
+    db, logged_author_client, category_factory, post_factory
+):
+    category_factory.create(name='Bulk Category')
+    existing = post_factory.create(title='Taken title')
+
+    response = post_operations(
+        logged_author_client,
+        [
+            add_operation(0),
+            add_operation(1, category='missing-category'),
+            {'op': 'add', 'data': {**add_operation(2)['data'], 'title': 'Taken title'}},
+            add_operation(3, tags=['missing-tag']),
+            {'op': 'add', 'data': {**add_operation(4)['data'], 'content': ''}},
+            {'op': 'remove', 'data': {}},
+            {'op': 'update', 'ref': {'type': 'posts', 'id': '0'}, 'data': {}},
+        ],
+    )
+    errors = {
+        error['meta']['field']: error['detail'] for error in response.json()['errors']
+    }
+
+    assert response.status_code == 400
+    assert errors == {
+        '/atomic:operations/1/data/category': 'No Category matches the given query.',
+        '/atomic:operations/2/data/title': 'Post with this Slug already exists.',
+        '/atomic:operations/3/data/tags': (
+            'The following tags were not found: missing-tag.'
+        ),
+        '/atomic:operations/4/data/content': 'This field cannot be blank.',
+        '/atomic:operations/5/op': "Operation must be 'add' or 'update'.",
+        '/atomic:operations/6/ref': 'No Post matches the given query.',
+    }
+    assert list(Post.objects.all()) == [existing]
+
+
+def test_bulk_rejects_duplicate_titles_in_batch(
+    db, logged_author_client, category_factory
+):
+    category_factory.create(name='Bulk Category')
+
+    response = post_operations(
+        logged_author_client, [add_operation(0), add_operation(0)]
+    )
+
+    assert response.status_code == 400
+    assert response.json()['errors'][0]['meta']['field'] == (
+        '/atomic:operations/1/data/title'
+    )
+    assert not Post.objects.exists()
+
+
+@pytest.mark.parametrize(
+    'titles, added_title, invalid_indexes',
+    [
+        # Two posts swapping titles.
+        (('Second title', 'First title'), None, [0, 1]),
+        # A new post taking the title a renamed post gives up.
+        (('Renamed title', 'Second title'), 'First title', [2]),
+    ],
+)
+def test_bulk_rejects_slugs_released_in_batch(
+    db,
+    logged_author_client,
+    category_factory,
+    post_factory,
+    titles,
+    added_title,
+    invalid_indexes,
+):
+    category_factory.create(name='Bulk Category')
+    author = Author.objects.get(username='test_author')
+    posts = [
+        post_factory.create(author=author, title=title)
+        for title in ('First title', 'Second title')
+    ]
+    operations = [
+        {
+            'op': 'update',
+            'ref': {'type': 'posts', 'id': str(post.id)},
+            'data': {'title': title},
+        }
+        for post, title in zip(posts, titles)
+    ]
+    if added_title:
+        operations.append(
+            {'op': 'add', 'data': {**add_operation(0)['data'], 'title': added_title}}
+        )
+
+    response = post_operations(logged_author_client, operations)
+    errors = {
+        error['meta']['field']: error['detail'] for error in response.json()['errors']
+    }
+
+    assert response.status_code == 400
+    assert errors == {
+        f'/atomic:operations/{index}/data/title': 'Post with this Slug already exists.'
+        for index in invalid_indexes
+    }
+    assert [Post.objects.get(id=post.id).slug for post in posts] == [
+        'first-title',
+        'second-title',
+    ]
+    assert Post.objects.count() == 2
+
+
+def test_bulk_update_other_authors_post(db, logged_author_client, post_factory):
+    post = post_factory.create()
+
+    response = post_operations(
+        logged_author_client,
+        [
+            {
+                'op': 'update',
+                'ref': {'type': 'posts', 'id': str(post.id)},
+                'data': {'content': 'Updated content'},
+            }
+        ],
+    )
+
+    assert response.status_code == 403
+    assert Post.objects.get(id=post.id).content == post.content
+
+
+def test_bulk_too_many_operations(db, logged_author_client, settings):
+    settings.BULK_MAX_OPERATIONS = 2
+
+    response = post_operations(
+        logged_author_client, [add_operation(index) for index in range(3)]
+    )
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='At most 2 operations are allowed per request.',
+        meta=response_data['errors'][0]['meta'],
+    )
+    assert response.status_code == 400
+    assert expected in response_data['errors']
+
+
+def test_bulk_unauthenticated(db, client):
+    response = post_operations(client, [add_operation(0)])
+
+    assert response.status_code == 401
+
+
+def test_bulk_query_count_does_not_grow_with_batch(
+    db, logged_author_client, category_factory, tag_factory, settings
+):
+    settings.BULK_BATCH_SIZE = 500
+    category_factory.create(name='Bulk Category')
+    tags = [tag_factory.create(name=name) for name in ('First tag', 'Second tag')]
+    tag_slugs = [tag.slug for tag in tags]
+    # Loads the slug maps.
+    post_operations(logged_author_client, [add_operation(0, tags=tag_slugs)])
+
+    with CaptureQueriesContext(connection) as small_batch:
+        response = post_operations(
+            logged_author_client,
+            [add_operation(index, tags=tag_slugs) for index in range(1, 6)],
+        )
+    assert response.status_code == 200
+
+    with CaptureQueriesContext(connection) as large_batch:
+        response = post_operations(
+            logged_author_client,
+            [add_operation(index, tags=tag_slugs) for index in range(6, 96)],
+        )
+    assert response.status_code == 200
+
+    assert len(large_batch) == len(small_batch)
+    assert Post.tags.through.objects.count() == 96 * len(tags)
@@ -1,8 +1,15 @@
+import hashlib
+from pathlib import Path
+
 import pytest
+from django.conf import settings
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from apps.media_files.models import MediaBlob, MediaFile
 from apps.users.models import Author
 from tests.unit_tests.api.conftest import build_expected_error
 
@@ -69,7 +76,7 @@ def test_post_post_media_generic_exception(
     url = reverse('post-media-list', kwargs={'slug': post.slug})
 
     monkeypatch.setattr(
-        'apps.content.views.posts.media.MediaFile.save',
+        'apps.content.views.posts.media.save_media_files',
         fake_method_factory(raise_exception=Exception('Something went wrong')),
     )
 
@@ -120,3 +127,136 @@ def test_post_post_media_validation_errors(
 
     assert response.status_code == 400
     assert expected in response_data['errors']
+
+
+def build_uploads(names):
+    content = Path('tests/mock_data/alpaca.png').read_bytes()
+    return [SimpleUploadedFile(name=name, content=content) for name in names]
+
+
+def test_post_post_media_batch(db, logged_author_client, post_factory, clean_media_dir):
+    post = post_factory.create(author=Author.objects.all().first())
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+    names = [f'photo-{index}.png' for index in range(5)]
+
+    response = logged_author_client.post(
+        path=url, data={'files': build_uploads(names)}, format='multipart/form-data'
+    )
+    response_data = response.json()
+
+    assert response.status_code == 201
+    assert [item['attributes']['name'] for item in response_data['data']] == names
+    media_files = MediaFile.objects.filter(post=post)
+    assert media_files.count() == 5
+    for media_file in media_files:
+        assert media_file.type == MediaFile.Type.IMAGE
+        assert media_file.width > 0 and media_file.height > 0
+        assert media_file.file.storage.exists(media_file.file.name)
+
+
+def test_post_post_media_batch_query_count(
+    db, logged_author_client, post_factory, clean_media_dir
+):
+    post = post_factory.create(author=Author.objects.all().first())
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+
+    with CaptureQueriesContext(connection) as small_batch:
+        logged_author_client.post(
+            path=url, data={'files': build_uploads(['a.png'])}, format='multipart'
+        )
+    with CaptureQueriesContext(connection) as large_batch:
+        logged_author_client.post(
+            path=url,
+            data={'files': build_uploads([f'b-{index}.png' for index in range(10)])},
+            format='multipart',
+        )
+
+    assert len(large_batch) == len(small_batch)
+    assert MediaFile.objects.filter(post=post).count() == 11
+
+
+@pytest.mark.parametrize(
+    'names, existing, invalid_name',
+    [
+        (['first.png', 'second.png', 'first.png'], [], 'first.png'),
+        (['first.png', 'second.png'], ['second.png'], 'second.png'),
+    ],
+)
+def test_post_post_media_batch_duplicate_names(
+    db,
+    logged_author_client,
+    post_factory,
+    media_file_factory,
+    clean_media_dir,
+    names,
+    existing,
+    invalid_name,
+):
+    post = post_factory.create(author=Author.objects.all().first())
+    for upload in build_uploads(existing):
+        media_file_factory.create(post=post, file=upload)
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+
+    response = logged_author_client.post(
+        path=url, data={'files': build_uploads(names)}, format='multipart/form-data'
+    )
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail=f"A file with name '{invalid_name}' already exists for this post.",
+        status=400,
+        meta=response_data['errors'][0]['meta'],
+    )
+    assert response.status_code == 400
+    assert expected in response_data['errors']
+    assert MediaFile.objects.filter(post=post).count() == len(existing)
+
+
+def test_post_post_media_batch_invalid_image_stores_nothing(
+    db, logged_author_client, post_factory, clean_media_dir
+):
+    post = post_factory.create(author=Author.objects.all().first())
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+    files = [
+        *build_uploads(['valid.png']),
+        SimpleUploadedFile(name='broken.png', content=b'not an image'),
+    ]
+
+    response = logged_author_client.post(
+        path=url, data={'files': files}, format='multipart/form-data'
+    )
+
+    assert response.status_code == 400
+    assert response.json()['errors'][0]['meta']['field'] == 'broken.png'
+    assert not MediaFile.objects.filter(post=post).exists()
+    assert not MediaBlob.objects.exists()
+    assert not list((Path(settings.MEDIA_ROOT) / 'image').rglob('*.png'))
+
+
+def test_post_post_media_stores_identical_content_once(
+    db, logged_author_client, post_factory, clean_media_dir, monkeypatch
+):
+    author = Author.objects.all().first()
+    posts = post_factory.create_batch(2, author=author)
+    content = Path('tests/mock_data/alpaca.png').read_bytes()
+    content_hash = hashlib.sha256(content).hexdigest()
+    # The upload handlers hash the files as they are received.
+    monkeypatch.setattr('apps.media_files.uploads.hash_file', None)
+
+    for post, names in zip(posts, [['a.png', 'b.png'], ['c.png']]):
+        response = logged_author_client.post(
+            path=reverse('post-media-list', kwargs={'slug': post.slug}),
+            data={'files': build_uploads(names)},
+            format='multipart/form-data',
+        )
+        assert response.status_code == 201
+
+    blob = MediaBlob.objects.get()
+    assert (blob.hash, blob.ref_count, blob.size) == (content_hash, 3, len(content))
+    assert blob.file.name == f'image/{content_hash[:2]}/{content_hash}.png'
+    assert set(MediaFile.objects.values_list('file', 'content_hash')) == {
+        (blob.file.name, content_hash)
+    }
+    assert [path.name for path in Path(settings.MEDIA_ROOT).rglob('*.png')] == [
+        f'{content_hash}.png'
+    ]
@@ -22,6 +22,28 @@ def test_post_post_success(db, logged_author_client, category_factory, tag_facto
     assert response.status_code == 201
 
 
+def test_post_post_with_tags(db, logged_author_client, category_factory, tag_factory):
+    category_factory.create(name='Test Category')
+    tags = [tag_factory.create(name=name) for name in ('First tag', 'Second tag')]
+    url = reverse('post-list')
+    payload = {
+        'title': 'Test Post Title',
+        'content': 'This is the content of the test post.',
+        'category': 'test-category',
+        'tags': [tag.slug for tag in tags],
+    }
+
+    response = logged_author_client.post(
+        path=url, data=json.dumps(payload), content_type='application/json'
+    )
+    relationships = response.json()['data']['relationships']
+
+    assert response.status_code == 201
+    assert {item['id'] for item in relationships['tags']['data']} == {
+        str(tag.id) for tag in tags
+    }
+
+
 @pytest.mark.parametrize(
     'payload, detailed_error',
     [
@@ -1,5 +1,9 @@
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
+from apps.media_files.models import MediaBlob, MediaFile
 from apps.users.models import Admin
 from tests.unit_tests.api.conftest import build_expected_error
 
@@ -83,3 +87,37 @@ def test_delete_post_media_generic_exception(
 
     assert response.status_code == 500
     assert expected in response_data.get('errors')
+
+
+def test_delete_post_media_keeps_shared_content(
+    db,
+    logged_admin_client,
+    post_factory,
+    clean_media_dir,
+    django_capture_on_commit_callbacks,
+):
+    post = post_factory.create(author=Admin.objects.all().first())
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+    content = Path('tests/mock_data/alpaca.png').read_bytes()
+    uploads = [SimpleUploadedFile(name, content) for name in ('a.png', 'b.png')]
+    logged_admin_client.post(path=url, data={'files': uploads}, format='multipart')
+    first, second = MediaFile.objects.filter(post=post)
+    blob = MediaBlob.objects.get()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = logged_admin_client.delete(
+            reverse('post-media-detail', kwargs={'slug': post.slug, 'id': first.id})
+        )
+
+    assert response.status_code == 204
+    blob.refresh_from_db()
+    assert blob.ref_count == 1
+    assert blob.file.storage.exists(blob.file.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        logged_admin_client.delete(
+            reverse('post-media-detail', kwargs={'slug': post.slug, 'id': second.id})
+        )
+
+    assert not MediaBlob.objects.exists()
+    assert not blob.file.storage.exists(blob.file.name)
@@ -0,0 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from apps.content.models import Post
+from apps.media_files.uploads import save_media_files
+from apps.media_files.variants import claim_jobs, run_jobs
+from apps.users.models import Author
+
+CONTENT = Path('tests/mock_data/alpaca.png').read_bytes()
+
+
+@pytest.fixture
+def draft_media_file(db, logged_author_client, post_factory, clean_media_dir):
+    post = post_factory.create(
+        author=Author.objects.all().first(), status=Post.Status.DRAFT
+    )
+    (media_file,) = save_media_files(post, [SimpleUploadedFile('alpaca.png', CONTENT)])
+    return media_file
+
+
+def download_url(media_file):
+    return reverse(
+        'post-media-download',
+        kwargs={'slug': media_file.post.slug, 'id': media_file.id},
+    )
+
+
+def test_download_draft_media(db, logged_author_client, draft_media_file):
+    response = logged_author_client.get(download_url(draft_media_file))
+
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == CONTENT
+    assert response['Content-Type'] == 'image/png'
+    assert response['Content-Length'] == str(len(CONTENT))
+    assert response['Accept-Ranges'] == 'bytes'
+    assert response['Cache-Control'] == 'private'
+    assert response['ETag'] == f'"{draft_media_file.content_hash}"'
+    assert 'filename="alpaca.png"' in response['Content-Disposition']
+
+
+def test_download_draft_media_forbidden(db, client, draft_media_file):
+    response = client.get(download_url(draft_media_file))
+
+    assert response.status_code == 403
+
+
+def test_download_public_media(db, client, media_file_factory, post_factory):
+    media_file = media_file_factory.create(
+        post=post_factory.create(status=Post.Status.PUBLISHED)
+    )
+
+    response = client.get(download_url(media_file))
+
+    assert response.status_code == 200
+    with media_file.file.open('rb') as f:
+        assert b''.join(response.streaming_content) == f.read()
+    assert 'Cache-Control' not in response
+
+
+def test_download_public_media_of_another_author(
+    db, logged_author_client, media_file_factory, post_factory, author_factory
+):
+    post = post_factory.create(
+        author=author_factory.create(username='other'), status=Post.Status.PUBLISHED
+    )
+    media_file = media_file_factory.create(post=post)
+
+    response = logged_author_client.get(download_url(media_file))
+
+    assert response.status_code == 200
+    assert 'Cache-Control' not in response
+
+
+def test_download_draft_media_of_another_author_forbidden(
+    db, logged_author_client, media_file_factory, post_factory, author_factory
+):
+    post = post_factory.create(
+        author=author_factory.create(username='other'), status=Post.Status.DRAFT
+    )
+    media_file = media_file_factory.create(post=post)
+
+    response = logged_author_client.get(download_url(media_file))
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize(
+    'header, start, end',
+    [
+        ('bytes=0-99', 0, 99),
+        ('bytes=100-', 100, len(CONTENT) - 1),
+        ('bytes=-10', len(CONTENT) - 10, len(CONTENT) - 1),
+        (f'bytes=50-{len(CONTENT) + 100}', 50, len(CONTENT) - 1),
+    ],
+)
+def test_download_media_range(
+    db, logged_author_client, draft_media_file, header, start, end
+):
+    response = logged_author_client.get(
+        download_url(draft_media_file), headers={'Range': header}
+    )
+
+    assert response.status_code == 206
+    assert b''.join(response.streaming_content) == CONTENT[start : end + 1]
+    assert response['Content-Length'] == str(end - start + 1)
+    assert response['Content-Range'] == f'bytes {start}-{end}/{len(CONTENT)}'
+
+
+def test_download_media_range_not_satisfiable(
+    db, logged_author_client, draft_media_file
+):
+    response = logged_author_client.get(
+        download_url(draft_media_file), headers={'Range': f'bytes={len(CONTENT)}-'}
+    )
+
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+@pytest.mark.parametrize(
+    'if_range, status', [(None, 206), ('"stale"', 200), ('current', 206)]
+)
+def test_download_media_if_range(
+    db, logged_author_client, draft_media_file, if_range, status
+):
+    headers = {'Range': 'bytes=0-9'}
+    if if_range == 'current':
+        headers['If-Range'] = f'"{draft_media_file.content_hash}"'
+    elif if_range:
+        headers['If-Range'] = if_range
+
+    response = logged_author_client.get(download_url(draft_media_file), headers=headers)
+
+    assert response.status_code == status
+
+
+def test_download_media_not_modified(db, logged_author_client, draft_media_file):
+    response = logged_author_client.get(
+        download_url(draft_media_file),
+        headers={'If-None-Match': f'"{draft_media_file.content_hash}"'},
+    )
+
+    assert response.status_code == 304
+
+
+def test_download_media_with_accel_redirect(
+    db, logged_author_client, draft_media_file, settings
+):
+    settings.MEDIA_ACCEL_REDIRECT_LOCATION = '/protected-media/'
+
+    response = logged_author_client.get(download_url(draft_media_file))
+
+    assert response.status_code == 200
+    assert response.content == b''
+    assert response['X-Accel-Redirect'] == (
+        f'/protected-media/{draft_media_file.file.name}'
+    )
+    assert response['Content-Type'] == 'image/png'
+    assert response['Cache-Control'] == 'private'
+
+
+def test_media_file_attribute_is_download_url(
+    db, logged_author_client, draft_media_file
+):
+    url = reverse(
+        'post-media-detail',
+        kwargs={'slug': draft_media_file.post.slug, 'id': draft_media_file.id},
+    )
+
+    attributes = logged_author_client.get(url).json()['data']['attributes']
+
+    assert attributes['file'] == download_url(draft_media_file)
+    media_url = f'/media/{draft_media_file.file.name}'
+    assert logged_author_client.get(media_url).status_code == 404
+
+
+def test_download_media_variant(
+    db, client, logged_author_client, draft_media_file, settings
+):
+    settings.MEDIA_VARIANT_WIDTHS = [320]
+    with ThreadPoolExecutor() as executor:
+        run_jobs(executor, claim_jobs(10))
+    url = reverse(
+        'post-media-variant-download',
+        kwargs={
+            'slug': draft_media_file.post.slug,
+            'id': draft_media_file.id,
+            'width': 320,
+            'format': 'webp',
+        },
+    )
+
+    response = logged_author_client.get(url)
+
+    assert response.status_code == 200
+    variant = draft_media_file.variants.get(format='webp', width=320)
+    with variant.file.open('rb') as f:
+        assert b''.join(response.streaming_content) == f.read()
+    assert response['Cache-Control'] == 'private'
+    assert client.get(url).status_code == 403
+    assert logged_author_client.get(url.replace('320', '321')).status_code == 404
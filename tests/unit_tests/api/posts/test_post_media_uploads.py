@@ -0,0 +1,198 @@
+import io
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.http import UnreadablePostError
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.media_files.models import MediaFile, MediaUpload
+from apps.media_files.resumable import append_chunk
+from apps.users.models import Author
+from tests.unit_tests.api.conftest import build_expected_error
+
+CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'
+CONTENT = Path('tests/mock_data/alpaca.png').read_bytes()
+
+
+@pytest.fixture(autouse=True)
+def upload_session_dir(settings, tmp_path):
+    settings.MEDIA_UPLOAD_SESSION_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def post(db, post_factory):
+    return post_factory.create(author=Author.objects.all().first())
+
+
+def create_upload(client, post, **data):
+    return client.post(
+        path=reverse('post-media-upload-list', kwargs={'slug': post.slug}),
+        data={'name': 'alpaca.png', 'size': len(CONTENT), **data},
+        content_type='application/json',
+    )
+
+
+def send_chunk(client, url, offset, chunk):
+    return client.patch(
+        url,
+        data=chunk,
+        content_type=CHUNK_CONTENT_TYPE,
+        headers={'Upload-Offset': str(offset)},
+    )
+
+
+def test_upload_media_in_chunks(db, logged_author_client, post, clean_media_dir):
+    response = create_upload(logged_author_client, post)
+    assert response.status_code == 201
+    url = response['Location']
+    assert response.json()['data']['attributes']['offset'] == 0
+
+    chunk_size = len(CONTENT) // 3 + 1
+    for offset in range(0, len(CONTENT), chunk_size):
+        assert int(logged_author_client.head(url)['Upload-Offset']) == offset
+        response = send_chunk(
+            logged_author_client, url, offset, CONTENT[offset : offset + chunk_size]
+        )
+
+    assert response.status_code == 201
+    assert response['Upload-Offset'] == str(len(CONTENT))
+    data = response.json()['data']
+    assert data['attributes']['name'] == 'alpaca.png'
+    media_file = MediaFile.objects.get(id=data['id'], post=post)
+    assert (media_file.size, media_file.type) == (len(CONTENT), MediaFile.Type.IMAGE)
+    assert media_file.width > 0 and media_file.height > 0
+    with media_file.file.open('rb') as f:
+        assert f.read() == CONTENT
+    assert not MediaUpload.objects.exists()
+    assert logged_author_client.head(url).status_code == 404
+
+
+def test_upload_chunk_offset_conflict(db, logged_author_client, post):
+    url = create_upload(logged_author_client, post)['Location']
+    send_chunk(logged_author_client, url, 0, CONTENT[:100])
+
+    response = send_chunk(logged_author_client, url, 0, CONTENT[:100])
+    response_data = response.json()
+
+    expected = build_expected_error(
+        status=409,
+        title='Conflict',
+        detail='Upload-Offset 0 does not match the upload offset 100.',
+        meta=response_data['errors'][0]['meta'],
+    )
+    assert response.status_code == 409
+    assert expected in response_data['errors']
+    assert MediaUpload.objects.get().offset == 100
+
+
+def test_upload_keeps_bytes_received_before_disconnect(db, logged_author_client, post):
+    url = create_upload(logged_author_client, post)['Location']
+    upload = MediaUpload.objects.get()
+
+    class Disconnecting(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() >= 1000:
+                raise UnreadablePostError('Connection reset')
+            return super().read(min(size, 500))
+
+    assert append_chunk(upload, 0, Disconnecting(CONTENT), len(CONTENT)) == 1000
+
+    response = logged_author_client.get(url)
+    assert response['Upload-Offset'] == '1000'
+    assert response.json()['data']['attributes']['offset'] == 1000
+    response = send_chunk(logged_author_client, url, 1000, CONTENT[1000:])
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize(
+    'data, field, detail',
+    [
+        ({'name': 'notes.txt'}, 'name', 'Invalid file type: .txt is not allowed.'),
+        ({'size': 0}, 'size', 'Size must be a positive integer.'),
+        ({'size': 10**12}, 'size', 'Size must not exceed 1000 bytes.'),
+        ({'extra': True}, 'extra', 'This field is not allowed.'),
+    ],
+)
+def test_create_upload_validation_errors(
+    db, logged_author_client, post, settings, data, field, detail
+):
+    settings.MEDIA_UPLOAD_MAX_SIZE = 1000
+
+    response = create_upload(logged_author_client, post, **data)
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data['errors'][0]['meta']['field'] == field
+    assert response_data['errors'][0]['detail'] == detail
+    assert not MediaUpload.objects.exists()
+
+
+@pytest.mark.parametrize(
+    'content_type, max_chunk_size, status',
+    [
+        ('application/octet-stream', 1000, 415),
+        (CHUNK_CONTENT_TYPE, 99, 413),
+    ],
+)
+def test_upload_chunk_rejected(
+    db, logged_author_client, post, settings, content_type, max_chunk_size, status
+):
+    settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE = max_chunk_size
+    url = create_upload(logged_author_client, post)['Location']
+
+    response = logged_author_client.patch(
+        url,
+        data=CONTENT[:100],
+        content_type=content_type,
+        headers={'Upload-Offset': '0'},
+    )
+
+    assert response.status_code == status
+    assert MediaUpload.objects.get().offset == 0
+
+
+def test_upload_of_another_author_forbidden(
+    db, logged_author_client, post_factory, author_factory
+):
+    post = post_factory.create(author=author_factory.create(username='other'))
+
+    response = create_upload(logged_author_client, post)
+
+    assert response.status_code == 403
+    assert not MediaUpload.objects.exists()
+
+
+def test_delete_upload(db, logged_author_client, post, upload_session_dir):
+    url = create_upload(logged_author_client, post)['Location']
+    send_chunk(logged_author_client, url, 0, CONTENT[:100])
+
+    response = logged_author_client.delete(url)
+
+    assert response.status_code == 204
+    assert not MediaUpload.objects.exists()
+    assert not list(upload_session_dir.iterdir())
+
+
+def test_clear_media_uploads_command(
+    db, logged_author_client, post, settings, upload_session_dir
+):
+    url = create_upload(logged_author_client, post)['Location']
+    create_upload(logged_author_client, post, name='other.png')
+    expired = timezone.now() - timedelta(seconds=settings.MEDIA_UPLOAD_EXPIRY + 1)
+    MediaUpload.objects.filter(name='alpaca.png').update(updated_at=expired)
+    orphan = upload_session_dir / 'orphan.part'
+    orphan.touch()
+    os.utime(orphan, (expired.timestamp(), expired.timestamp()))
+
+    call_command('clear_media_uploads')
+
+    assert list(MediaUpload.objects.values_list('name', flat=True)) == ['other.png']
+    assert [path.name for path in upload_session_dir.iterdir()] == [
+        f'{MediaUpload.objects.get().id}.part'
+    ]
+    assert logged_author_client.head(url).status_code == 404
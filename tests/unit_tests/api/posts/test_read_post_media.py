@@ -195,3 +195,18 @@ def test_get_post_media_item_generic_error(
 
     assert response.status_code == 500
     assert expected in response_data.get('errors')
+
+
+def test_get_post_media_conditional_etag(
+    db, client, logged_admin_client, post_factory, media_file_factory
+):
+    post = post_factory.create(status='published')
+    media_file_factory.create(post=post)
+    url = reverse('post-media-list', kwargs={'slug': post.slug})
+
+    etag = client.get(url)['ETag']
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    private = logged_admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert not_modified.status_code == 304
+    assert private.status_code == 200
@@ -1,5 +1,11 @@
+import base64
+import json
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.http import http_date
 
 from apps.users.models import Author
 from tests.unit_tests.api.conftest import build_expected_error
@@ -228,3 +234,617 @@ def test_get_post_generic_error(
 
     assert response.status_code == 500
     assert expected in response_data.get('errors')
+
+
+def test_get_posts_paginated_with_cursor_links(
+    db, client, post_factory, category_factory
+):
+    posts = post_factory.create_batch(
+        size=5, category=category_factory.create(), status='published'
+    )
+    expected_ids = [
+        str(post.id)
+        for post in sorted(posts, key=lambda p: (p.created_at, p.id), reverse=True)
+    ]
+    url = reverse('post-list')
+
+    first_page = client.get(url, {'page[size]': 2}).json()
+    second_page = client.get(first_page['links']['next']).json()
+    third_page = client.get(second_page['links']['next']).json()
+
+    assert [item['id'] for item in first_page['data']] == expected_ids[:2]
+    assert [item['id'] for item in second_page['data']] == expected_ids[2:4]
+    assert [item['id'] for item in third_page['data']] == expected_ids[4:]
+    assert first_page['links']['prev'] is None
+    assert third_page['links']['next'] is None
+    assert first_page['meta']['pagination']['has_next'] is True
+    assert third_page['meta']['pagination']['has_next'] is False
+
+
+def test_get_posts_paginated_backwards(db, client, post_factory, category_factory):
+    post_factory.create_batch(
+        size=5, category=category_factory.create(), status='published'
+    )
+    url = reverse('post-list')
+
+    first_page = client.get(url, {'page[size]': 2}).json()
+    second_page = client.get(first_page['links']['next']).json()
+    back_page = client.get(second_page['links']['prev']).json()
+
+    assert back_page['data'] == first_page['data']
+    assert back_page['links']['prev'] is None
+
+
+def test_get_posts_pagination_keeps_filters(db, client, post_factory, category_factory):
+    category = category_factory.create()
+    post_factory.create_batch(size=3, category=category, status='published')
+    post_factory.create_batch(
+        size=3, category=category_factory.create(), status='published'
+    )
+    url = reverse('post-list')
+
+    first_page = client.get(url, {'category': category.slug, 'page[size]': 2}).json()
+    second_page = client.get(first_page['links']['next']).json()
+
+    assert f'category={category.slug}' in first_page['links']['next']
+    assert len(second_page['data']) == 1
+
+
+def test_get_posts_default_page_size(
+    db, client, post_factory, category_factory, settings
+):
+    settings.DEFAULT_PAGE_SIZE = 3
+    post_factory.create_batch(
+        size=4, category=category_factory.create(), status='published'
+    )
+    url = reverse('post-list')
+
+    response_data = client.get(url).json()
+
+    assert len(response_data['data']) == 3
+    assert response_data['links']['next']
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    'params, expected_error_msg',
+    [
+        ({'page[size]': 0}, 'Page size must be an integer between 1 and 100.'),
+        ({'page[size]': 'abc'}, 'Page size must be an integer between 1 and 100.'),
+        ({'page[size]': 101}, 'Page size must be an integer between 1 and 100.'),
+        ({'page[after]': 'not-a-cursor'}, 'Invalid pagination cursor.'),
+        ({'page[after]': encode_cursor([5, 5])}, 'Invalid pagination cursor.'),
+        ({'page[after]': encode_cursor([{'a': 1}, 1])}, 'Invalid pagination cursor.'),
+        ({'page[before]': encode_cursor([None, 1])}, 'Invalid pagination cursor.'),
+        ({'page[after]': encode_cursor([True, 1])}, 'Invalid pagination cursor.'),
+        (
+            {'page[after]': 'WzFd', 'page[before]': 'WzFd'},
+            'page[after] and page[before] cannot be used together.',
+        ),
+    ],
+)
+def test_get_posts_invalid_pagination(db, client, params, expected_error_msg):
+    url = reverse('post-list')
+
+    response = client.get(url, params)
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail=expected_error_msg, status=400, meta=response_data['errors'][0]['meta']
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data.get('errors')
+
+
+def test_get_posts_query_count_does_not_grow_with_page_size(
+    db, client, post_factory, tag_factory, category_factory
+):
+    url = reverse('post-list')
+    post_factory.create_batch(
+        size=8,
+        category=category_factory.create(),
+        tags=tag_factory.create_batch(size=3),
+        status='published',
+    )
+
+    with CaptureQueriesContext(connection) as small_page:
+        client.get(url, {'page[size]': 2})
+    with CaptureQueriesContext(connection) as large_page:
+        client.get(url, {'page[size]': 8})
+
+    assert len(small_page.captured_queries) == len(large_page.captured_queries)
+
+
+def test_get_posts_search_in_content(db, client, post_factory, category_factory):
+    url = reverse('post-list')
+    category = category_factory.create()
+    post_factory.create(
+        title='First',
+        content='Notes about gardening',
+        category=category,
+        status='published',
+    )
+    post_factory.create(
+        title='Second', content='Unrelated', category=category, status='published'
+    )
+
+    title_only = client.get(url, {'search': 'gardening'})
+    with_content = client.get(
+        url, {'search': 'gardening', 'search_fields': 'title,content'}
+    ).json()
+
+    assert title_only.status_code == 404
+    assert [item['attributes']['title'] for item in with_content['data']] == ['First']
+
+
+def test_get_posts_search_ranks_title_matches_first(
+    db, client, post_factory, category_factory
+):
+    url = reverse('post-list')
+    category = category_factory.create()
+    post_factory.create(
+        title='Cooking basics',
+        content='python python python',
+        category=category,
+        status='published',
+    )
+    post_factory.create(
+        title='Python tips', content='Short', category=category, status='published'
+    )
+
+    response_data = client.get(
+        url, {'search': 'python', 'search_fields': 'title,content'}
+    ).json()
+
+    assert [item['attributes']['title'] for item in response_data['data']] == [
+        'Python tips',
+        'Cooking basics',
+    ]
+
+
+def test_get_posts_search_matches_prefixes_and_accents(
+    db, client, post_factory, category_factory
+):
+    url = reverse('post-list')
+    post_factory.create(
+        title='Café recipes', category=category_factory.create(), status='published'
+    )
+
+    response_data = client.get(url, {'search': 'cafe rec'}).json()
+
+    assert len(response_data['data']) == 1
+
+
+def test_get_posts_search_index_follows_updates_and_deletes(
+    db, client, post_factory, category_factory
+):
+    url = reverse('post-list')
+    category = category_factory.create()
+    post = post_factory.create(title='Old title', category=category, status='published')
+    removed = post_factory.create(
+        title='Removed title', category=category, status='published'
+    )
+
+    post.title = 'Brand new title'
+    post.save()
+    removed.delete()
+
+    assert client.get(url, {'search': 'old'}).status_code == 404
+    assert client.get(url, {'search': 'removed'}).status_code == 404
+    assert len(client.get(url, {'search': 'brand'}).json()['data']) == 1
+
+
+def test_get_posts_search_paginates_by_rank(db, client, post_factory, category_factory):
+    url = reverse('post-list')
+    category = category_factory.create()
+    for index in range(3):
+        post_factory.create(
+            title=f'Django {index}', category=category, status='published'
+        )
+
+    first_page = client.get(url, {'search': 'django', 'page[size]': 2}).json()
+    second_page = client.get(first_page['links']['next']).json()
+
+    ids = [item['id'] for item in first_page['data'] + second_page['data']]
+    assert len(set(ids)) == 3
+
+
+def test_get_posts_invalid_search_fields(db, client):
+    url = reverse('post-list')
+
+    response = client.get(url, {'search': 'django', 'search_fields': 'author'})
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='Allowed values are: title, content.',
+        status=400,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data.get('errors')
+
+
+def test_get_posts_search_without_full_text_backend(
+    db, client, post_factory, category_factory, monkeypatch
+):
+    monkeypatch.setattr('apps.content.search.get_search_backend', lambda: None)
+    url = reverse('post-list')
+    category = category_factory.create()
+    post_factory.create(title='Día de campo', category=category, status='published')
+    post_factory.create(title='Diagrams', category=category, status='published')
+    post_factory.create(title='Other', category=category, status='published')
+
+    response_data = client.get(url, {'search': 'campo'}).json()
+
+    assert [item['attributes']['title'] for item in response_data['data']] == [
+        'Día de campo'
+    ]
+
+
+def test_get_post_conditional_etag(db, client, post_factory, tag_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url)
+    etag = response['ETag']
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    post.tags.add(tag_factory.create())
+    modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    # Weak: meta.timestamp makes every body different.
+    assert etag.startswith('W/"')
+    assert not response.has_header('Last-Modified')
+    assert not_modified.status_code == 304
+    assert not_modified.content == b''
+    assert not_modified['ETag'] == etag
+    assert modified.status_code == 200
+    assert modified['ETag'] != etag
+
+
+def test_get_post_ignores_if_modified_since(
+    db, client, post_factory, media_file_factory
+):
+    post = post_factory.create(status='published')
+    media_file_factory.create(post=post)
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url)
+    # Deleting media leaves every remaining updated_at as it was.
+    post.media_files.first().delete()
+    modified = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+
+    assert not response.has_header('Last-Modified')
+    assert modified.status_code == 200
+    assert modified['ETag'] != response['ETag']
+
+
+def test_get_post_conditional_does_not_bypass_permissions(
+    db, client, logged_admin_client, post_factory
+):
+    post = post_factory.create()
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    etag = logged_admin_client.get(url)['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 403
+
+
+def test_get_posts_conditional_etag(db, client, post_factory, category_factory):
+    category = category_factory.create()
+    post_factory.create(category=category, status='published')
+    url = reverse('post-list')
+
+    etag = client.get(url)['ETag']
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    post_factory.create(category=category, status='published')
+    modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert len(modified.json()['data']) == 2
+
+
+def test_get_post_public_served_from_cache(db, client, post_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url)
+    with CaptureQueriesContext(connection) as cached_queries:
+        cached = client.get(url)
+
+    assert len(cached_queries.captured_queries) == 0
+    assert cached.status_code == 200
+    assert cached.content == response.content
+    assert cached['ETag'] == response['ETag']
+    assert cached['Content-Type'] == response['Content-Type']
+
+
+def test_get_post_cached_not_modified(db, client, post_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    etag = client.get(url)['ETag']
+    with CaptureQueriesContext(connection) as cached_queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert len(cached_queries.captured_queries) == 0
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+
+@pytest.mark.parametrize(
+    'change',
+    [
+        lambda post, tag: setattr(post, 'title', 'Updated title') or post.save(),
+        lambda post, tag: post.tags.add(tag),
+        lambda post, tag: post.tags.clear(),
+        lambda post, tag: post.category.save(),
+        lambda post, tag: post.post_statistics.save(),
+        lambda post, tag: post.media_files.first().delete(),
+    ],
+    ids=['post', 'tags_add', 'tags_clear', 'category', 'statistics', 'media'],
+)
+def test_get_post_cache_invalidated_by_changes(
+    db, client, post_factory, tag_factory, media_file_factory, change
+):
+    # Fixed names: random ones can share a slug and fail to create.
+    post = post_factory.create(
+        status='published', tags=[tag_factory.create(name='First tag')]
+    )
+    media_file_factory.create(post=post)
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url)
+    change(post, tag_factory.create(name='Second tag'))
+    with CaptureQueriesContext(connection) as rebuilt_queries:
+        client.get(url)
+
+    assert response.status_code == 200
+    assert len(rebuilt_queries.captured_queries) > 0
+
+
+def test_get_posts_cache_keyed_by_query_params(
+    db, client, post_factory, category_factory
+):
+    category = category_factory.create()
+    post_factory.create_batch(size=3, category=category, status='published')
+    url = reverse('post-list')
+
+    full_page = client.get(url)
+    small_page = client.get(url, {'page[size]': 1})
+    cached_small_page = client.get(url, {'page[size]': 1})
+
+    assert len(full_page.json()['data']) == 3
+    assert len(small_page.json()['data']) == 1
+    assert cached_small_page.content == small_page.content
+
+
+def test_get_post_cache_skipped_for_authenticated_users(
+    db, logged_author_client, post_factory
+):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    logged_author_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = logged_author_client.get(url)
+
+    assert response.status_code == 200
+    assert len(queries.captured_queries) > 0
+
+
+def test_get_post_forbidden_not_cached(db, client, post_factory):
+    post = post_factory.create(status='draft')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    client.get(url)
+    post.status = 'published'
+    post.save(update_fields=['status'])
+    response = client.get(url)
+
+    assert response.status_code == 200
+
+
+def test_get_posts_sparse_fieldset(db, client, post_factory, tag_factory):
+    post_factory.create_batch(
+        size=2, status='published', tags=tag_factory.create_batch(size=2)
+    )
+    url = reverse('post-list')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {'fields[posts]': 'title,category'})
+    response_data = response.json()
+
+    assert response.status_code == 200
+    for post in response_data['data']:
+        assert set(post['attributes']) == {'title'}
+        assert set(post['relationships']) == {'category'}
+    # No content column and no tags/media prefetches.
+    assert all('"content"' not in query['sql'] for query in queries.captured_queries)
+    assert all('content_tag' not in query['sql'] for query in queries.captured_queries)
+
+
+def test_get_post_sparse_fieldset_included(db, client, post_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url, {'fields[posts]': 'slug,author'})
+    data = response.json()['data']
+
+    assert response.status_code == 200
+    assert data['attributes'] == {'slug': post.slug}
+    assert [item['type'] for item in data['included']] == ['users']
+
+
+def test_get_posts_sparse_fieldset_changes_etag(db, client, post_factory):
+    post_factory.create(status='published')
+    url = reverse('post-list')
+
+    full = client.get(url)
+    sparse = client.get(url, {'fields[posts]': 'title'})
+
+    assert full['ETag'] != sparse['ETag']
+
+
+def test_get_posts_sparse_fieldset_attributes_only(db, client, post_factory):
+    post_factory.create(status='published')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('post-list'), {'fields[posts]': 'title'})
+
+    assert response.status_code == 200
+    assert response.json()['data'][0]['relationships'] == {}
+    assert all('JOIN' not in query['sql'] for query in queries.captured_queries)
+
+
+@pytest.mark.parametrize(
+    'params, detail',
+    [
+        ({'fields[posts]': 'title,body'}, 'Unknown fields: body.'),
+        (
+            {'fields[users]': 'username'},
+            'Sparse fieldsets are not supported for users.',
+        ),
+    ],
+)
+def test_get_posts_sparse_fieldset_invalid(db, client, params, detail):
+    response = client.get(reverse('post-list'), params)
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail=detail, status=400, meta=response_data['errors'][0]['meta']
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data['errors']
+
+
+def test_get_posts_include_compound_document(
+    db, client, post_factory, tag_factory, category_factory
+):
+    category = category_factory.create()
+    tags = tag_factory.create_batch(size=2)
+    post_factory.create_batch(size=3, category=category, tags=tags, status='published')
+
+    response = client.get(reverse('post-list'), {'include': 'category,tags'})
+    response_data = response.json()
+
+    assert response.status_code == 200
+    included = {(item['type'], item['id']) for item in response_data['included']}
+    assert included == {('categories', str(category.id))} | {
+        ('tags', str(tag.id)) for tag in tags
+    }
+    # Shared resources are included once.
+    assert len(response_data['included']) == len(included)
+
+
+def test_get_posts_without_include_has_no_top_level_included(db, client, post_factory):
+    post_factory.create(status='published')
+
+    response = client.get(reverse('post-list'))
+
+    assert 'included' not in response.json()
+
+
+def test_get_posts_include_query_count_does_not_grow_with_page_size(
+    db, client, post_factory, tag_factory, category_factory
+):
+    url = reverse('post-list')
+    post_factory.create_batch(
+        size=8,
+        category=category_factory.create(),
+        tags=tag_factory.create_batch(size=3),
+        status='published',
+    )
+    params = {'include': 'author,category,tags,statistics'}
+
+    with CaptureQueriesContext(connection) as small_page:
+        client.get(url, {**params, 'page[size]': 2})
+    with CaptureQueriesContext(connection) as large_page:
+        client.get(url, {**params, 'page[size]': 8})
+
+    assert len(small_page.captured_queries) == len(large_page.captured_queries)
+
+
+def test_get_posts_include_outside_fieldset(db, client, post_factory):
+    post = post_factory.create(status='published')
+
+    response = client.get(
+        reverse('post-list'), {'fields[posts]': 'title', 'include': 'author'}
+    )
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert response_data['data'][0]['relationships'] == {}
+    assert [item['id'] for item in response_data['included']] == [str(post.author.id)]
+
+
+def test_get_post_include_only_requested(db, client, post_factory, tag_factory):
+    post = post_factory.create(status='published', tags=tag_factory.create_batch(2))
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url, {'include': 'tags'})
+    data = response.json()['data']
+
+    assert response.status_code == 200
+    assert 'author' in data['relationships']
+    assert {item['type'] for item in data['included']} == {'tags'}
+
+
+def test_get_post_empty_include(db, client, post_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    response = client.get(url, {'include': ''})
+
+    assert response.status_code == 200
+    assert response.json()['data']['included'] == []
+
+
+def test_get_posts_include_invalid(db, client):
+    response = client.get(reverse('post-list'), {'include': 'author,comments'})
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='Unknown relationships: comments.',
+        status=400,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data['errors']
+
+
+def test_get_posts_filtered_by_slugs_reads_cached_ids(
+    db, client, post_factory, tag_factory, category_factory
+):
+    category = category_factory.create()
+    tag = tag_factory.create()
+    post_factory.create(category=category, tags=[tag], status='published')
+    params = {'category': category.slug, 'tags': tag.slug, 'fields[posts]': 'title'}
+    client.get(reverse('post-list'), params)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('post-list'), {**params, 'page[size]': 5})
+
+    assert response.status_code == 200
+    assert len(response.json()['data']) == 1
+    assert len(queries.captured_queries) == 1
+
+
+def test_get_posts_search_without_exists_query(db, client, post_factory):
+    post_factory.create(title='Searchable title', status='published')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            reverse('post-list'), {'search': 'searchable', 'fields[posts]': 'title'}
+        )
+
+    assert response.status_code == 200
+    assert len(queries.captured_queries) == 1
@@ -0,0 +1,105 @@
+import pytest
+from django.urls import reverse
+
+from apps.content.counters import post_statistics_buffer
+from apps.content.models import PostStatistics
+from apps.users.models import Author
+from tests.unit_tests.api.conftest import build_expected_error
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer(settings):
+    settings.COUNTER_FLUSH_INTERVAL = 3600
+    post_statistics_buffer._pending.clear()
+    post_statistics_buffer._events = 0
+    yield
+    post_statistics_buffer._pending.clear()
+    post_statistics_buffer._events = 0
+
+
+@pytest.mark.parametrize(
+    'url_name, field', [('post-likes', 'like_count'), ('post-shares', 'share_count')]
+)
+def test_post_counter_buffered(db, client, post_factory, url_name, field):
+    post = post_factory.create(status='published')
+    url = reverse(url_name, kwargs={'slug': post.slug})
+
+    responses = [client.post(url) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [204, 204, 204]
+    assert getattr(PostStatistics.objects.get(post=post), field) == 0
+    assert post_statistics_buffer.get_pending(post.id) == {field: 3}
+
+    post_statistics_buffer.flush()
+
+    assert getattr(PostStatistics.objects.get(post=post), field) == 3
+
+
+def test_post_counter_flush_invalidates_cached_post(db, client, post_factory):
+    post = post_factory.create(status='published')
+    detail_url = reverse('post-detail', kwargs={'slug': post.slug})
+
+    client.get(detail_url)
+    client.post(reverse('post-likes', kwargs={'slug': post.slug}))
+    post_statistics_buffer.flush()
+    response = client.get(detail_url)
+
+    statistics = next(
+        item
+        for item in response.json()['data']['included']
+        if item['type'] == 'post_statistics'
+    )
+    assert statistics['attributes']['like_count'] == 1
+
+
+def test_post_counter_draft_forbidden(db, client, post_factory):
+    post = post_factory.create(status='draft')
+    url = reverse('post-likes', kwargs={'slug': post.slug})
+
+    response = client.post(url)
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='You do not have permission to view this post',
+        status=403,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 403
+    assert expected in response_data['errors']
+    assert post_statistics_buffer.get_pending(post.id) == {}
+
+
+def test_post_counter_draft_by_author(db, logged_author_client, post_factory):
+    post = post_factory.create(status='draft', author=Author.objects.first())
+    url = reverse('post-likes', kwargs={'slug': post.slug})
+
+    response = logged_author_client.post(url)
+
+    assert response.status_code == 204
+    assert post_statistics_buffer.get_pending(post.id) == {'like_count': 1}
+
+
+def test_post_counter_not_found(db, client):
+    url = reverse('post-likes', kwargs={'slug': 'non-existing-post'})
+
+    response = client.post(url)
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='No Post matches the given query.',
+        status=404,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 404
+    assert expected in response_data['errors']
+
+
+def test_post_counter_method_not_allowed(db, client, post_factory):
+    post = post_factory.create(status='published')
+    url = reverse('post-likes', kwargs={'slug': post.slug})
+
+    response = client.get(url)
+
+    assert response.status_code == 405
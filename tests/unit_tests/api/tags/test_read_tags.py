@@ -37,6 +37,38 @@ def test_get_tag_list_server_error(db, monkeypatch, client, fake_method_factory)
     assert expected in response_data.get('errors')
 
 
+def test_get_tag_list_by_search_prefix(db, client, tag_factory):
+    url = reverse('tag-list')
+    tag_factory.create(name='Éclairs')
+    tag_factory.create(name='Eclipse')
+    tag_factory.create(name='Baking')
+
+    response = client.get(url, {'search': 'ecl'})
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert sorted(item['attributes']['name'] for item in response_data['data']) == [
+        'Eclipse',
+        'Éclairs',
+    ]
+
+
+def test_get_tag_list_invalid_search(db, client):
+    url = reverse('tag-list')
+
+    response = client.get(url, {'search': 'invalid@search'})
+    response_data = response.json()
+
+    expected = build_expected_error(
+        detail='Invalid search query format.',
+        status=400,
+        meta=response_data['errors'][0]['meta'],
+    )
+
+    assert response.status_code == 400
+    assert expected in response_data.get('errors')
+
+
 def test_get_single_tag(db, client, tag_factory, post_factory):
     tag = tag_factory.create(name='Test Tag')
     url = reverse('tag-detail', kwargs={'slug': tag.slug})
@@ -90,3 +122,45 @@ def test_get_single_tag_server_error(
 
     assert response.status_code == 500
     assert expected in response_data.get('errors')
+
+
+def test_get_single_tag_conditional_etag(db, client, tag_factory, post_factory):
+    tag = tag_factory.create()
+    post = post_factory.create(tags=[tag])
+    url = reverse('tag-detail', kwargs={'slug': tag.slug})
+
+    etag = client.get(url)['ETag']
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    post.tags.remove(tag)
+    modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+
+
+def test_get_tags_sparse_fieldset(db, client, tag_factory, post_factory):
+    tag = tag_factory.create()
+    post_factory.create(tags=[tag])
+
+    response = client.get(reverse('tag-list'), {'fields[tags]': 'name'})
+    data = response.json()['data']
+
+    assert response.status_code == 200
+    assert data[0]['attributes'] == {'name': tag.name}
+    assert data[0]['relationships'] == {}
+
+
+def test_get_tag_sparse_fieldset_posts_only(db, client, tag_factory, post_factory):
+    tag = tag_factory.create()
+    post = post_factory.create(tags=[tag])
+    url = reverse('tag-detail', kwargs={'slug': tag.slug})
+
+    response = client.get(url, {'fields[tags]': 'posts'})
+    data = response.json()['data']
+
+    assert response.status_code == 200
+    assert data['attributes'] == {}
+    assert data['relationships']['posts']['data'] == [
+        {'type': 'posts', 'id': str(post.id)}
+    ]
+    assert data['included'][0]['attributes']['content'] == post.content
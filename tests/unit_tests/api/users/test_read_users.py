@@ -1,4 +1,6 @@
 # import pytest
+import json
+
 from django.urls import reverse
 
 from apps.users.models import Author
@@ -12,7 +14,7 @@ def test_get_users(db, logged_admin_client, admin_factory, author_factory):
     author_factory.create()
 
     response = logged_admin_client.get(url)
-    response_data = response.json()
+    response_data = json.loads(response.getvalue())
 
     assert response.status_code == 200
     assert response_data.get('data')
@@ -125,3 +127,16 @@ def test_get_user_generic_error(
     )
     assert response.status_code == 500
     assert expected in response_data['errors']
+
+
+def test_get_users_sparse_fieldset(db, logged_admin_client, author_factory):
+    author_factory.create()
+    url = reverse('user-list')
+
+    response = logged_admin_client.get(url, {'fields[users]': 'username,role'})
+    response_data = json.loads(response.getvalue())
+
+    assert response.status_code == 200
+    for user in response_data['data']:
+        assert set(user['attributes']) == {'username', 'role'}
+        assert user['relationships'] == {}
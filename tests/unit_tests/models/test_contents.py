@@ -1,4 +1,6 @@
 from apps.content.models import Category, Post, Tag
+from apps.content.search import update_search_keys
+from apps.utils.text import build_search_key
 
 
 def test_category_str():
@@ -58,3 +60,26 @@ def test_tag_slug_generated_on_save(db, tag_factory):
     tag = Tag(name='Test Tag')
     tag.save()
     assert tag.slug == 'test-tag'
+
+
+def test_search_keys_are_accent_folded_on_save(db, post_factory):
+    post = post_factory.create(title='Crème Brûlée, Día 1')
+
+    assert post.search_key == 'creme brulee dia 1'
+    assert post.category.search_key == build_search_key(post.category.name)
+
+
+def test_update_search_keys_backfills_in_batches(db, tag_factory):
+    tags = [Tag.objects.create(name=f'Ñandú {index}') for index in range(3)]
+    Tag.objects.update(search_key='')
+
+    updated = update_search_keys(Tag, 'name', batch_size=2)
+
+    assert updated == 3
+    assert [
+        tag.search_key for tag in Tag.objects.filter(pk__in=[t.pk for t in tags])
+    ] == [
+        'nandu 0',
+        'nandu 1',
+        'nandu 2',
+    ]
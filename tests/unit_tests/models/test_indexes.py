@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+
+from apps.content.models import Post
+from apps.media_files.models import MediaFile
+
+LIST_ORDERING = ('-created_at', '-id')
+
+
+@pytest.fixture
+def post(db, post_factory, tag_factory):
+    post = post_factory.create(status='published', tags=tag_factory.create_batch(2))
+    if connection.vendor == 'postgresql':
+        # With a handful of rows PostgreSQL would scan the table anyway.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return post
+
+
+@pytest.mark.parametrize(
+    'build_queryset, index',
+    [
+        (
+            lambda post: Post.objects.filter(status=Post.Status.PUBLISHED),
+            'post_published_created_idx',
+        ),
+        (
+            lambda post: Post.objects.filter(author=post.author),
+            'post_author_created_idx',
+        ),
+        (
+            lambda post: Post.objects.filter(
+                category=post.category, status=Post.Status.PUBLISHED
+            ),
+            'post_category_status_idx',
+        ),
+        (lambda post: Post.objects.all(), 'post_created_idx'),
+        (
+            lambda post: Post.objects.filter(tags=post.tags.first()),
+            'post_tags_tag_post_idx',
+        ),
+    ],
+    ids=['published', 'author', 'category', 'all', 'tag'],
+)
+def test_post_list_queries_use_indexes(post, build_queryset, index):
+    queryset = build_queryset(post).order_by(*LIST_ORDERING)[:11]
+
+    assert index in queryset.explain()
+
+
+def test_media_file_name_lookup_uses_index(post):
+    queryset = MediaFile.objects.filter(post=post, name='image.png')
+
+    assert 'media_file_post_name_idx' in queryset.explain()
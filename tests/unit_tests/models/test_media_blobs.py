@@ -0,0 +1,115 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from django.contrib.admin.sites import site
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    SimpleUploadedFile,
+    TemporaryUploadedFile,
+)
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from apps.media_files.blobs import release_blobs, store_blobs
+from apps.media_files.models import MediaBlob, MediaFile
+from apps.media_files.uploads import save_media_files
+
+ALPACA = Path('tests/mock_data/alpaca.png')
+
+
+def test_upload_handlers_hash_files(settings):
+    content = ALPACA.read_bytes()
+    expected = hashlib.sha256(content).hexdigest()
+
+    for memory_size, upload_class in [
+        (2 * len(content), InMemoryUploadedFile),
+        (len(content) // 2, TemporaryUploadedFile),
+    ]:
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = memory_size
+        request = RequestFactory().post(
+            '/', {'files': [SimpleUploadedFile('a.png', content)]}
+        )
+
+        (upload,) = request.FILES.getlist('files')
+        assert isinstance(upload, upload_class)
+        assert upload.content_hash == expected
+        assert upload.read() == content
+
+
+def test_store_and_release_blobs(
+    db, post_factory, clean_media_dir, django_capture_on_commit_callbacks
+):
+    post = post_factory.create()
+    media_files = [
+        MediaFile(
+            post=post,
+            file=SimpleUploadedFile(name, ALPACA.read_bytes()),
+            name=name,
+            type=MediaFile.Type.IMAGE,
+            size=ALPACA.stat().st_size,
+            content_hash=hashlib.sha256(ALPACA.read_bytes()).hexdigest(),
+        )
+        for name in ('a.png', 'b.png')
+    ]
+
+    with ThreadPoolExecutor() as executor:
+        (written,) = store_blobs(media_files[:1], executor)
+        assert store_blobs(media_files[1:], executor) == []
+
+    blob = MediaBlob.objects.get()
+    assert (blob.file.name, blob.ref_count) == (written, 2)
+    assert {media_file.file.name for media_file in media_files} == {written}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        release_blobs(media_files[:1])
+    assert MediaBlob.objects.get().ref_count == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        release_blobs(media_files[1:])
+    assert not MediaBlob.objects.exists()
+    assert not blob.file.storage.exists(written)
+
+
+def test_store_media_blobs_command(
+    db, media_file_factory, post_factory, clean_media_dir
+):
+    legacy = []
+    for post in post_factory.create_batch(2):
+        with ALPACA.open(mode='rb') as f:
+            legacy.append(media_file_factory.create(post=post, file=File(f)))
+    previous = [media_file.file.name for media_file in legacy]
+
+    call_command('store_media_blobs')
+
+    blob = MediaBlob.objects.get()
+    assert blob.ref_count == 2
+    assert set(MediaFile.objects.values_list('file', flat=True)) == {blob.file.name}
+    assert blob.file.storage.exists(blob.file.name)
+    for name in previous:
+        assert not blob.file.storage.exists(name)
+
+
+def test_saving_stored_media_file_keeps_its_name(db, post_factory, clean_media_dir):
+    (media_file,) = save_media_files(
+        post_factory.create(), [SimpleUploadedFile('alpaca.png', ALPACA.read_bytes())]
+    )
+    stored = MediaFile.objects.get(id=media_file.id)
+    stored_name = stored.file.name
+
+    stored.save()
+    stored.refresh_from_db()
+    assert (stored.name, stored.file.name) == ('alpaca.png', stored_name)
+
+    stored.file = SimpleUploadedFile('other.png', ALPACA.read_bytes())
+    with pytest.raises(ValidationError) as excinfo:
+        stored.save()
+    assert 'cannot be replaced' in str(excinfo.value)
+    assert MediaBlob.objects.get().ref_count == 1
+
+    model_admin = site._registry[MediaFile]
+    assert 'file' in model_admin.get_readonly_fields(None, stored)
+    assert 'file' not in model_admin.get_readonly_fields(None, MediaFile())
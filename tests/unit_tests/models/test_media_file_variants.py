@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.core.files import File
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.media_files.models import MediaFileVariant, MediaFileVariantJob
+from apps.media_files.serializers import MediaFileSerializer
+from apps.media_files.variants import claim_jobs, run_jobs
+
+Status = MediaFileVariantJob.Status
+
+
+@pytest.fixture(autouse=True)
+def variant_settings(settings):
+    settings.MEDIA_VARIANT_WIDTHS = [320, 640]
+    settings.MEDIA_VARIANT_MAX_ATTEMPTS = 2
+
+
+@pytest.fixture
+def image_media_file(db, media_file_factory, clean_media_dir):
+    path = Path('tests/mock_data/alpaca.png')
+    with path.open(mode='rb') as f:
+        return media_file_factory.create(file=File(f, name=path.name))
+
+
+def test_image_upload_queues_job(image_media_file):
+    job = image_media_file.variant_job
+
+    assert job.status == Status.PENDING
+    assert job.attempts == 0
+
+
+def test_non_image_upload_queues_nothing(db, media_file_factory, clean_media_dir):
+    path = Path('tests/mock_data/427442__kiluaboy__clouds.ogg')
+    with path.open(mode='rb') as f:
+        media_file = media_file_factory.create(file=File(f, name=path.name))
+
+    assert not MediaFileVariantJob.objects.filter(media_file=media_file).exists()
+
+
+def test_run_jobs_stores_variants(image_media_file):
+    updated_at = image_media_file.updated_at
+    jobs = claim_jobs(10)
+
+    with ThreadPoolExecutor() as executor:
+        assert run_jobs(executor, jobs) == 1
+
+    variants = list(image_media_file.variants.all())
+    assert [(v.format, v.width, v.height) for v in variants] == [
+        ('png', 320, 213),
+        ('png', 640, 426),
+        ('webp', 320, 213),
+        ('webp', 640, 426),
+        ('webp', 1280, 853),
+    ]
+    for variant in variants:
+        assert variant.file.storage.exists(variant.file.name)
+        assert variant.size == variant.file.size
+
+    job = MediaFileVariantJob.objects.get(media_file=image_media_file)
+    assert (job.status, job.attempts) == (Status.DONE, 1)
+    image_media_file.refresh_from_db()
+    assert image_media_file.updated_at > updated_at
+
+
+def test_claim_jobs_claims_each_job_once(image_media_file):
+    assert [job.media_file for job in claim_jobs(10)] == [image_media_file]
+    assert claim_jobs(10) == []
+
+
+def test_claim_jobs_reclaims_stale_jobs(image_media_file, settings):
+    claim_jobs(10)
+    stale = timezone.now() - timedelta(seconds=settings.MEDIA_VARIANT_JOB_TIMEOUT + 1)
+    MediaFileVariantJob.objects.update(updated_at=stale)
+
+    (job,) = claim_jobs(10)
+    assert job.attempts == 2
+
+    MediaFileVariantJob.objects.update(updated_at=stale)
+    assert claim_jobs(10) == []
+    job.refresh_from_db()
+    assert (job.status, job.error) == (Status.FAILED, 'Timed out.')
+
+
+def test_failed_jobs_are_retried_until_max_attempts(image_media_file, monkeypatch):
+    def broken(*args):
+        raise ValueError('Broken image')
+
+    monkeypatch.setattr('apps.media_files.variants.render_variants', broken)
+
+    with ThreadPoolExecutor() as executor:
+        assert run_jobs(executor, claim_jobs(10)) == 0
+        job = MediaFileVariantJob.objects.get()
+        assert (job.status, job.error) == (Status.PENDING, 'Broken image')
+
+        assert run_jobs(executor, claim_jobs(10)) == 0
+        job.refresh_from_db()
+        assert job.status == Status.FAILED
+
+    assert claim_jobs(10) == []
+    assert not MediaFileVariant.objects.exists()
+
+
+def test_serializer_srcset(image_media_file):
+    assert (
+        MediaFileSerializer.serialize_media_file(image_media_file)['attributes'][
+            'srcset'
+        ]
+        == {}
+    )
+
+    with ThreadPoolExecutor() as executor:
+        run_jobs(executor, claim_jobs(10))
+    (data,) = MediaFileSerializer.serialize_media_files(
+        [image_media_file], fields=frozenset({'srcset'})
+    )
+
+    variants = {
+        (variant.format, variant.width): reverse(
+            'post-media-variant-download',
+            kwargs={
+                'slug': image_media_file.post.slug,
+                'id': image_media_file.id,
+                'width': variant.width,
+                'format': variant.format,
+            },
+        )
+        for variant in image_media_file.variants.all()
+    }
+    assert data['attributes'] == {
+        'srcset': {
+            'png': f'{variants["png", 320]} 320w, {variants["png", 640]} 640w',
+            'webp': (
+                f'{variants["webp", 320]} 320w, {variants["webp", 640]} 640w, '
+                f'{variants["webp", 1280]} 1280w'
+            ),
+        }
+    }
+
+
+def test_process_media_variants_command(image_media_file):
+    MediaFileVariantJob.objects.all().delete()
+
+    call_command('process_media_variants', '--once', '--backfill', '--workers', '1')
+
+    assert MediaFileVariantJob.objects.get().status == Status.DONE
+    assert image_media_file.variants.count() == 5
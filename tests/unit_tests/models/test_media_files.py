@@ -1,9 +1,12 @@
+import struct
+import zlib
 from pathlib import Path
 
 import pytest
 from django.core.exceptions import ValidationError
 from django.core.files import File
 from django.core.files.base import ContentFile
+from PIL import Image
 
 from apps.media_files.models import MediaFile
 
@@ -47,6 +50,67 @@ def test_raise_error_if_invalid_image_file(db, media_file_factory):
     assert 'Error extracting image metadata' in str(excinfo.value)
 
 
+def png_chunk(type, data, crc=None):
+    if crc is None:
+        crc = zlib.crc32(type + data)
+    return struct.pack('>I', len(data)) + type + data + struct.pack('>I', crc)
+
+
+def png_header(width, height, crc=None):
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', ihdr, crc)
+
+
+@pytest.mark.parametrize(
+    'name, content',
+    [
+        ('header-only.png', png_header(10, 10)),
+        ('bad-crc.png', png_header(10, 10, crc=1) + png_chunk(b'IEND', b'')),
+        ('header-only.gif', b'GIF89a\x0a\x00\x0a\x00\x00\x00\x00'),
+        (
+            'frame-header-only.jpg',
+            b'\xff\xd8\xff\xc0\x00\x11\x08\x00\x0a\x00\x0a\x03'
+            b'\x01\x11\x00\x02\x11\x01\x03\x11\x01',
+        ),
+        (
+            'canvas-only.webp',
+            b'RIFF\x12\x00\x00\x00WEBPVP8X\x0a\x00\x00\x00'
+            b'\x00\x00\x00\x00\x09\x00\x00\x09\x00\x00',
+        ),
+    ],
+)
+def test_raise_error_if_image_headers_valid_but_content_corrupt(
+    db, media_file_factory, name, content
+):
+    with pytest.raises(ValidationError) as excinfo:
+        media_file_factory.create(file=ContentFile(content, name=name))
+
+    assert 'Error extracting image metadata' in str(excinfo.value)
+
+
+def test_raise_error_if_image_exceeds_max_pixels(db, media_file_factory):
+    content = png_header(100000, 100000) + png_chunk(b'IEND', b'')
+
+    with pytest.raises(ValidationError) as excinfo:
+        media_file_factory.create(file=ContentFile(content, name='huge.png'))
+
+    assert 'exceeds' in str(excinfo.value)
+    assert not MediaFile.objects.exists()
+
+
+def test_raise_error_if_image_below_pillow_bomb_error_exceeds_max_pixels(
+    db, media_file_factory, monkeypatch
+):
+    # Pillow only warns between MAX_IMAGE_PIXELS and twice that.
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 100)
+    content = png_header(15, 10) + png_chunk(b'IEND', b'')
+
+    with pytest.raises(ValidationError) as excinfo:
+        media_file_factory.create(file=ContentFile(content, name='large.png'))
+
+    assert 'exceeds the limit' in str(excinfo.value)
+
+
 def test_raise_validation_error_if_duplicate_name_for_same_post(
     db, media_file_factory, post_factory
 ):
@@ -1,5 +1,9 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
+from apps.content.models import Post
 from apps.content.serializers import PostSerializer
 
 
@@ -128,7 +132,10 @@ def test_build_included_data_includes_correct_post_details(
                     'type': 'media_files',
                     'id': str(media_file.pk),
                     'attributes': {
-                        'file': str(media_file.file.url),
+                        'file': reverse(
+                            'post-media-download',
+                            kwargs={'slug': post.slug, 'id': media_file.id},
+                        ),
                         'type': media_file.type.value,
                         'created_at': media_file.created_at,
                         'updated_at': media_file.updated_at,
@@ -154,3 +161,31 @@ def test_build_included_data_includes_correct_post_details(
 
     assert expected_set.issubset(included_set)
     assert len(included) == len(expected_items)
+
+
+def test_serialize_many_uses_constant_number_of_queries(
+    db, post_factory, tag_factory, media_file_factory, clean_media_dir
+):
+    tags = tag_factory.create_batch(size=2)
+    query_counts = []
+
+    for size in (1, 5):
+        for _ in range(size):
+            post = post_factory(tags=tags)
+            media_file_factory(post=post)
+
+        with CaptureQueriesContext(connection) as context:
+            data = PostSerializer.serialize_many(Post.objects.all())
+
+        assert len(data) == Post.objects.count()
+        query_counts.append(len(context.captured_queries))
+
+    assert query_counts == [3, 3]
+
+
+def test_serialize_many_matches_serialize_post(db, post_factory, tag_factory):
+    post = post_factory(tags=tag_factory.create_batch(size=2))
+
+    assert PostSerializer.serialize_many(Post.objects.all()) == [
+        PostSerializer.serialize_post(post)
+    ]
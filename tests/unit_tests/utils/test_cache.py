@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory
+
+from apps.utils.cache import bump_version, cache_public_response, get_version
+
+
+@pytest.fixture
+def rf():
+    return RequestFactory()
+
+
+class DummyUser:
+    def __init__(self, is_authenticated=False):
+        self.is_authenticated = is_authenticated
+
+
+def make_request(rf, path='/fake-url/', is_authenticated=False, **extra):
+    request = rf.get(path, **extra)
+    request.user = DummyUser(is_authenticated=is_authenticated)
+    return request
+
+
+def make_counting_view(response_factory=None):
+    calls = []
+
+    def view(request):
+        calls.append(request)
+        if response_factory:
+            return response_factory()
+        response = JsonResponse({'calls': len(calls)})
+        response['ETag'] = '"v1"'
+        return response
+
+    return calls, view
+
+
+def test_get_version_is_stable_until_bumped():
+    version = get_version('things')
+
+    assert get_version('things') == version
+    assert bump_version('things') == version + 1
+    assert get_version('things') == version + 1
+
+
+def test_bump_version_after_eviction_moves_forward():
+    version = get_version('things')
+    cache.delete('version:things')
+
+    assert bump_version('things') > version
+
+
+def test_cache_public_response_hit(rf):
+    calls, view = make_counting_view()
+    cached_view = cache_public_response('things')(view)
+
+    first = cached_view(make_request(rf))
+    second = cached_view(make_request(rf))
+
+    assert len(calls) == 1
+    assert second.content == first.content
+    assert second['ETag'] == '"v1"'
+    assert second['Content-Type'] == 'application/json'
+
+
+def test_cache_public_response_keyed_by_path_and_version(rf):
+    calls, view = make_counting_view()
+    cached_view = cache_public_response('things')(view)
+
+    cached_view(make_request(rf, '/fake-url/?a=1'))
+    cached_view(make_request(rf, '/fake-url/?a=2'))
+    bump_version('things')
+    cached_view(make_request(rf, '/fake-url/?a=1'))
+
+    assert len(calls) == 3
+
+
+def test_cache_public_response_not_modified(rf):
+    calls, view = make_counting_view()
+    cached_view = cache_public_response('things')(view)
+
+    cached_view(make_request(rf))
+    response = cached_view(make_request(rf, HTTP_IF_NONE_MATCH='"v1"'))
+
+    assert len(calls) == 1
+    assert response.status_code == 304
+    assert response['ETag'] == '"v1"'
+
+
+def test_cache_public_response_skips_authenticated_users(rf):
+    calls, view = make_counting_view()
+    cached_view = cache_public_response('things')(view)
+
+    cached_view(make_request(rf, is_authenticated=True))
+    cached_view(make_request(rf, is_authenticated=True))
+
+    assert len(calls) == 2
+
+
+def test_cache_public_response_disabled(rf, settings):
+    settings.RESPONSE_CACHE_ENABLED = False
+    calls, view = make_counting_view()
+    cached_view = cache_public_response('things')(view)
+
+    cached_view(make_request(rf))
+    cached_view(make_request(rf))
+
+    assert len(calls) == 2
+
+
+def test_cache_public_response_skips_errors(rf):
+    calls, view = make_counting_view(lambda: HttpResponse(status=404))
+    cached_view = cache_public_response('things')(view)
+
+    cached_view(make_request(rf))
+    cached_view(make_request(rf))
+
+    assert len(calls) == 2
+
+
+def test_cache_public_response_waits_for_lock_holder(rf, settings):
+    settings.RESPONSE_CACHE_WAIT_TIMEOUT = 5
+    building = threading.Event()
+    release = threading.Event()
+
+    def slow_response():
+        building.set()
+        release.wait(timeout=5)
+        return JsonResponse({'built': True})
+
+    calls, view = make_counting_view(slow_response)
+    cached_view = cache_public_response('things')(view)
+    responses = []
+
+    builder = threading.Thread(
+        target=lambda: responses.append(cached_view(make_request(rf)))
+    )
+    builder.start()
+    building.wait(timeout=5)
+    waiter = threading.Thread(
+        target=lambda: responses.append(cached_view(make_request(rf)))
+    )
+    waiter.start()
+    release.set()
+    builder.join()
+    waiter.join()
+
+    assert len(calls) == 1
+    assert [response.status_code for response in responses] == [200, 200]
@@ -0,0 +1,74 @@
+import pytest
+
+from apps.content.models import PostStatistics
+from apps.utils.counters import CounterBuffer
+
+
+@pytest.fixture
+def buffer(settings):
+    settings.COUNTER_FLUSH_INTERVAL = 3600
+    settings.COUNTER_FLUSH_THRESHOLD = 1000
+    return CounterBuffer(PostStatistics, 'post_id', ('like_count', 'share_count'))
+
+
+def test_counter_buffer_defers_writes(db, buffer, post_factory):
+    post = post_factory.create()
+
+    buffer.increment(post.id, 'like_count')
+    buffer.increment(post.id, 'like_count')
+
+    assert PostStatistics.objects.get(post=post).like_count == 0
+    assert buffer.get_pending(post.id) == {'like_count': 2}
+
+
+def test_counter_buffer_flush_adds_deltas(db, buffer, post_factory):
+    post = post_factory.create()
+    PostStatistics.objects.filter(post=post).update(like_count=10)
+
+    buffer.increment(post.id, 'like_count', 3)
+    buffer.increment(post.id, 'share_count')
+    updated = buffer.flush()
+
+    statistics = PostStatistics.objects.get(post=post)
+    assert updated == 1
+    assert statistics.like_count == 13
+    assert statistics.share_count == 1
+    assert buffer.get_pending(post.id) == {}
+
+
+def test_counter_buffer_batches_equal_deltas(
+    db, buffer, post_factory, django_assert_num_queries
+):
+    posts = post_factory.create_batch(size=3)
+    for post in posts:
+        buffer.increment(post.id, 'like_count')
+
+    # SAVEPOINT, one UPDATE and RELEASE.
+    with django_assert_num_queries(3):
+        assert buffer.flush() == 3
+
+
+def test_counter_buffer_flushes_at_threshold(db, buffer, post_factory, settings):
+    settings.COUNTER_FLUSH_THRESHOLD = 2
+    post = post_factory.create()
+
+    buffer.increment(post.id, 'like_count')
+    buffer.increment(post.id, 'like_count')
+
+    assert PostStatistics.objects.get(post=post).like_count == 2
+
+
+def test_counter_buffer_rejects_unknown_field(buffer):
+    with pytest.raises(ValueError):
+        buffer.increment(1, 'view_count')
+
+
+def test_counter_buffer_restores_deltas_on_error(db, buffer, post_factory):
+    post = post_factory.create()
+    buffer.on_flush = lambda: 1 / 0
+
+    buffer.increment(post.id, 'like_count')
+    with pytest.raises(ZeroDivisionError):
+        buffer.flush()
+
+    assert buffer.get_pending(post.id) == {'like_count': 1}
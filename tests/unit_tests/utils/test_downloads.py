@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from apps.utils.downloads import RangedFile, RangeNotSatisfiable, parse_range
+
+
+@pytest.mark.parametrize(
+    'header, expected',
+    [
+        ('bytes=0-0', (0, 0)),
+        ('bytes=10-19', (10, 19)),
+        ('bytes=10-', (10, 99)),
+        ('bytes=90-200', (90, 99)),
+        ('bytes=-5', (95, 99)),
+        ('bytes=-500', (0, 99)),
+        ('bytes=-', None),
+        ('bytes=20-10', None),
+        ('bytes=0-1,5-6', None),
+        ('items=0-1', None),
+        ('bytes=a-b', None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize('header', ['bytes=100-', 'bytes=-0'])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 100)
+
+
+def test_ranged_file_reads_range_only():
+    file = RangedFile(io.BytesIO(bytes(range(100))), 10, 25)
+
+    assert file.read(20) == bytes(range(10, 30))
+    assert file.read(20) == bytes(range(30, 35))
+    assert file.read(20) == b''
@@ -0,0 +1,45 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.http import QueryDict
+
+from apps.utils.fieldsets import defer_unrequested, parse_fieldsets, requested
+
+AVAILABLE = {'posts': ('title', 'content', 'tags'), 'tags': ('name',)}
+
+
+def test_parse_fieldsets():
+    params = QueryDict('fields[posts]=title, tags&fields[tags]=&page[size]=2')
+
+    assert parse_fieldsets(params, AVAILABLE) == {
+        'posts': frozenset({'title', 'tags'}),
+        'tags': frozenset(),
+    }
+
+
+def test_parse_fieldsets_without_fields():
+    assert parse_fieldsets(QueryDict('page[size]=2'), AVAILABLE) == {}
+
+
+@pytest.mark.parametrize(
+    'query, message',
+    [
+        ('fields[posts]=title,body', 'Unknown fields: body.'),
+        ('fields[users]=username', 'Sparse fieldsets are not supported for users.'),
+    ],
+)
+def test_parse_fieldsets_invalid(query, message):
+    with pytest.raises(ValidationError) as exc_info:
+        parse_fieldsets(QueryDict(query), AVAILABLE)
+
+    assert list(exc_info.value.message_dict.values()) == [[message]]
+
+
+def test_requested():
+    assert requested(('title', 'content'), None) == ['title', 'content']
+    assert requested(('title', 'content'), frozenset({'content'})) == ['content']
+
+
+def test_defer_unrequested_without_fieldset():
+    queryset = object()
+
+    assert defer_unrequested(queryset, {'content': ('content',)}, None) is queryset
@@ -0,0 +1,72 @@
+import io
+
+from PIL import Image
+
+from apps.utils.images import render_variants
+
+
+def encode_image(format, size=(321, 123), mode='RGB', **options):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color='teal').save(buffer, format=format, **options)
+    buffer.seek(0)
+    return buffer
+
+
+def decode(content):
+    image = Image.open(io.BytesIO(content))
+    return image.format, image.size
+
+
+def test_render_variants_widths_and_formats():
+    image = encode_image('JPEG', size=(1000, 500))
+
+    variants = render_variants(image.getvalue(), [320, 640, 1280], quality=80)
+
+    assert [variant[:3] for variant in variants] == [
+        ('jpeg', 320, 160),
+        ('webp', 320, 160),
+        ('jpeg', 640, 320),
+        ('webp', 640, 320),
+        ('webp', 1000, 500),
+    ]
+    for format, width, height, content in variants:
+        assert decode(content) == (format.upper(), (width, height))
+
+
+def test_render_variants_webp_source_has_no_full_size_copy():
+    image = encode_image('WEBP', size=(1000, 500))
+
+    variants = render_variants(image.getvalue(), [320], quality=80)
+
+    assert [variant[:3] for variant in variants] == [('webp', 320, 160)]
+
+
+def test_render_variants_palette_png_with_transparency():
+    image = encode_image('PNG', size=(800, 400), mode='P', transparency=0)
+
+    variants = render_variants(image.getvalue(), [400], quality=80)
+
+    assert [variant[:3] for variant in variants] == [
+        ('png', 400, 200),
+        ('webp', 400, 200),
+        ('webp', 800, 400),
+    ]
+    assert Image.open(io.BytesIO(variants[0][3])).mode == 'RGBA'
+
+
+def test_render_variants_applies_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees clockwise.
+    image = encode_image('JPEG', size=(800, 400), exif=exif.tobytes())
+
+    variants = render_variants(image.getvalue(), [200], quality=80)
+
+    assert variants[0][:3] == ('jpeg', 200, 400)
+
+
+def test_render_variants_skips_animated_images():
+    buffer = io.BytesIO()
+    frames = [Image.new('RGB', (400, 400), color) for color in ('red', 'blue')]
+    frames[0].save(buffer, format='GIF', save_all=True, append_images=frames[1:])
+
+    assert render_variants(buffer.getvalue(), [200], quality=80) == []
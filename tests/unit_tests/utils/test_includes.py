@@ -0,0 +1,37 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.http import QueryDict
+
+from apps.utils.includes import deduplicate, parse_include
+
+AVAILABLE = ('author', 'tags')
+
+
+def test_parse_include():
+    params = QueryDict('include=author, tags&page[size]=2')
+
+    assert parse_include(params, AVAILABLE) == frozenset({'author', 'tags'})
+
+
+def test_parse_include_absent_or_empty():
+    assert parse_include(QueryDict('page[size]=2'), AVAILABLE) is None
+    assert parse_include(QueryDict('include='), AVAILABLE) == frozenset()
+
+
+def test_parse_include_invalid():
+    with pytest.raises(ValidationError) as exc_info:
+        parse_include(QueryDict('include=author,tags.posts'), AVAILABLE)
+
+    assert exc_info.value.message_dict == {
+        'include': ['Unknown relationships: tags.posts.']
+    }
+
+
+def test_deduplicate():
+    resources = [
+        {'type': 'tags', 'id': '1', 'attributes': {'name': 'first'}},
+        {'type': 'categories', 'id': '1'},
+        {'type': 'tags', 'id': '1', 'attributes': {'name': 'second'}},
+    ]
+
+    assert deduplicate(resources) == resources[:2]
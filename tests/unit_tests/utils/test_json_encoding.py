@@ -0,0 +1,106 @@
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from apps.utils import json_encoding
+from apps.utils.json_encoding import dumps, get_backend
+from apps.utils.jsonapi_responses import JsonApiResponseBuilder
+
+PAYLOAD = {
+    'data': [
+        {
+            'id': '1',
+            'title': 'Café ☕',
+            'created_at': datetime(2024, 1, 15, 10, 30, 45, 123456, timezone.utc),
+            'updated_at': datetime(2024, 1, 15, 10, 30, 45, tzinfo=timezone.utc),
+            'published_on': date(2024, 1, 15),
+            'reading_time': timedelta(minutes=5),
+            'size': Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'tags': ('a', 'b'),
+            'draft': None,
+        }
+    ]
+}
+
+backends = pytest.mark.parametrize(
+    'backend',
+    [
+        'json',
+        pytest.param(
+            'orjson',
+            marks=pytest.mark.skipif(
+                json_encoding.orjson is None, reason='orjson is not installed'
+            ),
+        ),
+    ],
+)
+
+
+@backends
+def test_dumps_matches_django_encoder(backend):
+    data = json.loads(dumps(PAYLOAD, backend))['data'][0]
+
+    assert data['created_at'] == '2024-01-15T10:30:45.123Z'
+    assert data['updated_at'] == '2024-01-15T10:30:45Z'
+    assert data['published_on'] == '2024-01-15'
+    assert data['reading_time'] == 'P0DT00H05M00S'
+    assert data['size'] == '1.50'
+    assert data['uuid'] == str(uuid.UUID(int=1))
+    assert data['title'] == 'Café ☕'
+
+
+@pytest.mark.skipif(json_encoding.orjson is None, reason='orjson is not installed')
+def test_backends_render_identical_documents():
+    assert dumps(PAYLOAD, 'orjson') == dumps(PAYLOAD, 'json')
+
+
+def test_get_backend_auto(monkeypatch):
+    assert get_backend('auto') == ('json' if json_encoding.orjson is None else 'orjson')
+
+    monkeypatch.setattr(json_encoding, 'orjson', None)
+
+    assert get_backend('auto') == 'json'
+    with pytest.raises(ValueError):
+        get_backend('orjson')
+
+
+def test_get_backend_unknown():
+    with pytest.raises(ValueError):
+        get_backend('simplejson')
+
+
+@backends
+def test_responses_use_configured_backend(settings, backend):
+    settings.JSON_ENCODER_BACKEND = backend
+    data = {'id': '1', 'created_at': PAYLOAD['data'][0]['created_at']}
+
+    responses = [
+        JsonApiResponseBuilder.ok(data, meta={}),
+        JsonApiResponseBuilder.created(data, meta={}),
+        JsonApiResponseBuilder.error(404, 'Not Found', 'Missing.', meta={}),
+        JsonApiResponseBuilder.validation_errors_from_dict({'title': ['Required.']}),
+        JsonApiResponseBuilder.validation_errors_from_list(['Invalid.']),
+    ]
+
+    assert [response.status_code for response in responses] == [200, 201, 404, 400, 400]
+    assert all(r['Content-Type'] == 'application/json' for r in responses)
+    assert json.loads(responses[0].content)['data'] == {
+        'id': '1',
+        'created_at': '2024-01-15T10:30:45.123Z',
+    }
+
+
+@backends
+def test_ok_stream_renders_ok_content(settings, backend):
+    settings.JSON_ENCODER_BACKEND = backend
+    items = PAYLOAD['data'] * 3
+    meta = {'count': 3}
+
+    streamed = JsonApiResponseBuilder.ok_stream(items, dict, meta=meta, chunk_size=2)
+    regular = JsonApiResponseBuilder.ok(items, meta=meta)
+
+    assert streamed.getvalue() == regular.content
@@ -1,3 +1,9 @@
+import json
+
+import pytest
+
+from apps.media_files.models import MediaFile
+from apps.media_files.serializers import MediaFileSerializer
 from apps.utils.jsonapi_responses import JsonApiResponseBuilder
 
 
@@ -11,3 +17,49 @@ def test_build_response_with_links():
     assert response['links'] == test_links
     assert response['data'] == data
     assert 'errors' not in response
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 10])
+def test_ok_stream_matches_ok(chunk_size):
+    items = [{'id': i} for i in range(5)]
+    meta = {'count': 5}
+    links = {'self': '/api/v1/test/'}
+
+    streamed = JsonApiResponseBuilder.ok_stream(
+        items, lambda item: {**item}, meta=meta, links=links, chunk_size=chunk_size
+    )
+    regular = JsonApiResponseBuilder.ok(items, meta=meta, links=links)
+
+    assert streamed.streaming
+    assert streamed['Content-Type'] == 'application/json'
+    assert json.loads(streamed.getvalue()) == json.loads(regular.content)
+
+
+def test_ok_stream_empty(settings):
+    settings.STREAM_CHUNK_SIZE = 2
+
+    response = JsonApiResponseBuilder.ok_stream([], lambda item: item)
+    payload = json.loads(response.getvalue())
+
+    assert payload['data'] == []
+    assert 'timestamp' in payload['meta']
+
+
+def test_ok_stream_reads_querysets_in_chunks(
+    db, media_file_factory, django_assert_num_queries
+):
+    media_file_factory.create_batch(3)
+
+    response = JsonApiResponseBuilder.ok_stream(
+        MediaFileSerializer.prepare_queryset(
+            MediaFile.objects.all().select_related('post')
+        ),
+        MediaFileSerializer.serialize_media_file,
+        chunk_size=2,
+    )
+    # Nothing is fetched until the body is consumed; then one query for the
+    # rows and one per chunk for their variants.
+    with django_assert_num_queries(3):
+        payload = json.loads(response.getvalue())
+
+    assert len(payload['data']) == 3
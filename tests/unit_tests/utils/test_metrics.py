@@ -0,0 +1,92 @@
+import re
+
+import pytest
+from django.urls import reverse
+
+from apps.utils.metrics import (
+    Histogram,
+    MetricsRegistry,
+    measure_serialization,
+    registry,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def parse_server_timing(header):
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r'(\w+);dur=([\d.]+)', header)
+    }
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 5))
+
+    for value in (0, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {
+        'buckets': [1, 5],
+        'counts': [2, 1, 1],
+        'sum': 14,
+        'count': 4,
+    }
+
+
+def test_registry_groups_by_view():
+    metrics = MetricsRegistry()
+
+    metrics.observe('post-list', {'db_queries': 3})
+    metrics.observe('post-list', {'db_queries': 4})
+    metrics.observe('tag-list', {'db_queries': 1})
+
+    snapshot = metrics.snapshot()
+    assert snapshot['post-list']['db_queries']['count'] == 2
+    assert snapshot['post-list']['db_queries']['sum'] == 7
+    assert snapshot['tag-list']['db_queries']['count'] == 1
+
+
+def test_measure_serialization_outside_request():
+    with measure_serialization():
+        pass
+
+
+def test_middleware_server_timing_header(db, client, post_factory):
+    post_factory.create_batch(size=2, status='published')
+
+    response = client.get(reverse('post-list'))
+    timings = parse_server_timing(response['Server-Timing'])
+
+    assert set(timings) == {'db', 'serialize', 'total'}
+    assert timings['total'] >= timings['db']
+    assert timings['serialize'] > 0
+    assert re.search(r'desc="\d+ queries"', response['Server-Timing'])
+
+
+def test_middleware_records_per_view_histograms(db, client, post_factory):
+    post = post_factory.create(status='published')
+
+    client.get(reverse('post-list'))
+    client.get(reverse('post-list'))
+    client.get(reverse('post-detail', kwargs={'slug': post.slug}))
+    client.get('/non-existing-url/')
+
+    snapshot = registry.snapshot()
+    assert snapshot['post-list']['total_seconds']['count'] == 2
+    assert snapshot['post-list']['db_queries']['sum'] > 0
+    assert snapshot['post-detail']['serialize_seconds']['count'] == 1
+    assert snapshot['unresolved']['total_seconds']['count'] == 1
+
+
+def test_middleware_server_timing_disabled(db, client, settings):
+    settings.METRICS_SERVER_TIMING = False
+
+    response = client.get(reverse('tag-list'))
+
+    assert not response.has_header('Server-Timing')
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+from django.http import QueryDict
+
+from apps.content.models import Post
+from apps.utils.query_filters import filter_posts_by_params, filter_posts_by_user_role
+
+LIST_ORDERING = ('-created_at', '-id')
+
+
+def legacy_filter_by_user_role(queryset, user):
+    # The OR + DISTINCT filter these results are compared against.
+    if user.is_authenticated and user.role == 'author':
+        return queryset.filter(
+            Q(author=user) | Q(status=Post.Status.PUBLISHED)
+        ).distinct()
+    if user.is_authenticated and user.role == 'admin':
+        return queryset
+    return queryset.filter(status=Post.Status.PUBLISHED)
+
+
+def legacy_filter_by_tags(queryset, slugs):
+    return queryset.filter(tags__slug__in=slugs).distinct()
+
+
+@pytest.fixture
+def dataset(
+    db, author_factory, admin_factory, post_factory, tag_factory, category_factory
+):
+    rng = random.Random(16)
+    authors = author_factory.create_batch(size=3)
+    category = category_factory.create(name='Generated')
+    tags = [tag_factory.create(name=f'Tag {index}') for index in range(4)]
+    for _ in range(30):
+        post_factory.create(
+            author=rng.choice(authors),
+            category=category,
+            status=rng.choice(Post.Status.values),
+            tags=rng.sample(tags, rng.randint(0, 3)),
+        )
+    return {'authors': authors, 'admin': admin_factory.create(), 'tags': tags}
+
+
+def ids(queryset):
+    return list(queryset.order_by(*LIST_ORDERING).values_list('id', flat=True))
+
+
+def test_filter_by_user_role_matches_legacy(dataset):
+    users = [AnonymousUser(), dataset['admin'], *dataset['authors']]
+
+    for user in users:
+        queryset = Post.objects.all()
+
+        assert ids(filter_posts_by_user_role(queryset, user)) == ids(
+            legacy_filter_by_user_role(queryset, user)
+        )
+
+
+def test_filter_by_tags_matches_legacy(dataset):
+    slugs = [tag.slug for tag in dataset['tags']]
+
+    for selected in (slugs[:1], slugs[1:3], slugs):
+        for user in dataset['authors']:
+            queryset = filter_posts_by_user_role(Post.objects.all(), user)
+            filtered = filter_posts_by_params(
+                queryset, QueryDict(f'tags={",".join(selected)}')
+            )
+
+            assert ids(filtered) == ids(legacy_filter_by_tags(queryset, selected))
+            assert 'DISTINCT' not in str(filtered.query)
@@ -0,0 +1,71 @@
+import pytest
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.files import FieldFile
+from django.forms.models import model_to_dict
+
+from apps.content.models import Post
+from apps.media_files.models import MediaFile
+from apps.utils.serialization import compile_plan
+
+NAMES = ('title', 'slug', 'status', 'author', 'created_at')
+
+
+def test_plan_serializes_instances(db, post_factory):
+    post = post_factory.create()
+
+    attributes = compile_plan(Post, NAMES).serialize(post)
+
+    assert attributes == {
+        **model_to_dict(post, fields=['title', 'slug', 'status', 'author']),
+        'created_at': post.created_at,
+    }
+    assert list(attributes) == list(NAMES)
+
+
+def test_plan_serializes_values_list_rows(db, post_factory):
+    post = post_factory.create()
+    plan = compile_plan(Post, NAMES)
+
+    row = Post.objects.values_list(*plan.columns).get(pk=post.pk)
+
+    assert plan.columns == ('title', 'slug', 'status', 'author_id', 'created_at')
+    assert plan.serialize_row(row) == plan.serialize(post)
+
+
+def test_plan_loads_deferred_columns(db, post_factory):
+    post = post_factory.create()
+
+    deferred = Post.objects.defer('title').get(pk=post.pk)
+
+    assert compile_plan(Post, NAMES).serialize(deferred)['title'] == post.title
+
+
+def test_plan_reads_file_columns_as_attributes():
+    media_file = MediaFile(file='image/alpaca.png', name='alpaca.png')
+
+    attributes = compile_plan(MediaFile, ('file', 'name')).serialize(media_file)
+
+    assert isinstance(attributes['file'], FieldFile)
+    assert attributes['file'].name == 'image/alpaca.png'
+
+
+def test_plan_applies_converters():
+    post = Post(title='Hello', slug='hello')
+    plan = compile_plan(Post, ('title', 'slug'), (('title', str.upper),))
+
+    assert plan.serialize(post) == {'title': 'HELLO', 'slug': 'hello'}
+    assert plan.serialize_row(('Hello', 'hello')) == {'title': 'HELLO', 'slug': 'hello'}
+
+
+def test_plan_without_fields():
+    assert compile_plan(Post, ()).serialize(Post()) == {}
+
+
+def test_compile_plan_is_cached():
+    assert compile_plan(Post, NAMES) is compile_plan(Post, NAMES)
+    assert compile_plan(Post, NAMES) is not compile_plan(Post, NAMES[:2])
+
+
+def test_compile_plan_unknown_field():
+    with pytest.raises(FieldDoesNotExist):
+        compile_plan(Post, ('title', 'body'))
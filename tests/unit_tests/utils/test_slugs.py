@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.content.models import Tag
+from apps.content.slugs import tag_ids
+from apps.utils.slugs import SlugIdCache
+
+
+def test_get_ids_loads_every_slug_once(db, tag_factory):
+    tags = [tag_factory.create(name=f'Tag {index}') for index in range(2)]
+    cache = SlugIdCache(Tag, 'test-slugs')
+
+    with CaptureQueriesContext(connection) as first:
+        ids = cache.get_ids([tags[0].slug, tags[1].slug, 'missing'])
+    with CaptureQueriesContext(connection) as second:
+        assert cache.get_id(tags[0].slug) == tags[0].id
+        assert cache.get_ids([tags[1].slug]) == {tags[1].slug: tags[1].id}
+
+    assert ids == {tag.slug: tag.id for tag in tags}
+    # The first load, then a reload for the missing slug.
+    assert len(first.captured_queries) == 2
+    assert len(second.captured_queries) == 0
+
+
+def test_missing_slug_reloads_from_database(db, tag_factory):
+    cache = SlugIdCache(Tag, 'test-slugs')
+    assert cache.get_id('created-elsewhere') is None
+
+    # bulk_create() sends no signals, as if another worker without a shared
+    # cache backend created the tag.
+    (tag,) = Tag.objects.bulk_create(
+        [Tag(name='Created elsewhere', slug='created-elsewhere')]
+    )
+
+    assert cache.get_id('created-elsewhere') == tag.id
+    assert cache.get_ids(['created-elsewhere', 'missing']) == {
+        'created-elsewhere': tag.id
+    }
+
+
+def test_invalidate_reloads_other_processes(db, tag_factory):
+    tag = tag_factory.create(name='Old name')
+    worker, other_worker = (
+        SlugIdCache(Tag, 'test-slugs'),
+        SlugIdCache(Tag, 'test-slugs'),
+    )
+    assert other_worker.get_id('old-name') == tag.id
+
+    # update() sends no signals, as if the write happened in another worker.
+    Tag.objects.filter(pk=tag.pk).update(slug='new-name')
+    assert other_worker.get_id('old-name') == tag.id
+    worker.invalidate()
+
+    assert other_worker.get_id('old-name') is None
+    assert other_worker.get_id('new-name') == tag.id
+
+
+def test_tag_writes_invalidate_ids(db, tag_factory):
+    assert tag_ids.get_id('new-tag') is None
+    tag = tag_factory.create(name='New tag')
+    assert tag_ids.get_id('new-tag') == tag.id
+
+    tag.name = 'Renamed tag'
+    tag.save()
+
+    assert tag_ids.get_id('new-tag') is None
+    assert tag_ids.get_id('renamed-tag') == tag.id
+
+    tag.delete()
+
+    assert tag_ids.get_id('renamed-tag') is None
+
+
+def test_unshared_cache_reads_database(db, tag_factory, settings):
+    settings.CACHE_IS_SHARED = False
+    tag = tag_factory.create(name='Old name')
+    cache = SlugIdCache(Tag, 'test-slugs')
+    assert cache.get_id('old-name') == tag.id
+
+    # update() sends no signals, as if the write happened in another worker.
+    Tag.objects.filter(pk=tag.pk).update(slug='new-name')
+
+    assert cache.get_id('old-name') is None
+    assert cache.get_ids(['old-name', 'new-name']) == {'new-name': tag.id}